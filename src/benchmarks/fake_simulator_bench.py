@@ -0,0 +1,179 @@
+# =========================================
+# ==_________Fake_simulator_bench_________==
+# =========================================
+"""
+Замер обмена с локальным имитатором на синтетической
+станции: задержки команд, скорости передачи
+состояния всех объектов (variables *) и частоты
+обновления окна программы ответами на пересчёты.
+
+Имитатор работает в отдельном потоке, задержки и
+скорость передачи замеряются через SimClient,
+частота обновления - через SimSocket и
+ToolWindow.get_data_from_sim без отображения окна.
+
+Запуск из каталога src:
+    python -m benchmarks.fake_simulator_bench [КОЛИЧЕСТВО_ОБЪЕКТОВ]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.logic_engine_bench import LOGIC
+from benchmarks.readers_bench import write_command_table
+from benchmarks.readers_bench import write_int_data
+from benchmarks.scene_bench import write_yard
+from modeling_classes.fake_simulator import FakeSimulator
+from modeling_classes.fake_simulator import FakeStation
+from modeling_classes.sim_client import SimClient
+
+OBJECTS_NUM = 2000
+REQUESTS_NUM = 500
+DUMPS_NUM = 5
+UPDATES_NUM = 200
+SITE_ID = 1
+
+# Логика замера логики с переменными связей
+# объектов синтетического IntData
+SITE_LOGIC = LOGIC.replace(
+    'ST_OCC T 0-1 0 CHECK,CHC\n',
+    'ST_OCC T 0-1 0 CHECK,CHC\nCHK_A T 0-1 0 CHECK,CHC\n').replace(
+    'IND_OCC T 0-1 0 STATUS,STAS\n',
+    'IND_OCC T 0-1 0 STATUS,STAS\nCTFW_A T 0-1 0 CONTROL,CTFW\n')
+CONFIG = '''Product_name "STATION"
+Version 1
+Path 1 ~
+File IntData.txt-1 Key IntData
+File CommandTable.txt-1 Key CommandTable
+File Logic.ste-1 Key ILL_STERNOL_FILE
+Checksum_A 1
+'''
+
+
+def write_site(site_path, names):
+    """
+    Функция записи синтетического проекта станции.
+    Возвращает путь к конфигурационному файлу
+    """
+    write_int_data(os.path.join(site_path, 'IntData.txt'), names)
+    write_command_table(os.path.join(site_path, 'CommandTable.txt'), names)
+    with open(os.path.join(site_path, 'Logic.ste'), 'w') as out_data:
+        out_data.write(SITE_LOGIC)
+    write_yard(os.path.join(site_path, 'yard.xml'), len(names))
+    config_path = os.path.join(site_path, 'ConfigInfo.CI')
+    with open(config_path, 'w') as out_data:
+        out_data.write(CONFIG)
+    return config_path
+
+
+def start_simulator(simulator):
+    """
+    Функция запуска имитатора в отдельном
+    потоке со своим циклом событий
+    """
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(simulator.start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    started.wait()
+    return simulator.port
+
+
+async def measure_client(port, names):
+    """
+    Функция замера задержек команд и
+    скорости передачи состояния
+    """
+    async with SimClient(SITE_ID) as client:
+        await client.connect('127.0.0.1', port)
+        delays = []
+        for num in range(REQUESTS_NUM):
+            start = time.perf_counter()
+            await client.variables(names[num % len(names)])
+            delays.append(time.perf_counter() - start)
+        received = 0
+        start = time.perf_counter()
+        for _ in range(DUMPS_NUM):
+            received += len(await client.variables())
+        elapsed = time.perf_counter() - start
+    return delays, received, elapsed
+
+
+def measure_window(port, config_path, names):
+    """
+    Функция замера частоты обновления окна
+    ответами на пересчёт одного цикла
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+
+    from main import ToolWindow
+    from modeling_classes.sim_protocol import break_command
+    from modeling_classes.sim_protocol import yard_command
+
+    app = QApplication.instance() or QApplication([])
+    window = ToolWindow()
+    window.open_site_data(config_path)
+    window._selected_obj = names[0]
+    sim_socket = window._socket
+    sim_socket.open_connection('127.0.0.1', port)
+    if not sim_socket.waitForConnected(5000):
+        raise ConnectionError(port)
+    # Занятие первого участка распространяется
+    # по станции через каналы
+    request = sim_socket.send(yard_command(SITE_ID, f'IPU_{names[0]}', 1))
+    while not request.done:
+        app.processEvents()
+    worker = window._response_worker
+    start = time.perf_counter()
+    for _ in range(UPDATES_NUM):
+        request = sim_socket.send(break_command(SITE_ID, 'after', 1))
+        while not request.done:
+            sim_socket.waitForReadyRead(1000)
+            app.processEvents()
+        # Ответ разбирается в отдельном потоке,
+        # обновление окна завершается после
+        # применения изменений
+        while worker.busy:
+            app.processEvents()
+    elapsed = time.perf_counter() - start
+    sim_socket.close()
+    return elapsed
+
+
+def main():
+    objects_num = int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS_NUM
+    names = [f'S{x}' for x in range(objects_num)]
+    with tempfile.TemporaryDirectory() as site_path:
+        config_path = write_site(site_path, names)
+        station = FakeStation.from_files(
+            os.path.join(site_path, 'IntData.txt'),
+            os.path.join(site_path, 'Logic.ste'))
+        port = start_simulator(FakeSimulator({SITE_ID: station}))
+
+        delays, received, elapsed = asyncio.run(measure_client(port, names))
+        delays.sort()
+        print('round trip, ms: mean {:.3f}, p50 {:.3f}, p99 {:.3f}'.format(
+            statistics.mean(delays) * 1000, delays[len(delays) // 2] * 1000,
+            delays[int(len(delays) * 0.99)] * 1000))
+        mb = received / 2 ** 20
+        print('variables *: {:.1f} MB, {:.1f} MB/s, {:.1f} dumps/s'.format(
+            mb, mb / elapsed, DUMPS_NUM / elapsed))
+
+        elapsed = measure_window(port, config_path, names)
+        print('window updates/s: {:.0f}'.format(UPDATES_NUM / elapsed))
+
+
+if __name__ == '__main__':
+    main()
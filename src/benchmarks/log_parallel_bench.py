@@ -0,0 +1,58 @@
+# =========================================
+# ==___________Log_parallel_bench__________==
+# =========================================
+"""
+Замер скорости разбора синтетического лог файла
+в МБ/с при разном количестве процессов.
+Результат каждого разбора сверяется с
+результатом log_data_parser.
+
+Запуск из каталога src:
+    python -m benchmarks.log_parallel_bench [КОЛИЧЕСТВО_ЦИКЛОВ] [ПРОЦЕССОВ]
+
+По умолчанию количество процессов меняется от 1
+до количества процессоров.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.log_replay_bench import write_log
+from site_readers.log_parallel import parallel_log_parser
+from site_readers.log_reader import log_data_parser
+
+CYCLES_NUM = 40000
+# Размер части уменьшен, чтобы частей было
+# больше, чем процессов
+CHUNK_SIZE = 4 * 2 ** 20
+
+
+def main():
+    cycles_num = int(sys.argv[1]) if len(sys.argv) > 1 else CYCLES_NUM
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'parallel.log')
+        write_log(file_path, cycles_num)
+        size = os.path.getsize(file_path) / 2 ** 20
+
+        start = time.perf_counter()
+        with open(file_path) as in_data:
+            expected = log_data_parser(in_data)
+        elapsed = time.perf_counter() - start
+        print('{:<20}{:>8}{:>10}{:>8}'.format('parser', 'workers', 'MB/s',
+                                              'same'))
+        print('{:<20}{:>8}{:>10.1f}{:>8}'.format('log_data_parser', 1,
+                                                 size / elapsed, '-'))
+        for workers in range(1, (max_workers or 1) + 1):
+            start = time.perf_counter()
+            result = parallel_log_parser(file_path, workers, CHUNK_SIZE)
+            elapsed = time.perf_counter() - start
+            same = result == expected
+            print('{:<20}{:>8}{:>10.1f}{:>8}'.format(
+                'parallel_log_parser', workers, size / elapsed, str(same)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+# =========================================
+# ==___________Log_replay_bench___________==
+# =========================================
+"""
+Замер скорости и памяти при воспроизведении
+синтетического лог файла по циклам.
+Для сравнения приводится чтение того же файла
+целиком функцией log_data_parser.
+Также замеряются воспроизведение сжатых копий
+файла, построение индекса циклов и среднее время
+перехода к случайному циклу. Для сжатых копий
+приводится размер файла на диске.
+
+Запуск из каталога src:
+    python -m benchmarks.log_replay_bench [КОЛИЧЕСТВО_ЦИКЛОВ]
+"""
+
+import gzip
+import lzma
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from site_readers.log_index import LogIndex
+from site_readers.log_reader import log_data_parser
+from site_readers.log_replay import LogReplay
+
+CYCLES_NUM = 20000
+# Количество изменений переменных за цикл
+CHANGES_NUM = 20
+# Количество переходов к случайным циклам
+SEEKS_NUM = 100
+
+
+def write_log(file_path, cycles_num):
+    """
+    Функция записи синтетического лог файла
+    """
+    with open(file_path, 'w') as out_data:
+        for cycle in range(1, cycles_num + 1):
+            for num in range(CHANGES_NUM):
+                obj_name = f'S{(cycle * 7 + num) % 5000}'
+                out_data.write(f'! STATION {cycle} C {obj_name} V_OCC '
+                               f'{cycle % 2} {(cycle + 1) % 2}\n')
+                out_data.write(f'! STATION {cycle} C {obj_name} CH_OCC 1 '
+                               f'x x x {cycle % 2} {(cycle + 1) % 2} '
+                               f'channel\n')
+
+
+def compress(file_path, module, suffix):
+    """
+    Функция записи сжатой копии файла
+    """
+    compressed_path = f'{file_path}.{suffix}'
+    with open(file_path, 'rb') as in_data, \
+            module.open(compressed_path, 'wb') as out_data:
+        shutil.copyfileobj(in_data, out_data)
+    return compressed_path
+
+
+def replay_all(file_path):
+    """
+    Функция воспроизведения всех циклов лог файла.
+    Возвращает количество пакетов изменений
+    """
+    replay = LogReplay(file_path)
+    return sum(1 for _ in replay.run_to_end())
+
+
+def parse_all(file_path):
+    """
+    Функция чтения лог файла целиком
+    """
+    with open(file_path) as in_data:
+        return len(log_data_parser(in_data))
+
+
+def measure(reader, file_path):
+    """
+    Функция замера времени и пикового
+    потребления памяти
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = reader(file_path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def measure_seek(file_path, cycles_num):
+    """
+    Функция замера построения индекса и
+    среднего времени перехода к циклу
+    в миллисекундах
+    """
+    start = time.perf_counter()
+    LogIndex.open(file_path)
+    build = time.perf_counter() - start
+    replay = LogReplay(file_path)
+    cycles = [str(random.randint(1, cycles_num)) for _ in range(SEEKS_NUM)]
+    # Первый переход читает индекс с диска
+    replay.seek(cycles[0])
+    start = time.perf_counter()
+    for cycle in cycles:
+        replay.seek(cycle)
+    seek = (time.perf_counter() - start) / SEEKS_NUM * 1000
+    replay.close()
+    return build, seek
+
+
+def main():
+    cycles_num = int(sys.argv[1]) if len(sys.argv) > 1 else CYCLES_NUM
+    header = ('reader', 'cycles', 'MB', 'time, s', 'batches/s', 'peak, MB')
+    print('{:<16}{:>9}{:>7}{:>9}{:>11}{:>10}'.format(*header))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Пиковая память воспроизведения не должна
+        # зависеть от размера файла
+        for num in (cycles_num // 10, cycles_num):
+            file_path = os.path.join(temp_dir, f'log_{num}.log')
+            write_log(file_path, num)
+            size = os.path.getsize(file_path) / 2 ** 20
+            for name, reader in (('LogReplay', replay_all),
+                                 ('log_data_parser', parse_all)):
+                _, elapsed, peak = measure(reader, file_path)
+                row = (name, num, size, elapsed, num / elapsed, peak)
+                print('{:<16}{:>9}{:>7.1f}{:>9.2f}{:>11.0f}{:>10.1f}'.format(
+                    *row))
+            for module, suffix in ((gzip, 'gz'), (lzma, 'xz')):
+                compressed_path = compress(file_path, module, suffix)
+                compressed_size = os.path.getsize(compressed_path) / 2 ** 20
+                _, elapsed, peak = measure(replay_all, compressed_path)
+                row = (f'LogReplay .{suffix}', num, compressed_size, elapsed,
+                       num / elapsed, peak)
+                print('{:<16}{:>9}{:>7.1f}{:>9.2f}{:>11.0f}{:>10.1f}'.format(
+                    *row))
+            build, seek = measure_seek(file_path, num)
+            print('{:<16}{:>9}  index build {:.2f} s, seek {:.1f} ms'.format(
+                'LogIndex', num, build, seek))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# =========================================
+# ==____________Log_store_bench___________==
+# =========================================
+"""
+Замер времени запросов к хранилищу истории
+значений переменных на синтетических изменениях.
+Изменения создаются сразу массивами, так как
+разбор лога такого размера занимает минуты.
+
+Запуск из каталога src:
+    python -m benchmarks.log_store_bench [КОЛИЧЕСТВО_ИЗМЕНЕНИЙ]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from site_readers.log_store import LogStore
+
+CHANGES_NUM = 10 ** 7
+OBJECTS_NUM = 20000
+VARIABLES = ('OCC', 'LOCK', 'ROUTE', 'SIGNAL', 'ALARM')
+
+
+def make_store(changes_num):
+    """
+    Функция создания хранилища со случайными
+    изменениями переменных
+    """
+    generator = np.random.default_rng(1)
+    keys = [('STATION', f'S{x}', y)
+            for x in range(OBJECTS_NUM) for y in VARIABLES]
+    # В среднем одно изменение на 20 переменных за цикл
+    cycles = np.sort(generator.integers(
+        1, changes_num * 20 // len(keys), changes_num))
+    var_ids = generator.integers(0, len(keys), changes_num, dtype=np.int32)
+    # Переменная ALARM последних объектов не изменяется
+    # как отдельный случай для поиска таких объектов
+    quiet = var_ids >= len(keys) - len(VARIABLES) * 100
+    var_ids[quiet & (var_ids % len(VARIABLES) == 4)] -= 1
+    codes = generator.integers(0, 2, changes_num, dtype=np.int32)
+    return LogStore(keys, ['0', '1'], cycles, var_ids, codes)
+
+
+def timed(name, func, *args):
+    """
+    Функция замера времени запроса в миллисекундах
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = (time.perf_counter() - start) * 1000
+    print('{:<22}{:>10.2f} ms  {}'.format(name, elapsed, len(result)))
+    return result
+
+
+def main():
+    changes_num = int(sys.argv[1]) if len(sys.argv) > 1 else CHANGES_NUM
+    start = time.perf_counter()
+    store = make_store(changes_num)
+    print('{} changes, store built in {:.2f} s'.format(
+        len(store), time.perf_counter() - start))
+    var_id = store.get_var_id('STATION', 'S10', 'OCC')
+    timed('cycles_with_value', store.cycles_with_value, var_id, 1)
+    timed('dwell_times', store.dwell_times, var_id, 1)
+    timed('toggle_counts', store.toggle_counts)
+    timed('first_changes', store.first_changes)
+    timed('unchanged_objects', store.unchanged_objects, 'ALARM')
+
+
+if __name__ == '__main__':
+    main()
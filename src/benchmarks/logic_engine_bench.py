@@ -0,0 +1,99 @@
+# =========================================
+# ==__________Logic_engine_bench_________==
+# =========================================
+"""
+Замер скорости компиляции уравнений и локального
+пересчёта логики синтетической станции.
+
+Запуск из каталога src:
+    python -m benchmarks.logic_engine_bench [КОЛИЧЕСТВО_ОБЪЕКТОВ]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.readers_bench import write_int_data
+from modeling_classes.logic_engine import LogicEngine
+from site_readers.data_reader import interlocking_data_parser
+from site_readers.logic_reader import read_logic
+
+OBJECTS_NUM = 2000
+CYCLES_NUM = 200
+
+LOGIC = '''#PROGRAM BENCH
+#PAR
+#CONST
+MAX_CNT 9
+#OBJ
+SECTION 2 SEC,1
+#GLOBVAR
+#INOUT
+CH_OCC T 0-1
+#SECTION
+#INOUT
+CH_OCC 0 0 1
+CH_OCC 1 0 1
+#OWN
+V_OCC T 0-1 0 1
+V_CNT T 0-9 0 1
+V_LCK T 0-1 0 1
+V_DIR T 0-2 0 1
+#IN
+IB_LEN T 0-3 1 STATIC
+ST_OCC T 0-1 0 CHECK,CHC
+#OUT
+ORD_OCC T 0-1 0 CONTROL,CTRL
+ORD_LCK T 0-1 0 CONTROL,CTRL
+IND_OCC T 0-1 0 STATUS,STAS
+#EQU
+V_OCC = ST_OCC OR CH_OCC(0) AND IB_LEN > 0;
+V_CNT = IF V_OCC = 1 AND V_CNT < MAX_CNT
+  THEN V_CNT + 1 ELSE 0;
+V_LCK = IF V_CNT >= 3 THEN 1 ELSE V_LCK AND NOT CH_OCC(1);
+V_DIR = IF CH_OCC(0) THEN 1 ELSE IF CH_OCC(1) THEN 2 ELSE 0;
+ORD_OCC = V_OCC;
+ORD_LCK = V_LCK * (IB_LEN + 1) / 2;
+IND_OCC = NOT V_OCC;
+CH_OCC(1) = V_OCC;
+CH_OCC(0) = V_LCK AND NOT V_OCC;
+#END
+'''
+
+
+def main():
+    objects_num = int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS_NUM
+    names = [f'S{x}' for x in range(objects_num)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        int_data_path = os.path.join(temp_dir, 'IntData')
+        logic_path = os.path.join(temp_dir, 'Logic.ste')
+        write_int_data(int_data_path, names)
+        with open(logic_path, 'w') as out_data:
+            out_data.write(LOGIC)
+        with open(int_data_path) as int_data:
+            objects = interlocking_data_parser(int_data)['Logical_objects']
+        logic_data = read_logic(logic_path)
+
+    start = time.perf_counter()
+    engine = LogicEngine(logic_data, objects)
+    print('objects: {}, build: {:.3f} s'.format(
+        objects_num, time.perf_counter() - start))
+
+    # Занятие первого участка распространяется
+    # по цепочке объектов через каналы
+    engine.set_value(names[0], 'ST_OCC', 1)
+    for track in (False, True):
+        start = time.perf_counter()
+        changes = 0
+        for _ in range(CYCLES_NUM):
+            changes += len(engine.run_cycle(track))
+        elapsed = time.perf_counter() - start
+        print('track changes: {}, cycles/s: {:.0f}, '
+              'equations/s: {:.0f}, changes: {}'.format(
+                  track, CYCLES_NUM / elapsed,
+                  CYCLES_NUM * objects_num * 9 / elapsed, changes))
+
+
+if __name__ == '__main__':
+    main()
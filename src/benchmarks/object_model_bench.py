@@ -0,0 +1,109 @@
+# =========================================
+# ==__________Object_model_bench_________==
+# =========================================
+"""
+Сравнение потребления памяти логическими объектами
+во вложенных словарях и в записях object_model.
+
+Запуск из каталога src:
+    python -m benchmarks.object_model_bench [КОЛИЧЕСТВО_ОБЪЕКТОВ]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from site_readers.object_model import ChannelData
+from site_readers.object_model import ControlData
+from site_readers.object_model import IndicationData
+from site_readers.object_model import Leg
+from site_readers.object_model import LogicalObjectData
+from site_readers.object_model import VariableData
+
+OBJECTS_NUM = 20000
+# Количество переменных каждого вида в объекте,
+# близкое к объектам крупных станций
+ORDERS_NUM = 12
+STATUS_NUM = 12
+INDICATION_NUM = 8
+VARIABLES_NUM = 30
+CHANNELS_NUM = 4
+
+
+def dict_object(name):
+    """
+    Функция создания объекта во вложенных словарях
+    """
+    obj = {"Name": name, "Type": 'SECTION', "legs": {},
+           "individualizations": {}, "orders": {}, "status": {},
+           "indication": {}, "ITI": [], "ofw": {}, "incoming": {},
+           "telegram": [], "command": {}, "Check": [],
+           "variables": {}, "channels": {}, }
+    for leg in ('0', '1'):
+        obj["legs"][leg] = {"neighbour": name, "neighbour_leg": leg}
+    for num in range(ORDERS_NUM):
+        obj["orders"][f'ORD_{num}'] = {"ipu": "", "value": ""}
+    for num in range(STATUS_NUM):
+        obj["status"][f'ST_{num}'] = {"ipu": "", "value": "0"}
+    for num in range(INDICATION_NUM):
+        obj["indication"][f'IND_{num}'] = {"cos": "", "value": ""}
+    for num in range(VARIABLES_NUM):
+        obj["variables"][f'V_{num}'] = {"value": "0"}
+    for num in range(CHANNELS_NUM):
+        obj["channels"][f'CH_{num}(0)'] = {"IN": "0", "OUT": "0"}
+    return obj
+
+
+def record_object(name):
+    """
+    Функция создания объекта в записях object_model
+    """
+    obj = LogicalObjectData(Name=name, Type='SECTION', legs={},
+                            individualizations={}, orders={}, status={},
+                            indication={}, ITI=[], ofw={}, incoming={},
+                            telegram=[], command={}, Check=[],
+                            variables={}, channels={})
+    for leg in ('0', '1'):
+        obj["legs"][leg] = Leg(name, leg)
+    for num in range(ORDERS_NUM):
+        obj["orders"][f'ORD_{num}'] = ControlData()
+    for num in range(STATUS_NUM):
+        obj["status"][f'ST_{num}'] = ControlData("", "0")
+    for num in range(INDICATION_NUM):
+        obj["indication"][f'IND_{num}'] = IndicationData()
+    for num in range(VARIABLES_NUM):
+        obj["variables"][f'V_{num}'] = VariableData("0")
+    for num in range(CHANNELS_NUM):
+        obj["channels"][f'CH_{num}(0)'] = ChannelData("0", "0")
+    return obj
+
+
+def measure(factory, objects_num):
+    """
+    Функция замера памяти, занимаемой объектами,
+    и времени их создания
+    """
+    # Имена и ключи создаются заранее, так как
+    # одинаковы для обоих вариантов
+    names = [f'S{x}' for x in range(objects_num)]
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = {x: factory(x) for x in names}
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return elapsed, current / 2 ** 20
+
+
+def main():
+    objects_num = int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS_NUM
+    header = ('structure', 'time, s', 'memory, MB')
+    print('{:<12}{:>10}{:>12}'.format(*header))
+    for name, factory in (('dict', dict_object), ('record', record_object)):
+        elapsed, memory = measure(factory, objects_num)
+        print('{:<12}{:>10.2f}{:>12.1f}'.format(name, elapsed, memory))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# =========================================
+# ==____________Readers_bench____________==
+# =========================================
+"""
+Замер времени анализа и пикового потребления памяти
+анализаторами CommandTable, IntData и логики
+на синтетических файлах станции.
+
+Запуск из каталога src:
+    python -m benchmarks.readers_bench [КОЛИЧЕСТВО_ОБЪЕКТОВ]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from site_readers import logic_reader
+from site_readers.command_reader import command_data_parser
+from site_readers.data_reader import interlocking_data_index
+from site_readers.data_reader import interlocking_data_parser
+
+OBJECTS_NUM = 20000
+
+
+def write_command_table(file_path, names):
+    """
+    Функция записи синтетического CommandTable
+    """
+    with open(file_path, 'w') as out_data:
+        out_data.write('Site_product_name "STATION"\nCOS interface\n')
+        out_data.write('COS1 name 1 2 3 4\nComponents\n')
+        for num, name in enumerate(names):
+            neighbour = names[(num + 1) % len(names)]
+            for command in ('SET', 'REL', 'BLK'):
+                out_data.write('Component\n')
+                out_data.write(f'R{num} {command} {name} {neighbour} 1 2 Y\n')
+                out_data.write(f'{name} free {neighbour} free\nMain\n')
+                out_data.write(f'{name} lock\n{neighbour} lock\n')
+                out_data.write(f'{name} set "a b"\n')
+        out_data.write('End\n')
+
+
+def write_int_data(file_path, names):
+    """
+    Функция записи синтетического IntData
+    """
+    with open(file_path, 'w') as out_data:
+        out_data.write('Site_product_name "STATION"\nLogical objects\n')
+        for num, name in enumerate(names):
+            previous = names[num - 1]
+            neighbour = names[(num + 1) % len(names)]
+            out_data.write(f'External object {name} type SECTION\n')
+            out_data.write(f'Leg\n0 {previous} 1\n1 {neighbour} 0\n')
+            out_data.write(f'Individualizations\nIB_LEN {num % 4} IB_X 1\n')
+            out_data.write('Order\n')
+            if not num % 10:
+                out_data.write(f'CTFW_A {neighbour} CHK_A\n')
+            out_data.write(f'Order\nORD_OCC IPU_{name}\nORD_LCK IPU_{name}\n')
+            out_data.write(f'Status\nST_OCC IPU_{name}\n')
+            out_data.write(f'Indication\nIND_OCC COS_{name}\n')
+            out_data.write('Command\nAUTO X 1 2\nCheck\nC1 x\n')
+        out_data.write('IPU objects\n')
+        for name in names:
+            out_data.write(f'IPU_{name} yard TC COS1 a b\n')
+        out_data.write('COS\nCOS1 T 1\nEnd\n')
+
+
+def write_logic(file_path, types_num):
+    """
+    Функция записи синтетического файла логики
+    """
+    with open(file_path, 'w') as out_data:
+        out_data.write('#PROGRAM TEST\n#PAR\n#CONST\n#OBJ\n')
+        for num in range(types_num):
+            out_data.write(f'TYPE{num} 2 T,{num}\n')
+        out_data.write('#GLOBVAR\n#INOUT\nCH T 0-1\n')
+        for num in range(types_num):
+            out_data.write(f'#TYPE{num}\n#INOUT\nCH 0 0 1\n#OWN\n')
+            for var in range(50):
+                out_data.write(f'V{var} T 0-1 0 1\n')
+            out_data.write('#IN\n')
+            for var in range(50):
+                out_data.write(f'I{var} T 0-1 0 STATIC\n')
+            out_data.write('#OUT\n')
+            for var in range(50):
+                out_data.write(f'O{var} T 0-1 0 CONTROL,CTRL\n')
+            out_data.write('#EQU\n')
+        out_data.write('#END\n')
+
+
+def measure(parser, file_path):
+    """
+    Функция замера времени анализа файла и
+    пикового потребления памяти
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(file_path) as file_data:
+        parser(file_data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    objects_num = int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS_NUM
+    names = [f'S{x}' for x in range(objects_num)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        command_path = os.path.join(temp_dir, 'CommandTable')
+        int_data_path = os.path.join(temp_dir, 'IntData')
+        logic_path = os.path.join(temp_dir, 'Logic.ste')
+        write_command_table(command_path, names)
+        write_int_data(int_data_path, names)
+        write_logic(logic_path, max(objects_num // 100, 1))
+
+        cases = (
+            ('command_data_parser', command_data_parser, command_path),
+            ('interlocking_data_parser', interlocking_data_parser,
+             int_data_path),
+            ('interlocking_data_index', interlocking_data_index,
+             int_data_path),
+            ('logic_analyse', logic_reader.logic_analyse, logic_path),
+        )
+        header = ('parser', 'MB', 'time, s', 'peak, MB')
+        print('{:<26}{:>8}{:>10}{:>10}'.format(*header))
+        for name, parser, file_path in cases:
+            size = os.path.getsize(file_path) / 2 ** 20
+            elapsed, peak = measure(parser, file_path)
+            row = (name, size, elapsed, peak)
+            print('{:<26}{:>8.1f}{:>10.2f}{:>10.1f}'.format(*row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# =========================================
+# ==_____________Scene_bench_____________==
+# =========================================
+"""
+Замер времени и памяти при чтении синтетического
+файла расположения объектов yard.xml.
+Для сравнения приводится разбор того же файла
+в DOM средствами xml.dom.minidom.
+
+Запуск из каталога src:
+    python -m benchmarks.scene_bench [КОЛИЧЕСТВО_ОБЪЕКТОВ]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.dom.minidom
+
+from site_readers.scene_reader import read_scene_data
+
+OBJECTS_NUM = 50000
+
+
+def write_yard(file_path, objects_num):
+    """
+    Функция записи синтетического файла yard.xml
+    """
+    with open(file_path, 'w') as out_data:
+        out_data.write('<?xml version="1.0"?>\n<yard>\n')
+        for num in range(objects_num):
+            out_data.write(
+                f'<ScriptGraphicObject object_name="S{num}" '
+                f'x="{num % 500 * 50},5" y="{num // 500 * 40}" '
+                f'm11="1.000000001" m12="0" m21="0" m22="1"/>\n')
+        out_data.write('</yard>\n')
+
+
+def minidom_read(file_path):
+    """
+    Функция разбора файла в DOM с обходом
+    объектов, как в прежней реализации чтения
+    """
+    doc = xml.dom.minidom.parse(file_path)
+    nodes = doc.documentElement.getElementsByTagName('ScriptGraphicObject')
+    return {x.getAttribute('object_name'): dict(x.attributes.items())
+            for x in nodes}
+
+
+def measure(reader, file_path):
+    """
+    Функция замера времени чтения, пикового
+    потребления памяти и памяти, занимаемой
+    результатом чтения
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = reader(file_path)
+    elapsed = time.perf_counter() - start
+    # Дерево DOM содержит циклические ссылки и без
+    # сборки мусора учитывалось бы в результате
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / 2 ** 20, current / 2 ** 20
+
+
+def main():
+    objects_num = int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS_NUM
+    header = ('reader', 'objects', 'MB', 'time, s', 'peak, MB', 'result, MB')
+    print('{:<16}{:>9}{:>7}{:>9}{:>10}{:>12}'.format(*header))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Чтение файлов разного размера показывает рост
+        # памяти на разбор сверх памяти результата
+        for num in (objects_num // 10, objects_num):
+            file_path = os.path.join(temp_dir, f'yard_{num}.xml')
+            write_yard(file_path, num)
+            size = os.path.getsize(file_path) / 2 ** 20
+            for name, reader in (('read_scene_data', read_scene_data),
+                                 ('minidom', minidom_read)):
+                elapsed, peak, current = measure(reader, file_path)
+                row = (name, num, size, elapsed, peak, current)
+                print('{:<16}{:>9}{:>7.1f}{:>9.2f}{:>10.1f}{:>12.1f}'.format(
+                    *row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+# =========================================
+# ==___________Sim_journal_bench___________==
+# =========================================
+"""
+Замер обработки сеанса обмена с имитатором по
+журналу: разбора ответов и обновления окна
+программы без имитатора.
+
+Во время воспроизведения замеряется наибольшая
+задержка обработки событий окна.
+
+Без аргументов сеанс записывается с локальным
+имитатором на синтетической станции, с аргументами
+воспроизводится журнал записанного сеанса для
+проекта станции. Журнал воспроизводится без
+задержек или с ускорением СКОРОСТЬ.
+
+Запуск из каталога src:
+    python -m benchmarks.sim_journal_bench [CONFIG JOURNAL [СКОРОСТЬ]]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_simulator_bench import SITE_ID
+from benchmarks.fake_simulator_bench import start_simulator
+from benchmarks.fake_simulator_bench import write_site
+from modeling_classes.fake_simulator import FakeSimulator
+from modeling_classes.fake_simulator import FakeStation
+from modeling_classes.sim_protocol import break_command
+from modeling_classes.sim_protocol import variables_command
+from modeling_classes.sim_protocol import yard_command
+
+OBJECTS_NUM = 2000
+UPDATES_NUM = 200
+# Каждый DUMP_PERIOD пересчёт запрашивается
+# состояние всех объектов
+DUMP_PERIOD = 50
+# Период таймера замера задержек окна, мс
+HEARTBEAT_INTERVAL = 1
+
+
+def create_window(config_path):
+    """
+    Функция создания окна программы
+    с загруженным проектом
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+
+    from main import ToolWindow
+
+    app = QApplication.instance() or QApplication([])
+    window = ToolWindow()
+    window.open_site_data(config_path)
+    return app, window
+
+
+def record_session(app, window, port, journal_path, names):
+    """
+    Функция записи сеанса с локальным имитатором.
+    Возвращает время сеанса
+    """
+    sim_socket = window._socket
+    sim_socket.open_connection('127.0.0.1', port)
+    if not sim_socket.waitForConnected(5000):
+        raise ConnectionError(port)
+    sim_socket.start_capture(journal_path)
+    commands = [yard_command(SITE_ID, f'IPU_{names[0]}', 1)]
+    for num in range(UPDATES_NUM):
+        commands.append(break_command(SITE_ID, 'after', 1))
+        commands.append(variables_command(SITE_ID, names[num % len(names)]))
+        if not num % DUMP_PERIOD:
+            commands.append(variables_command(SITE_ID))
+    start = time.perf_counter()
+    for command in commands:
+        request = sim_socket.send(command)
+        while not request.done:
+            sim_socket.waitForReadyRead(1000)
+            app.processEvents()
+    elapsed = time.perf_counter() - start
+    sim_socket.stop_capture()
+    sim_socket.close()
+    return elapsed
+
+
+def replay_session(app, window, journal_path, speed=None):
+    """
+    Функция воспроизведения журнала в окне.
+    Возвращает объект воспроизведения и наибольшую
+    задержку таймера окна в секундах
+    """
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtCore import QTimer
+
+    from modeling_classes.journal_replay import JournalReplay
+
+    window._selected_obj = window._selected_obj or next(
+        iter(window._logical_objects), None)
+    replay = JournalReplay(window._socket, journal_path, speed)
+    worker = window._response_worker
+    loop = QEventLoop()
+    # Таймер срабатывает с задержкой, если поток
+    # окна занят дольше HEARTBEAT_INTERVAL
+    last_tick = [time.perf_counter()]
+    stall = [0]
+
+    def heartbeat():
+        now = time.perf_counter()
+        stall[0] = max(stall[0], now - last_tick[0])
+        last_tick[0] = now
+        if not replay.active and not worker.busy:
+            loop.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(heartbeat)
+    replay.start()
+    timer.start(HEARTBEAT_INTERVAL)
+    loop.exec_()
+    timer.stop()
+    return replay, stall[0]
+
+
+def main():
+    speed = None
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if len(sys.argv) > 2:
+            config_path, journal_path = sys.argv[1:3]
+            if len(sys.argv) > 3:
+                speed = float(sys.argv[3])
+            app, window = create_window(config_path)
+        else:
+            names = [f'S{x}' for x in range(OBJECTS_NUM)]
+            config_path = write_site(temp_dir, names)
+            station = FakeStation.from_files(
+                os.path.join(temp_dir, 'IntData.txt'),
+                os.path.join(temp_dir, 'Logic.ste'))
+            port = start_simulator(FakeSimulator({SITE_ID: station}))
+            app, window = create_window(config_path)
+            window._selected_obj = names[0]
+            journal_path = os.path.join(temp_dir, 'session.simj')
+            elapsed = record_session(app, window, port, journal_path, names)
+            print('recorded session: {:.2f} s'.format(elapsed))
+        start = time.perf_counter()
+        replay, stall = replay_session(app, window, journal_path, speed)
+        elapsed = time.perf_counter() - start
+        mb = replay.received / 2 ** 20
+        print('replay: {} chunks, {:.1f} MB, {:.2f} s, {:.1f} MB/s'.format(
+            replay.chunks, mb, elapsed, mb / elapsed))
+        print('longest window stall: {:.1f} ms'.format(stall * 1000))
+
+
+if __name__ == '__main__':
+    main()
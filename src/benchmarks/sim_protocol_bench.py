@@ -0,0 +1,125 @@
+# =========================================
+# ==___________Sim_protocol_bench__________==
+# =========================================
+"""
+Замер скорости приёма больших ответов имитатора,
+как на запрос variables * действия RF.
+Локальный имитатор в отдельном потоке отвечает
+на каждую команду ответом заданного размера,
+ответ принимается прежним способом (накопление
+строки и проверка её окончания) и через
+ResponseFramer.
+
+Запуск из каталога src:
+    python -m benchmarks.sim_protocol_bench [РАЗМЕР_ОТВЕТА_МБ]
+"""
+
+import socket
+import sys
+import threading
+import time
+
+from modeling_classes.sim_protocol import PROMPT
+from modeling_classes.sim_protocol import ResponseFramer
+from modeling_classes.sim_protocol import decode_response
+
+RESPONSE_MB = 8
+REQUESTS_NUM = 3
+RECEIVE_SIZE = 64 * 2 ** 10
+
+
+def make_response(size):
+    """
+    Функция создания ответа на запрос
+    переменных всех объектов
+    """
+    lines = []
+    length = 0
+    num = 0
+    while length < size:
+        line = f'S{num}.V_OCC 1 S{num}.CH(1) 0,1 S{num}.V_LOCK 0\n'
+        lines.append(line)
+        length += len(line)
+        num += 1
+    return ''.join(lines).encode() + PROMPT
+
+
+def serve(server, response):
+    """
+    Функция локального имитатора: на каждую
+    строку команды отправляется ответ
+    """
+    connection, _ = server.accept()
+    with connection:
+        with connection.makefile('rb') as commands:
+            for _ in commands:
+                connection.sendall(response)
+
+
+class StringReceiver:
+    """
+    Класс приёма ответов прежним способом: строка
+    хранится в атрибуте, как в SimSocket, по этому
+    каждое добавление копирует всю строку
+    """
+
+    def __init__(self):
+        self.data = ''
+
+    def receive(self, connection, requests_num):
+        received = 0
+        for _ in range(requests_num):
+            connection.sendall(b'1/variables *\n')
+            self.data = ''
+            while not self.data.endswith('* > '):
+                chunk = connection.recv(RECEIVE_SIZE)
+                self.data += chunk.decode('utf-8', 'replace')
+            received += len(self.data)
+        return received
+
+
+def receive_string(connection, requests_num):
+    """
+    Функция приёма ответов прежним способом
+    """
+    return StringReceiver().receive(connection, requests_num)
+
+
+def receive_framed(connection, requests_num):
+    """
+    Функция приёма ответов через ResponseFramer
+    """
+    framer = ResponseFramer()
+    received = 0
+    for _ in range(requests_num):
+        connection.sendall(b'1/variables *\n')
+        responses = []
+        while not responses:
+            responses = framer.feed(connection.recv(RECEIVE_SIZE))
+        received += sum(len(decode_response(x)) for x in responses)
+    return received
+
+
+def main():
+    size = float(sys.argv[1]) if len(sys.argv) > 1 else RESPONSE_MB
+    response = make_response(int(size * 2 ** 20))
+    print('{:<16}{:>10}{:>10}{:>10}'.format('receiver', 'MB', 'time, s',
+                                            'MB/s'))
+    for name, receiver in (('string', receive_string),
+                           ('ResponseFramer', receive_framed)):
+        server = socket.create_server(('127.0.0.1', 0))
+        thread = threading.Thread(target=serve, args=(server, response),
+                                  daemon=True)
+        thread.start()
+        with socket.create_connection(server.getsockname()) as connection:
+            start = time.perf_counter()
+            received = receiver(connection, REQUESTS_NUM)
+            elapsed = time.perf_counter() - start
+        server.close()
+        mb = received / 2 ** 20
+        print('{:<16}{:>10.1f}{:>10.2f}{:>10.1f}'.format(name, mb, elapsed,
+                                                         mb / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# =========================================
+# ==___________Tokenizer_bench___________==
+# =========================================
+"""
+Замер стоимости разбиения одной строки для каждого
+диалекта исходных файлов: прежним вызовом re.findall
+со строковым шаблоном и общим модулем tokenizer.
+
+Запуск из каталога src:
+    python -m benchmarks.tokenizer_bench
+"""
+
+import re
+import timeit
+
+from site_readers import tokenizer
+
+REPEAT = 5
+NUMBER = 20000
+
+# Типичные строки каждого диалекта
+DIALECTS = (
+    ('data_reader', r'(?:[\w.-]|".*")+', '.',
+     tokenizer.get_word_line_data,
+     ('External object S12 type SECTION\n',
+      '1 S13 0\n',
+      'IB_LEN 1 IB_X 0 IB_MODE 2\n',
+      '. commented out line\n',
+      'Site_product_name "Test station"\n')),
+    ('command_reader', r'(?:[\w.-]|".*")+', '.',
+     tokenizer.get_word_line_data,
+     ('R12 SET S12 S13 1 2 Y\n',
+      'S12 lock\n',
+      'S12 set "a b"\n',
+      '.S12 free\n')),
+    ('configuration_reader', r'[\w.\-\~\;>]+', '.',
+     tokenizer.get_config_body_line_data,
+     ('File IntData.txt-2 Key IntData;Data Identity A\n',
+      'Path 1 ~\n',
+      '-> Key CommandTable\n',
+      '. comment\n')),
+    ('logic_reader', r'[#!\w,\-]+', '!',
+     tokenizer.get_logic_line_data,
+     ('IB_LEN T 0-3 1 STATIC\n',
+      'ORD_OCC T 0-1 0 CONTROL,CTRL\n',
+      '! comment line\n',
+      '#SECTION\n')),
+)
+
+
+def old_line_data(pattern, comment):
+    """
+    Функция разбиения строки в прежнем виде
+    """
+    def get_line_data(line):
+        match = re.findall(pattern, line)
+        if match and comment != match[0][0]:
+            return match
+    return get_line_data
+
+
+def line_cost(func, lines):
+    """
+    Функция получения стоимости разбиения
+    одной строки в наносекундах
+    """
+    def run():
+        for line in lines:
+            func(line)
+    best = min(timeit.repeat(run, repeat=REPEAT, number=NUMBER))
+    return best / (NUMBER * len(lines)) * 1e9
+
+
+def main():
+    header = ('dialect', 'old, ns', 'new, ns', 'ratio')
+    print('{:<22}{:>10}{:>10}{:>9}'.format(*header))
+    for name, pattern, comment, new_func, lines in DIALECTS:
+        old_cost = line_cost(old_line_data(pattern, comment), lines)
+        new_cost = line_cost(new_func, lines)
+        print('{:<22}{:>10.0f}{:>10.0f}{:>9.2f}'.format(
+            name, old_cost, new_cost, old_cost / new_cost))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,14 +8,20 @@ from PyQt5.QtGui import QTransform
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtWidgets import QSplashScreen
 
+from modeling_classes.response_worker import ResponseWorker
+from modeling_classes.sim_protocol import PRIORITY_BACKGROUND
+from modeling_classes.sim_protocol import check_command
+from modeling_classes.sim_protocol import cmd_command
+from modeling_classes.sim_protocol import individ_command
+from modeling_classes.sim_protocol import variables_command
+from modeling_classes.sim_protocol import yard_command
+from modeling_classes.window import BACKGROUND_TIMEOUT
 from modeling_classes.window import SimWindow
 from site_classes.color_dialog import OBJECT_COLORS, ObjectColorWindow
 from site_classes.scene_objects import LogicalConnector
 from site_classes.scene_objects import LogicalObject
 from site_classes.window_objects import ImportSiteDataMixin
 from site_classes.window_objects import MainWindow
-from site_readers.log_reader import log_data_parser
-from site_readers.log_reader import object_variable_parser
 
 START_PICTURE = "static/start_screen.gif"
 
@@ -81,7 +87,9 @@ class SiteWindow(ImportSiteDataMixin, MainWindow):
                                      self._coordinates["sceneHeight"])
 
         for deep, name in enumerate(self._logical_objects):
-            log_data = self._logical_objects[name]
+            # Для отображения достаточно заголовка объекта,
+            # полностью объект загружается при выделении
+            log_data = self._logical_objects.header(name)
             # Для каждого логического объекта создаем
             # визуальное представление
             # Глубину задаём по порядковому номеру
@@ -135,7 +143,7 @@ class SiteWindow(ImportSiteDataMixin, MainWindow):
         # Разделяем объекты на связанные
         # друг с другом и остальные
         for name in without_pos:
-            log_obj = self._logical_objects[name]
+            log_obj = self._logical_objects.header(name)
             if log_obj["legs"]:
                 obj_with_legs.append(name)
             else:
@@ -158,7 +166,7 @@ class SiteWindow(ImportSiteDataMixin, MainWindow):
         объекта по координатам соседей
         """
         for name in objs_with_legs:
-            log_obj = self._logical_objects[name]
+            log_obj = self._logical_objects.header(name)
             v_obj = self._visual_objects[name]
             x_n_poses = []
             y_n_poses = []
@@ -191,9 +199,9 @@ class SiteWindow(ImportSiteDataMixin, MainWindow):
         # Очищаем дерево проекта и строим
         # с загруженными данными
         self.project_explorer.objects_tree.clear_tree()
-        self.project_explorer.build_project_tree(self._components,
-                                                 self._logical_objects,
-                                                 self._ipu_objects)
+        self.project_explorer.build_project_tree(
+            self._components, self._logical_objects.headers(),
+            self._ipu_objects)
 
     @staticmethod
     def get_leg_pos(scene_object):
@@ -292,7 +300,7 @@ class SiteWindow(ImportSiteDataMixin, MainWindow):
         # Получаем имя соседнего объекта
         # с заданного вывода и информацию
         # о номере вывода
-        legs = self._logical_objects[log_name]["legs"][from_leg]
+        legs = self._logical_objects.header(log_name)["legs"][from_leg]
         n_name = legs["neighbour"]
         n_leg = int(legs["neighbour_leg"])
         # Получаем объект отображения вывода
@@ -472,9 +480,11 @@ class SiteWindow(ImportSiteDataMixin, MainWindow):
                 for col_num, col_value in enumerate(column_data):
                     # Данные могут быть в виде
                     # строки с названием канала
-                    # и в виде словаря со значениями
-                    if isinstance(col_value, dict):
-                        # Если это словарь со значениями,
+                    # и в виде записи со значениями
+                    if isinstance(col_value, str):
+                        out_table.item(row_num, 0).setText(col_value)
+                    else:
+                        # Если это запись со значениями,
                         # записываем каждое значение
                         # в свою ячейку
                         if "IN" in col_value:
@@ -483,8 +493,6 @@ class SiteWindow(ImportSiteDataMixin, MainWindow):
                         if "OUT" in col_value:
                             out_value = col_value["OUT"]
                             out_table.item(row_num, 2).setText(out_value)
-                    else:
-                        out_table.item(row_num, 0).setText(col_value)
                 out_table.showRow(row_num)
                 max_row_num = row_num
         out_table.hide_not_used_rows(max_row_num)
@@ -569,6 +577,13 @@ class ToolWindow(SimWindow, SiteWindow):
         # Устанавливаем объекту соединения
         # функцию обработчик входящей информации
         self._socket.set_out_function(self.get_data_from_sim)
+        # Разбор ответов имитатора в отдельном потоке
+        # с применением изменений в потоке окна
+        self._response_worker = ResponseWorker(self.update_object,
+                                               self.refresh_selected)
+        # Устанавливаем функцию применения
+        # изменений при воспроизведении лог файла
+        self.set_replay_function(self.apply_log_data, self.reset_objects)
 
     def select_tree_item(self, tree_item):
         """
@@ -582,9 +597,13 @@ class ToolWindow(SimWindow, SiteWindow):
         # всех его переменных
         if self._socket.isOpen():
             obj_name = tree_item.text(0)
-            out_str = '{}/variables {}\n'.format(self._site_id, obj_name)
+            out_str = variables_command(self._site_id, obj_name)
 
-            self._socket.send(out_str)
+            # Обновление переменных не задерживает
+            # отправку действий пользователя, а без
+            # ответа - отправку следующих команд
+            self._socket.send(out_str, priority=PRIORITY_BACKGROUND,
+                              timeout=BACKGROUND_TIMEOUT)
 
         super().select_tree_item(tree_item)
 
@@ -618,13 +637,12 @@ class ToolWindow(SimWindow, SiteWindow):
             # Если к статусу привязана информация
             # от напольного объекта, то меняем
             # состояние самого объекта
-            out_str = '{0}/yard {1} try_set {2}\n'.format(self._site_id,
-                                                          status_obj, value)
+            out_str = yard_command(self._site_id, status_obj, value)
         else:
             # Если к статусу ничего не привязано
             # или привязан информация
-            out_str = '{0}/check {1}.{2}={3}\n'.format(self._site_id, obj_name,
-                                                       status_name, value)
+            out_str = check_command(self._site_id, obj_name, status_name,
+                                    value)
         self._socket.send(out_str)
 
     def send_component(self, line, column):
@@ -637,8 +655,7 @@ class ToolWindow(SimWindow, SiteWindow):
             # команды в одну строку
             comm_type = self.command_table.item(line, 0).text()
             comm_param = self.command_table.item(line, 1).text()
-            out_str = "{0}/cmd {1} {2}\n".format(self._site_id, comm_type,
-                                                 comm_param)
+            out_str = cmd_command(self._site_id, comm_type, comm_param)
 
             self._socket.send(out_str)
 
@@ -651,9 +668,8 @@ class ToolWindow(SimWindow, SiteWindow):
             return
 
         obj_name = self._selected_obj
-        out_str = '{0}/individ {1}.{2}={3}\n'.format(self._site_id, obj_name,
-                                                     self.sender().name,
-                                                     self.sender().value())
+        out_str = individ_command(self._site_id, obj_name, self.sender().name,
+                                  self.sender().value())
         self._socket.send(out_str)
 
     def set_channel_value_to_neighbour(self, obj_name, channel, value):
@@ -708,9 +724,8 @@ class ToolWindow(SimWindow, SiteWindow):
                         elif chapter == 'channels':
                             # Значение каналов будет всегда
                             # исходящим для текущего объекта
-                            obj_data = self._logical_objects[obj_name]
                             value = new_value['value_out']
-                            obj_data["channels"][var_name]['OUT'] = value
+                            log_obj["channels"][var_name]['OUT'] = value
                             # Добавляем исходящее значение
                             # входящим соседнему объекту
                             self.set_channel_value_to_neighbour(obj_name,
@@ -721,48 +736,52 @@ class ToolWindow(SimWindow, SiteWindow):
                             self._logical_objects[obj_name][chapter][
                                 var_name].update(new_value)
 
+    def apply_log_data(self, log_data, refresh=True):
+        """
+        Метод применения данных лог файла
+        вида СТАНЦИЯ:ОБЪЕКТ:ПЕРЕМЕННАЯ.
+        Возвращает данные текущего проекта
+        """
+        # Флаг изменения объекта мог быть
+        # установлен вызывающим методом
+        changing_object = self._changing_object
+        self._changing_object = True
+        # Выбираем данные относящиеся только
+        # к текущему проекту
+        proj_data = log_data.get(self._product_name, {})
+        # Обновляем изменившиеся объекты
+        for obj_name in proj_data:
+            self.update_object(obj_name, proj_data)
+        if refresh and self._selected_obj:
+            self.config_settings(self._selected_obj)
+        self._changing_object = changing_object
+        return proj_data
+
     def get_data_from_sim(self, sim_data):
         """
         Метод обработки данных полученных
-        из имитатора или лог файла
+        из имитатора. Данные декодируются и разбираются
+        в отдельном потоке, изменения применяются
+        частями, чтобы окно не переставало отвечать
         """
+        # Ответ на запрос переменных относится к
+        # объекту, выделенному на момент получения
+        self._response_worker.parse(sim_data, self._product_name,
+                                    self._selected_obj)
 
+    def refresh_selected(self):
+        """
+        Метод обновления вкладки параметров
+        выделенного объекта после применения
+        изменений от имитатора
+        """
         # Устанавливаем флаг изменения
         # объекта
+        changing_object = self._changing_object
         self._changing_object = True
-
-        if '!' in sim_data:
-            # Если информация была получена
-            # в виде потока данных от всех объектов
-            # или из лог файла
-            new_data = log_data_parser(sim_data.split('\n'))
-            # Выбираем данные относящиеся только
-            # к текущему проекту
-            proj_data = new_data.get(self._product_name, {})
-            if proj_data:
-                # Обновляем изменившиеся объекты
-                for obj_name in proj_data:
-                    self.update_object(obj_name, proj_data)
-
-        else:
-            # Если данные были получены только
-            # для одного объекта
-            proj_data = object_variable_parser(sim_data.split('\n'),
-                                               self._selected_obj)
-            if proj_data:
-                # Обновляем изменившийся
-                self.update_object(self._selected_obj, proj_data)
-                self.config_settings(self._selected_obj)
-        # Если данные были получены и
-        # выделен какой-то объект, обновляем
-        # вкладку параметров
-        if self._selected_obj and proj_data:
-            # Так как выделенный объект мог измениться
-            # во время получения данных от имитатора
-            # обновлять данные вкладки раньше обработки
-            # полученной информации не имеет смысла
+        if self._selected_obj:
             self.config_settings(self._selected_obj)
-        self._changing_object = False
+        self._changing_object = changing_object
 
 
 if __name__ == "__main__":
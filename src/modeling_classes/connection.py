@@ -1,19 +1,38 @@
-from PyQt5.Qt import QTextCodec
+import logging
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtNetwork import QTcpSocket
 
+from modeling_classes.sim_journal import RECEIVED
+from modeling_classes.sim_journal import SENT
+from modeling_classes.sim_journal import JournalWriter
+from modeling_classes.sim_protocol import PRIORITY_USER
+from modeling_classes.sim_protocol import CommandPipeline
+from modeling_classes.sim_protocol import ResponseFramer
+
 
 class SimSocket(QTcpSocket):
     """
     Класс подключения к эмулятору
     """
     _timeout = 1
+    # Период проверки времени ожидания ответов, мс
+    _timeout_check = 100
 
-    def __init__(self, state_button):
+    def __init__(self, state_button, depth=1):
         super().__init__()
-        # Очередь команд
-        self._queue = []
-        # Информация получаемая от имитатора
-        self._data = ""
+        # Очереди команд по приоритетам
+        # и команды, ожидающие ответа
+        self._pipeline = CommandPipeline(depth)
+        self._timeout_timer = QTimer(self)
+        self._timeout_timer.setInterval(self._timeout_check)
+        self._timeout_timer.timeout.connect(self.check_timeouts)
+        # Выделение ответов из информации,
+        # получаемой от имитатора
+        self._framer = ResponseFramer()
+        # Журнал обмена, записывается
+        # только по запросу
+        self._journal = None
         # Кнопка подключения к имитатору
         # TODO: Исключить изменение текста
         #  в классе сокета
@@ -36,6 +55,25 @@ class SimSocket(QTcpSocket):
         """
         self._out = func
 
+    @property
+    def capturing(self):
+        return self._journal is not None
+
+    def start_capture(self, file_path):
+        """
+        Запуск записи обмена с имитатором в журнал
+        """
+        self.stop_capture()
+        self._journal = JournalWriter(file_path)
+
+    def stop_capture(self):
+        """
+        Завершение записи журнала
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
     def open_connection(self, host, port):
         """
         Подключение к имитатору
@@ -45,8 +83,10 @@ class SimSocket(QTcpSocket):
 
     def close(self):
         """
-        Отключение от имитатора
+        Отключение от имитатора, запись
+        журнала при этом завершается
         """
+        self.stop_capture()
         self.disconnectFromHost()
         self._button.setText("Connect")
         self.clear()
@@ -70,23 +110,61 @@ class SimSocket(QTcpSocket):
         Функция очистки входящей информации
         и очереди команд
         """
-        self._data = ""
-        self._queue.clear()
+        self._framer.clear()
+        self._pipeline.clear()
+
+    def send(self, command, callback=None, priority=PRIORITY_USER,
+             timeout=None):
+        """
+        Функция отправки информации в имитатор.
+        Возвращает объект команды, завершаемый её
+        ответом в виде memoryview. Ответ передаётся в
+        функцию callback вида ФУНКЦИЯ(КОМАНДА), без неё -
+        в функцию обработчик входящей информации
+        """
+        request = self._pipeline.submit(command, priority, timeout)
+        request.add_done_callback(callback or self.deliver)
+        if timeout is not None and not self._timeout_timer.isActive():
+            self._timeout_timer.start()
+        self.write_ready()
+        return request
 
-    def send(self, command):
+    def write_ready(self):
         """
-        Функция отправки информации в имитатор
+        Функция отправки команд из очереди, пока
+        количество ожидающих ответа команд меньше
+        допустимого
         """
-        if self._data:
-            # Если от имитатора получена не вся информация
-            # после предыдущих команд, то записываем
-            # новую команду в очередь
-            self._queue.append(command)
-        else:
+        for request in self._pipeline.take_ready():
             # Преобразовываем строку к байтам
             # и отправляем в имитатор
-            command = command.encode(encoding="utf-8", errors="strict")
-            self.write(command)
+            data = request.command.encode(encoding="utf-8", errors="strict")
+            if self._journal is not None:
+                self._journal.write(SENT, data)
+            self.write(data)
+        if self._journal is not None:
+            self._journal.flush()
+
+    def deliver(self, request):
+        """
+        Функция передачи ответа команды
+        в функцию обработчик
+        """
+        if isinstance(request.error, TimeoutError):
+            logging.warning('no simulator response to %r in %s s',
+                            request.command, request.timeout)
+        elif request.error is None and self._out:
+            self._out(request.response)
+
+    def check_timeouts(self):
+        """
+        Функция завершения команд с истёкшим
+        временем ожидания ответа
+        """
+        self._pipeline.expire()
+        self.write_ready()
+        if not self._pipeline.has_deadlines():
+            self._timeout_timer.stop()
 
     def on_error(self):
         """
@@ -99,25 +177,47 @@ class SimSocket(QTcpSocket):
         """
         Функция обработки входящей информации
         """
+        chunks = []
         # Пока доступна информация для чтения
+        # считываем её
         while self.bytesAvailable():
-            # считываем её
-            incoming_data = self.readAll()
-            # преобразовываем из байтов в строку
-            data = QTextCodec.codecForMib(106).toUnicode(incoming_data)
-            # сохраняем во временное хранилище
-            self._data += data
-
-        if self._data.endswith("* > "):
-            # Если была передана вся информация
-            # и имитатор готов получать новые команды
-            # отправляем полученную информацию в функцию
-            # обработчик
-            if self._out:
-                self._out(self._data)
-            # Очищаем временное хранилище информации
-            self._data = ""
-            # Если в очереди есть команды,
-            # отправляем следующую
-            if self._queue:
-                self.send(self._queue.pop(0))
+            data = self.readAll().data()
+            if self._journal is not None:
+                self._journal.write(RECEIVED, data)
+            chunks.append(data)
+        if self._journal is not None:
+            self._journal.flush()
+        self.receive(chunks)
+
+    def receive(self, chunks):
+        """
+        Функция обработки входящих байтов,
+        полученных из подключения или журнала
+        """
+        responses = []
+        # Выделяем полные ответы,
+        # завершённые приглашением имитатора
+        for data in chunks:
+            responses += self._framer.feed(data)
+
+        for response in responses:
+            # Ответ сопоставляется самой ранней команде,
+            # ожидающей ответа. Ответ без команды
+            # передаём в функцию обработчик.
+            # Декодирование и копирование ответов размером
+            # в несколько мегабайт занимают заметное время,
+            # по этому ответ передаётся срезом memoryview
+            # и декодируется при разборе в отдельном потоке.
+            # Буфер среза не изменяется ResponseFramer
+            request = self._pipeline.on_response(response)
+            if request is None:
+                if self._out:
+                    self._out(response)
+            elif request.error is not None:
+                # Поздний ответ на команду с истёкшим
+                # временем ожидания
+                logging.warning('late simulator response to %r skipped',
+                                request.command)
+        # Отправляем следующие команды из очереди
+        if responses:
+            self.write_ready()
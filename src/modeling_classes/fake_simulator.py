@@ -0,0 +1,325 @@
+# =========================================
+# ==____________Fake_simulator____________==
+# =========================================
+"""
+Локальный имитатор для замеров нагрузки и задержек
+без оборудования имитатора.
+
+Станции строятся по IntData и файлу логики и
+пересчитываются LogicEngine. Имитатор принимает
+команды по TCP построчно и завершает каждый ответ
+приглашением PROMPT:
+
+    N/variables ОБЪЕКТ   переменные объекта вида
+                         ОБЪЕКТ.ПЕРЕМЕННАЯ ЗНАЧЕНИЕ
+    N/variables *        состояние всех объектов
+                         строками лог файла
+    N/go, go             один цикл станции или всех
+                         станций
+    N/break after Ц      Ц циклов
+    N/break seconds С    С секунд при cycle_rate
+                         циклах в секунду
+    N/break steady       циклы до цикла без изменений
+    N/check ОБЪЕКТ.СТАТУС=ЗНАЧЕНИЕ
+    N/yard ИПУ try_set ЗНАЧЕНИЕ
+    N/individ ОБЪЕКТ.БИТ=ЗНАЧЕНИЕ
+    N/cmd ТИП ПАРАМЕТР   только подтверждается, так
+                         как таблица команд не загружена
+
+Ответ на команды пересчёта - изменения переменных
+строками лог файла. Размер ответов увеличивается
+до response_size строками заполнения без данных,
+latency задерживает каждый ответ, с realtime циклы
+пересчитываются с частотой cycle_rate. Команды
+выполняются по одной, как в имитаторе, даже при
+нескольких подключениях.
+
+Запуск из каталога src:
+    python -m modeling_classes.fake_simulator INT_DATA LOGIC [--port N]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from modeling_classes.logic_engine import LogicEngine
+from modeling_classes.sim_protocol import PROMPT
+from site_readers.data_reader import interlocking_data_parser
+from site_readers.logic_reader import read_logic
+
+PORT = 5000
+CYCLE_RATE = 10
+# Наибольшее количество циклов break steady
+STEADY_LIMIT = 1000
+FILLER_WIDTH = 79
+
+
+class FakeStation:
+    """
+    Класс станции локального имитатора
+    """
+
+    def __init__(self, name, logical_objects, engine):
+        self.name = name
+        self.engine = engine
+        self.objects = [x for x in logical_objects if x in engine]
+        # Пары ИПУ:[(ОБЪЕКТ, СТАТУС)] для команды yard
+        self._ipu = {}
+        for obj_name in self.objects:
+            for status, data in logical_objects[obj_name]["status"].items():
+                self._ipu.setdefault(data["ipu"], []).append(
+                    (obj_name, status))
+
+    @classmethod
+    def from_files(cls, int_data_path, logic_path):
+        """
+        Метод создания станции по файлам IntData и логики
+        """
+        with open(int_data_path) as int_data:
+            data = interlocking_data_parser(int_data)
+        objects = data['Logical_objects']
+        engine = LogicEngine(read_logic(logic_path), objects)
+        return cls(data['Site_product_name'].replace('"', ''), objects,
+                   engine)
+
+    def log_line(self, obj_name, var_name, value, old_value):
+        """
+        Метод получения строки лог файла
+        изменения переменной
+        """
+        cycle = self.engine.cycle
+        if '(' in var_name:
+            channel, leg = var_name[:-1].split('(')
+            return (f'! {self.name} {cycle} C {obj_name} {channel} {leg} '
+                    f'x x x {value} {old_value} channel')
+        return f'! {self.name} {cycle} C {obj_name} {var_name} {value} ' \
+               f'{old_value}'
+
+    def run(self, cycles):
+        """
+        Метод пересчёта циклов.
+        Возвращает строки изменений
+        """
+        lines = []
+        for _ in range(cycles):
+            for change in self.engine.run_cycle():
+                lines.append(self.log_line(*change))
+        return lines
+
+    def state_lines(self):
+        """
+        Метод получения состояния всех
+        объектов строками лог файла
+        """
+        lines = []
+        for obj_name in self.objects:
+            for var_name, value in self.engine.snapshot(obj_name).items():
+                lines.append(self.log_line(obj_name, var_name, value, value))
+        return lines
+
+    def object_lines(self, obj_name):
+        """
+        Метод получения переменных объекта
+        в виде ответа имитатора
+        """
+        lines = []
+        for var_name, value in self.engine.snapshot(obj_name).items():
+            if '(' in var_name:
+                # Для канала передаются входящее
+                # и исходящее значения
+                value = '{},{}'.format(
+                    *self.engine.get_value(obj_name, var_name))
+            lines.append(f'{obj_name}.{var_name} {value}')
+        return lines
+
+    def set_value(self, obj_name, var_name, value):
+        if obj_name not in self.engine:
+            raise KeyError(obj_name)
+        self.engine.set_value(obj_name, var_name, value)
+
+    def set_ipu(self, ipu, value):
+        if ipu not in self._ipu:
+            raise KeyError(ipu)
+        for obj_name, status in self._ipu[ipu]:
+            self.engine.set_value(obj_name, status, value)
+
+
+def split_assignment(text):
+    """
+    Функция разбора записи ОБЪЕКТ.ПЕРЕМЕННАЯ=ЗНАЧЕНИЕ
+    """
+    target, _, value = text.partition('=')
+    obj_name, _, var_name = target.partition('.')
+    if not var_name or not value:
+        raise ValueError('OBJECT.NAME=VALUE expected')
+    return obj_name, var_name, value
+
+
+class FakeSimulator:
+    """
+    Класс локального имитатора.
+    На вход принимает словарь ИДЕНТИФИКАТОР:СТАНЦИЯ
+    """
+
+    def __init__(self, stations, cycle_rate=CYCLE_RATE, realtime=False,
+                 latency=0, response_size=0):
+        self.stations = {str(x): y for x, y in stations.items()}
+        self.cycle_rate = cycle_rate
+        self.realtime = realtime
+        self.latency = latency
+        self.response_size = response_size
+        self._lock = asyncio.Lock()
+        self._server = None
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host='127.0.0.1', port=0):
+        """
+        Метод запуска имитатора
+        """
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server
+
+    async def handle(self, reader, writer):
+        """
+        Метод обработки подключения
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Команды всех подключений
+                # выполняются по одной
+                async with self._lock:
+                    response = await self.execute(
+                        line.decode('utf-8', 'replace').strip())
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(self.pad(response).encode('utf-8') + PROMPT)
+                await writer.drain()
+        except OSError as error:
+            logging.warning('fake simulator connection lost: %s', error)
+        finally:
+            writer.close()
+
+    def pad(self, response):
+        """
+        Метод увеличения ответа до response_size
+        строками заполнения
+        """
+        missing = self.response_size - len(response)
+        if missing <= 0:
+            return response
+        lines = -(-missing // (FILLER_WIDTH + 1))
+        return response + ('#' * FILLER_WIDTH + '\n') * lines
+
+    async def execute(self, command):
+        """
+        Метод выполнения команды.
+        Возвращает текст ответа без приглашения
+        """
+        if not command:
+            return ''
+        if command == 'go':
+            lines = []
+            for station in self.stations.values():
+                lines += station.run(1)
+            return ''.join(x + '\n' for x in lines)
+        site_id, _, command = command.partition('/')
+        station = self.stations.get(site_id)
+        if station is None:
+            return f'unknown site {site_id}\n'
+        name, _, args = command.partition(' ')
+        args = args.split()
+        try:
+            lines = await self.execute_station(station, name, args)
+        except (KeyError, ValueError, IndexError) as error:
+            return f'{command}: error {error}\n'
+        return ''.join(x + '\n' for x in lines)
+
+    async def execute_station(self, station, name, args):
+        """
+        Метод выполнения команды станции.
+        Возвращает строки ответа
+        """
+        if name == 'variables':
+            if args[0] == '*':
+                return station.state_lines()
+            return station.object_lines(args[0])
+        if name == 'go':
+            return station.run(1)
+        if name == 'break':
+            if args[0] == 'after':
+                return await self.run_cycles(station, int(args[1]))
+            if args[0] == 'seconds':
+                cycles = round(float(args[1]) * self.cycle_rate)
+                return await self.run_cycles(station, cycles)
+            if args[0] == 'steady':
+                return await self.run_cycles(station, STEADY_LIMIT, True)
+            raise ValueError('unknown break mode {}'.format(args[0]))
+        if name == 'check' or name == 'individ':
+            station.set_value(*split_assignment(args[0]))
+            return []
+        if name == 'yard':
+            if args[1] != 'try_set':
+                raise ValueError('try_set expected')
+            station.set_ipu(args[0], args[2])
+            return []
+        if name == 'cmd':
+            return []
+        raise ValueError('unknown command {}'.format(name))
+
+    async def run_cycles(self, station, cycles, steady=False):
+        """
+        Метод пересчёта циклов станции,
+        steady - до цикла без изменений
+        """
+        lines = []
+        for _ in range(cycles):
+            changes = station.run(1)
+            lines += changes
+            if steady and not changes:
+                break
+            if self.realtime:
+                await asyncio.sleep(1 / self.cycle_rate)
+        return lines
+
+
+async def serve(simulator, host, port):
+    server = await simulator.start(host, port)
+    logging.warning('fake simulator listening on %s:%s', host, simulator.port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Local stand-in for the simulator')
+    parser.add_argument('int_data', help='IntData file')
+    parser.add_argument('logic', help='logic file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--site-id', default='1')
+    parser.add_argument('--cycle-rate', type=float, default=CYCLE_RATE,
+                        help='cycles per second')
+    parser.add_argument('--realtime', action='store_true',
+                        help='pace cycles at the cycle rate')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='response delay, s')
+    parser.add_argument('--response-size', type=int, default=0,
+                        help='minimal response size, bytes')
+    args = parser.parse_args()
+    station = FakeStation.from_files(args.int_data, args.logic)
+    simulator = FakeSimulator({args.site_id: station}, args.cycle_rate,
+                              args.realtime, args.latency, args.response_size)
+    try:
+        asyncio.run(serve(simulator, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
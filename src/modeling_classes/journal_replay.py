@@ -0,0 +1,117 @@
+import time
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import pyqtSignal
+
+from modeling_classes.sim_journal import RECEIVED
+from modeling_classes.sim_journal import read_journal
+
+# Время передачи записей журнала за один шаг
+# воспроизведения без задержек, в секундах
+JOURNAL_TICK_BUDGET = 0.05
+
+
+class JournalReplay(QObject):
+    """
+    Класс воспроизведения журнала обмена с имитатором.
+    Полученные байты передаются в SimSocket тем же
+    путём, что и из подключения, с записанными
+    промежутками времени, ускоренными в speed раз,
+    или без задержек, если speed равна None
+    """
+    finished = pyqtSignal()
+
+    def __init__(self, sim_socket, file_path, speed=1.0):
+        super().__init__()
+        self.file_path = file_path
+        self._socket = sim_socket
+        self._speed = speed
+        # Первая запись читается сразу, по этому
+        # ошибки открытия журнала возникают
+        # при создании объекта
+        self._journal = read_journal(file_path)
+        self._next = self.read_next()
+        self._start = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.replay_tick)
+        # Количество переданных частей и
+        # байтов, время воспроизведения
+        self.chunks = 0
+        self.received = 0
+        self.elapsed = 0
+
+    @property
+    def active(self):
+        return self._start is not None
+
+    def start(self):
+        """
+        Метод запуска воспроизведения.
+        Неполный ответ, полученный ранее,
+        сбрасывается
+        """
+        self._socket.clear()
+        self._start = time.monotonic()
+        self._timer.start(0)
+
+    def stop(self):
+        """
+        Метод завершения воспроизведения
+        """
+        self._timer.stop()
+        if self._start is not None:
+            self.elapsed = time.monotonic() - self._start
+            self._start = None
+            self._journal.close()
+            self.finished.emit()
+
+    def read_next(self):
+        """
+        Метод чтения следующей записи
+        полученных байтов
+        """
+        for record in self._journal:
+            if record[1] == RECEIVED:
+                return record
+        return None
+
+    def due(self):
+        """
+        Метод получения времени передачи
+        следующей записи
+        """
+        return self._start + self._next[0] / self._speed
+
+    def replay_tick(self):
+        """
+        Метод передачи записей, время которых
+        наступило. Без задержек записи передаются
+        частями, чтобы окно не переставало отвечать
+        """
+        if self._speed is None:
+            deadline = time.monotonic() + JOURNAL_TICK_BUDGET
+            while self._next is not None and time.monotonic() < deadline:
+                self.receive_next()
+        else:
+            now = time.monotonic()
+            while self._next is not None and self.due() <= now:
+                self.receive_next()
+        if self._next is None:
+            self.stop()
+        elif self._speed is None:
+            self._timer.start(0)
+        else:
+            delay = self.due() - time.monotonic()
+            self._timer.start(max(0, int(delay * 1000)))
+
+    def receive_next(self):
+        """
+        Метод передачи следующей записи
+        """
+        data = self._next[2]
+        self._next = self.read_next()
+        self.chunks += 1
+        self.received += len(data)
+        self._socket.receive([data])
@@ -0,0 +1,207 @@
+# =========================================
+# ==_____________Logic_engine____________==
+# =========================================
+
+import logging
+
+from site_readers.equ_compiler import EquError
+from site_readers.equ_compiler import compile_type
+from site_readers.equ_compiler import to_int
+
+
+class ObjectState:
+    """
+    Класс состояния логического объекта:
+    значений переменных и каналов связи
+    """
+    __slots__ = ('name', 'program', 'values', 'channels_in', 'channels_out',
+                 'previous', 'previous_out')
+
+    def __init__(self, name, program):
+        self.name = name
+        self.program = program
+        self.values = list(program.init)
+        self.channels_in = list(program.channels_init)
+        self.channels_out = list(program.channels_init)
+        # Значения на конец предыдущего пересчёта
+        # для определения изменившихся переменных
+        self.previous = list(self.values)
+        self.previous_out = list(self.channels_out)
+
+
+class LogicEngine:
+    """
+    Класс локального пересчёта логики станции
+    без подключения к имитатору.
+    Уравнения каждого типа компилируются один раз,
+    за цикл объекты пересчитываются в порядке номеров
+    их типов, затем исходящие значения каналов
+    передаются соседним объектам и становятся
+    входящими в следующем цикле
+    """
+
+    def __init__(self, logic_data, logical_objects):
+        self._objects = {}
+        # Пары ФУНКЦИЯ_ТИПА:ОБЪЕКТЫ в порядке пересчёта
+        self._order = []
+        # Связи каналов: (исходящие значения объекта,
+        # индекс, входящие значения соседа, индекс)
+        self._links = []
+        self.cycle = 0
+
+        programs = self.compile_types(logic_data)
+        by_type = {x: [] for x in programs}
+        for name in logical_objects:
+            obj_data = logical_objects[name]
+            program = programs.get(obj_data["Type"])
+            if program is None:
+                continue
+            state = ObjectState(name, program)
+            # Индивидуализации берутся из данных проекта
+            for i_bit, value in obj_data["individualizations"].items():
+                if i_bit in program.slot_index:
+                    state.values[program.slot_index[i_bit]] = to_int(value)
+            state.previous = list(state.values)
+            self._objects[name] = state
+            by_type[obj_data["Type"]].append(state)
+
+        for obj_type, states in by_type.items():
+            if states:
+                objects = [(x.values, x.channels_in, x.channels_out)
+                           for x in states]
+                self._order.append((programs[obj_type].run, objects))
+        self.link_channels(logical_objects)
+
+    @staticmethod
+    def compile_types(logic_data):
+        """
+        Метод компиляции уравнений всех типов логики.
+        Типы с ошибками в уравнениях не пересчитываются.
+        Возвращает словарь ТИП:ПРОГРАММА в порядке
+        номеров типов
+        """
+        types = sorted(logic_data.get('OBJ', {}).values(),
+                       key=lambda x: to_int(x['obj_num']))
+        programs = {}
+        for obj_type in (x['Name'] for x in types):
+            if obj_type not in logic_data:
+                continue
+            try:
+                programs[obj_type] = compile_type(obj_type, logic_data)
+            except EquError as error:
+                logging.error('logic type not compiled: %s', error)
+        return programs
+
+    def link_channels(self, logical_objects):
+        """
+        Метод построения связей каналов
+        объектов через их выводы
+        """
+        for name, state in self._objects.items():
+            legs = logical_objects[name]["legs"]
+            for index, channel in enumerate(state.program.channels):
+                channel_name, leg = channel[:-1].split('(')
+                if leg not in legs:
+                    continue
+                neighbour = self._objects.get(legs[leg]["neighbour"])
+                if neighbour is None:
+                    continue
+                neighbour_channel = '{}({})'.format(
+                    channel_name, legs[leg]["neighbour_leg"])
+                in_index = neighbour.program.channel_index.get(
+                    neighbour_channel)
+                if in_index is None:
+                    continue
+                self._links.append((state.channels_out, index,
+                                    neighbour.channels_in, in_index))
+
+    def __contains__(self, name):
+        return name in self._objects
+
+    def get_value(self, obj_name, var_name):
+        """
+        Метод получения значения переменной объекта.
+        Для канала возвращается пара
+        входящего и исходящего значений
+        """
+        state = self._objects[obj_name]
+        program = state.program
+        if var_name in program.slot_index:
+            return state.values[program.slot_index[var_name]]
+        index = program.channel_index[var_name]
+        return state.channels_in[index], state.channels_out[index]
+
+    def set_value(self, obj_name, var_name, value):
+        """
+        Метод установки значения переменной объекта,
+        например статуса от напольного объекта.
+        Для канала устанавливается входящее значение
+        """
+        state = self._objects[obj_name]
+        program = state.program
+        if var_name in program.slot_index:
+            state.values[program.slot_index[var_name]] = to_int(value)
+        else:
+            index = program.channel_index[var_name]
+            state.channels_in[index] = to_int(value)
+
+    def snapshot(self, obj_name):
+        """
+        Метод получения всех значений объекта
+        в виде словаря ИМЯ:ЗНАЧЕНИЕ
+        """
+        state = self._objects[obj_name]
+        values = dict(zip(state.program.slots, state.values))
+        values.update(zip(state.program.channels, state.channels_out))
+        return values
+
+    def run_cycle(self, track=True):
+        """
+        Метод одного цикла пересчёта всех объектов.
+        Возвращает список изменений вида
+        (ОБЪЕКТ, ПЕРЕМЕННАЯ, ЗНАЧЕНИЕ, СТАРОЕ_ЗНАЧЕНИЕ),
+        если изменения не отслеживаются - пустой список
+        """
+        for run, objects in self._order:
+            run(objects)
+        # Исходящие значения каналов становятся
+        # входящими значениями соседних объектов
+        for channels_out, out_index, channels_in, in_index in self._links:
+            channels_in[in_index] = channels_out[out_index]
+        self.cycle += 1
+        if not track:
+            return []
+        return self.collect_changes()
+
+    def collect_changes(self):
+        """
+        Метод сбора значений объектов, изменившихся
+        с прошлого сбора изменений
+        """
+        changes = []
+        for state in self._objects.values():
+            # Списки сравниваются целиком, поэлементно
+            # только при наличии изменений
+            if state.values != state.previous:
+                for name, value, old_value in zip(state.program.slots,
+                                                  state.values,
+                                                  state.previous):
+                    if value != old_value:
+                        changes.append((state.name, name, value, old_value))
+                state.previous[:] = state.values
+            if state.channels_out != state.previous_out:
+                for name, value, old_value in zip(state.program.channels,
+                                                  state.channels_out,
+                                                  state.previous_out):
+                    if value != old_value:
+                        changes.append((state.name, name, value, old_value))
+                state.previous_out[:] = state.channels_out
+        return changes
+
+    def run(self, cycles):
+        """
+        Метод пересчёта заданного количества
+        циклов без отслеживания изменений
+        """
+        for _ in range(cycles):
+            self.run_cycle(track=False)
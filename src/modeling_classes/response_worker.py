@@ -0,0 +1,132 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import pyqtSignal
+
+from modeling_classes.sim_protocol import decode_response
+from site_readers.log_reader import log_data_parser
+from site_readers.log_reader import object_variable_parser
+
+# Время применения изменений и обновления
+# вкладки параметров за один шаг, чтобы окно
+# успевало отрисоваться, в секундах
+FRAME_BUDGET = 0.016
+
+
+def parse_sim_data(sim_data, product_name, obj_name):
+    """
+    Функция разбора ответа имитатора в изменения
+    объектов проекта вида ОБЪЕКТ:ПЕРЕМЕННАЯ.
+    Ответ в байтах или memoryview декодируется здесь
+    же, в потоке разбора. obj_name - объект,
+    переменные которого запрашивались
+    """
+    if not isinstance(sim_data, str):
+        sim_data = decode_response(sim_data)
+    lines = sim_data.split('\n')
+    if '!' in sim_data:
+        # Поток данных от всех объектов
+        # в формате лог файла
+        return log_data_parser(lines).get(product_name, {})
+    return object_variable_parser(lines, obj_name)
+
+
+class ResponseWorker(QObject):
+    """
+    Класс разбора ответов имитатора в отдельном потоке.
+    Разобранные пакеты изменений передаются в поток
+    окна сигналом и применяются функцией apply_function
+    вида ФУНКЦИЯ(ОБЪЕКТ, ИЗМЕНЕНИЯ), в конце шага
+    вызывается функция refresh_function. Шаг вместе
+    с ней занимает не дольше FRAME_BUDGET
+    """
+    # Сигнал из потока разбора, по этому
+    # обрабатывается в потоке окна
+    parsed = pyqtSignal(object)
+
+    def __init__(self, apply_function, refresh_function):
+        super().__init__()
+        self._apply = apply_function
+        self._refresh = refresh_function
+        self._requests = queue.SimpleQueue()
+        # Количество ответов, ещё не разобранных
+        self._parsing = 0
+        # Пары (ОБЪЕКТ, ИЗМЕНЕНИЯ) для применения
+        self._changes = deque()
+        # Длительность последнего вызова refresh_function
+        self._refresh_time = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.apply_tick)
+        self.parsed.connect(self.on_parsed)
+        # Поток не задерживает завершение программы
+        threading.Thread(target=self.run, daemon=True).start()
+
+    @property
+    def busy(self):
+        """
+        Признак наличия ответов, не
+        разобранных или не применённых
+        """
+        return bool(self._parsing or self._changes)
+
+    def parse(self, sim_data, product_name, obj_name):
+        """
+        Метод передачи ответа на разбор
+        """
+        self._parsing += 1
+        self._requests.put((sim_data, product_name, obj_name))
+
+    def run(self):
+        """
+        Цикл потока разбора ответов
+        """
+        while True:
+            request = self._requests.get()
+            try:
+                changes = parse_sim_data(*request)
+            except Exception:
+                # Ошибка разбора одного ответа не должна
+                # останавливать разбор остальных
+                logging.exception('simulator response not parsed')
+                changes = {}
+            self.parsed.emit(changes)
+
+    def on_parsed(self, changes):
+        """
+        Метод постановки разобранных
+        изменений в очередь применения
+        """
+        self._parsing -= 1
+        # Изменения всех объектов хранятся в одном
+        # словаре пакета без копирования
+        self._changes.extend((x, changes) for x in changes)
+        if not self._timer.isActive():
+            self._timer.start(0)
+
+    def apply_tick(self):
+        """
+        Метод применения изменений в пределах
+        FRAME_BUDGET, оставшиеся изменения
+        применяются следующим шагом
+        """
+        # Время обновления вкладки оценивается по
+        # предыдущему обновлению и вычитается из
+        # времени применения изменений. Хотя бы одно
+        # изменение применяется всегда
+        if not self._changes:
+            return
+        deadline = time.perf_counter() + FRAME_BUDGET - self._refresh_time
+        self._apply(*self._changes.popleft())
+        while self._changes and time.perf_counter() < deadline:
+            self._apply(*self._changes.popleft())
+        start = time.perf_counter()
+        self._refresh()
+        self._refresh_time = time.perf_counter() - start
+        if self._changes:
+            self._timer.start(0)
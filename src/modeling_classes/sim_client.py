@@ -0,0 +1,243 @@
+# =========================================
+# ==______________Sim_client______________==
+# =========================================
+"""
+Клиент имитатора на asyncio без PyQt, для скриптов
+и прогонов без графического интерфейса.
+
+Клиент использует те же команды, разбиение потока
+на ответы и очередь команд, что и SimSocket, по
+этому ответы сопоставляются командам так же, как в
+окне имитатора. Модуль не импортирует PyQt, запуск
+скрипта занимает время запуска интерпретатора, а
+несколько клиентов (станций или имитаторов) работают
+в одном цикле событий.
+
+Пример:
+    async def main():
+        async with SimClient(1) as client:
+            await client.connect('127.0.0.1', 5000)
+            await client.break_after(10)
+            print(await client.get_variables('S12'))
+
+    asyncio.run(main())
+"""
+
+import asyncio
+import logging
+
+from modeling_classes.sim_protocol import PRIORITY_USER
+from modeling_classes.sim_protocol import CommandPipeline
+from modeling_classes.sim_protocol import ResponseFramer
+from modeling_classes.sim_protocol import break_command
+from modeling_classes.sim_protocol import check_command
+from modeling_classes.sim_protocol import cmd_command
+from modeling_classes.sim_protocol import decode_response
+from modeling_classes.sim_protocol import go_command
+from modeling_classes.sim_protocol import individ_command
+from modeling_classes.sim_protocol import variables_command
+from modeling_classes.sim_protocol import yard_command
+from site_readers.log_reader import object_variable_parser
+
+READ_SIZE = 64 * 2 ** 10
+
+
+class SimClient:
+    """
+    Класс подключения к имитатору для станции
+    site_id. Функция unsolicited вида ФУНКЦИЯ(ОТВЕТ)
+    получает ответы, не относящиеся к командам
+    """
+
+    def __init__(self, site_id=1, depth=1, unsolicited=None):
+        self.site_id = site_id
+        self._pipeline = CommandPipeline(depth)
+        self._framer = ResponseFramer()
+        self._unsolicited = unsolicited
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @property
+    def connected(self):
+        return self._writer is not None
+
+    async def connect(self, host, port, timeout=None):
+        """
+        Метод подключения к имитатору
+        """
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(host, int(port)), timeout)
+        self._read_task = asyncio.get_running_loop().create_task(
+            self.read_responses())
+
+    async def close(self):
+        """
+        Метод отключения от имитатора,
+        команды без ответа завершаются ошибкой
+        """
+        # Задача приёма при завершении отключает
+        # клиента, по этому подключение запоминается
+        # для ожидания его закрытия
+        writer = self._writer
+        if self._read_task is not None:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except asyncio.CancelledError:
+                pass
+            self._read_task = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        self._writer = self._reader = None
+        self.clear()
+
+    def clear(self):
+        """
+        Метод очистки входящей информации
+        и очереди команд
+        """
+        self._framer.clear()
+        self._pipeline.clear()
+
+    async def read_responses(self):
+        """
+        Задача приёма ответов имитатора
+        """
+        try:
+            while True:
+                data = await self._reader.read(READ_SIZE)
+                if not data:
+                    break
+                for response in self._framer.feed(data):
+                    # Ответ сопоставляется самой ранней
+                    # команде, ожидающей ответа
+                    text = decode_response(response)
+                    if self._pipeline.on_response(text) is None and \
+                            self._unsolicited:
+                        self._unsolicited(text)
+                self.write_ready()
+        except OSError as error:
+            logging.error('simulator connection failed: %s', error)
+        finally:
+            # Имитатор закрыл подключение, или задача
+            # отменена: ответов на команды уже не будет,
+            # новые команды завершаются ConnectionError
+            writer, self._writer = self._writer, None
+            self._reader = None
+            self._pipeline.clear()
+            if writer is not None:
+                writer.close()
+
+    def write_ready(self):
+        """
+        Метод отправки команд из очереди
+        """
+        if self._writer is None:
+            return
+        loop = asyncio.get_running_loop()
+        for request in self._pipeline.take_ready():
+            self._writer.write(request.command.encode(encoding='utf-8',
+                                                      errors='strict'))
+            # Время ожидания отсчитывается от отправки
+            if request.timeout is not None:
+                loop.call_later(request.timeout, self.check_timeouts)
+
+    def check_timeouts(self):
+        """
+        Метод завершения команд с истёкшим
+        временем ожидания ответа
+        """
+        self._pipeline.expire()
+        self.write_ready()
+
+    async def request(self, command, priority=PRIORITY_USER, timeout=None):
+        """
+        Метод отправки команды и ожидания ответа.
+        Без ответа за timeout секунд вызывается
+        TimeoutError, при отключении - ConnectionError
+        """
+        writer = self._writer
+        if writer is None:
+            raise ConnectionError(command)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(request):
+            if future.done():
+                return
+            if request.error is not None:
+                future.set_exception(request.error)
+            else:
+                future.set_result(request.response)
+
+        request = self._pipeline.submit(command, priority, timeout)
+        request.add_done_callback(resolve)
+        self.write_ready()
+        await writer.drain()
+        return await future
+
+    async def variables(self, obj_name='*', **kwargs):
+        """
+        Метод запроса переменных объекта,
+        '*' - всех объектов станции
+        """
+        return await self.request(variables_command(self.site_id, obj_name),
+                                  **kwargs)
+
+    async def get_variables(self, obj_name, **kwargs):
+        """
+        Метод получения переменных объекта
+        в виде словаря, как в окне имитатора
+        """
+        response = await self.variables(obj_name, **kwargs)
+        return object_variable_parser(response.split('\n'), obj_name)
+
+    async def go(self, **kwargs):
+        return await self.request(go_command(self.site_id), **kwargs)
+
+    async def go_all(self, **kwargs):
+        """
+        Метод пересчётов всех данных,
+        загруженных в имитатор
+        """
+        return await self.request(go_command(), **kwargs)
+
+    async def break_seconds(self, seconds, **kwargs):
+        return await self.request(
+            break_command(self.site_id, 'seconds', seconds), **kwargs)
+
+    async def break_after(self, cycles, **kwargs):
+        return await self.request(
+            break_command(self.site_id, 'after', cycles), **kwargs)
+
+    async def break_steady(self, **kwargs):
+        return await self.request(break_command(self.site_id, 'steady'),
+                                  **kwargs)
+
+    async def cmd(self, comm_type, comm_param, **kwargs):
+        return await self.request(
+            cmd_command(self.site_id, comm_type, comm_param), **kwargs)
+
+    async def check(self, obj_name, status_name, value, **kwargs):
+        return await self.request(
+            check_command(self.site_id, obj_name, status_name, value),
+            **kwargs)
+
+    async def yard_try_set(self, ipu, value, **kwargs):
+        return await self.request(yard_command(self.site_id, ipu, value),
+                                  **kwargs)
+
+    async def individ(self, obj_name, i_bit, value, **kwargs):
+        return await self.request(
+            individ_command(self.site_id, obj_name, i_bit, value), **kwargs)
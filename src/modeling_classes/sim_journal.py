@@ -0,0 +1,82 @@
+# =========================================
+# ==______________Sim_journal______________==
+# =========================================
+"""
+Журнал обмена с имитатором для воспроизведения
+сеансов без имитатора.
+
+Журнал - двоичный файл: заголовок JOURNAL_MAGIC и
+записи из заголовка RECORD (время от начала записи
+по часам time.monotonic в секундах, вид записи,
+длина данных) и данных. Вид записи SENT - байты
+отправленной команды, RECEIVED - байты, полученные
+одним чтением из подключения, по этому при
+воспроизведении ответы делятся на части так же,
+как в записанном сеансе. Неполная последняя запись
+(например, при аварийном завершении программы)
+пропускается.
+"""
+
+import logging
+import struct
+import time
+
+JOURNAL_MAGIC = b'SIMJ\x01'
+RECORD = struct.Struct('<dBI')
+SENT = 0
+RECEIVED = 1
+
+
+class JournalWriter:
+    """
+    Класс записи журнала обмена с имитатором
+    """
+
+    def __init__(self, file_path, clock=time.monotonic):
+        self.file_path = file_path
+        self._clock = clock
+        self._file = open(file_path, 'wb')
+        self._file.write(JOURNAL_MAGIC)
+        self._start = clock()
+
+    def write(self, kind, data):
+        """
+        Метод добавления записи
+        """
+        self._file.write(RECORD.pack(self._clock() - self._start, kind,
+                                     len(data)))
+        self._file.write(data)
+
+    def flush(self):
+        """
+        Метод записи буферизованных записей на диск,
+        чтобы журнал сохранился при аварийном
+        завершении программы
+        """
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_journal(file_path):
+    """
+    Функция генератор записей журнала
+    вида (ВРЕМЯ, ВИД, ДАННЫЕ)
+    """
+    with open(file_path, 'rb') as journal:
+        if journal.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+            raise ValueError('{} is not a simulator journal'.format(
+                file_path))
+        while True:
+            header = journal.read(RECORD.size)
+            if not header:
+                return
+            if len(header) == RECORD.size:
+                timestamp, kind, size = RECORD.unpack(header)
+                data = journal.read(size)
+                if len(data) == size:
+                    yield timestamp, kind, data
+                    continue
+            logging.warning('journal %s is truncated', file_path)
+            return
@@ -0,0 +1,343 @@
+# =========================================
+# ==_____________Sim_protocol_____________==
+# =========================================
+"""
+Разбиение потока данных от имитатора на ответы.
+
+Имитатор завершает каждый ответ приглашением
+PROMPT. Входящие байты накапливаются в bytearray,
+приглашение ищется только в новых байтах (с
+захватом его длины из предыдущих), по этому время
+приёма ответа линейно зависит от его размера.
+Готовые ответы отдаются срезами memoryview без
+копирования: буфер с ними отсоединяется, а в новый
+буфер переносится только начало следующего ответа.
+Приглашение состоит из символов ASCII, по этому
+граница ответа не может разделить символ UTF-8 и
+ответ декодируется целиком.
+
+Имитатор отвечает на команды по порядку, по этому
+ответ относится к самой ранней отправленной команде
+без ответа. CommandPipeline хранит очереди команд по
+приоритетам и отправленные команды, сопоставляя им
+ответы, и ограничивает время ожидания ответа.
+"""
+
+import logging
+import time
+from collections import deque
+
+PROMPT = b'* > '
+# Приоритеты команд: действия пользователя
+# обгоняют фоновые обновления переменных
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 1
+PRIORITIES = (PRIORITY_USER, PRIORITY_BACKGROUND)
+# Режимы команды break
+BREAK_MODES = ('seconds', 'after', 'steady')
+
+
+class ResponseFramer:
+    """
+    Класс выделения ответов имитатора
+    из потока входящих байтов
+    """
+
+    def __init__(self, prompt=PROMPT):
+        self._prompt = prompt
+        self._buffer = bytearray()
+        # Позиция, с которой ищется приглашение
+        self._scan_from = 0
+
+    @property
+    def pending(self):
+        """
+        Количество байтов неполного ответа
+        """
+        return len(self._buffer)
+
+    def clear(self):
+        """
+        Метод сброса неполного ответа
+        """
+        self._buffer = bytearray()
+        self._scan_from = 0
+
+    def feed(self, data):
+        """
+        Метод добавления входящих байтов.
+        Возвращает список полных ответов вместе с
+        приглашением в виде memoryview
+        """
+        buffer = self._buffer
+        buffer += data
+        position = buffer.find(self._prompt, self._scan_from)
+        if position == -1:
+            # Приглашение может начинаться в конце
+            # полученных байтов
+            self._scan_from = max(0, len(buffer) - len(self._prompt) + 1)
+            return []
+        bounds = []
+        start = 0
+        while position != -1:
+            end = position + len(self._prompt)
+            bounds.append((start, end))
+            start = end
+            position = buffer.find(self._prompt, start)
+        # Неполный ответ переносится в новый буфер,
+        # старый буфер остаётся за срезами ответов
+        self._buffer = bytearray(buffer[start:])
+        self._scan_from = max(0, len(self._buffer) - len(self._prompt) + 1)
+        view = memoryview(buffer)
+        return [view[x:y] for x, y in bounds]
+
+
+def decode_response(response):
+    """
+    Функция декодирования ответа имитатора
+    """
+    return str(response, 'utf-8', 'replace')
+
+
+def variables_command(site_id, obj_name='*'):
+    """
+    Команда запроса переменных объекта,
+    '*' - всех объектов
+    """
+    return f'{site_id}/variables {obj_name}\n'
+
+
+def go_command(site_id=None):
+    """
+    Команда запуска пересчётов, без идентификатора -
+    всех данных, загруженных в имитатор
+    """
+    if site_id is None:
+        return 'go\n'
+    return f'{site_id}/go\n'
+
+
+def break_command(site_id, mode, value=None):
+    """
+    Команда пересчётов до остановки: через
+    заданное количество секунд (seconds), циклов
+    (after) или до устойчивого состояния (steady)
+    """
+    if mode not in BREAK_MODES:
+        raise ValueError('unknown break mode {!r}'.format(mode))
+    if value is None:
+        return f'{site_id}/break {mode}\n'
+    return f'{site_id}/break {mode} {value}\n'
+
+
+def cmd_command(site_id, comm_type, comm_param):
+    """
+    Команда управления объектом
+    """
+    return f'{site_id}/cmd {comm_type} {comm_param}\n'
+
+
+def check_command(site_id, obj_name, status_name, value):
+    """
+    Команда установки статуса объекта
+    """
+    return f'{site_id}/check {obj_name}.{status_name}={value}\n'
+
+
+def yard_command(site_id, ipu, value):
+    """
+    Команда установки состояния напольного объекта
+    """
+    return f'{site_id}/yard {ipu} try_set {value}\n'
+
+
+def individ_command(site_id, obj_name, i_bit, value):
+    """
+    Команда установки индивидуализации объекта
+    """
+    return f'{site_id}/individ {obj_name}.{i_bit}={value}\n'
+
+
+class SimRequest:
+    """
+    Класс команды имитатору, ожидающей ответа.
+    Функция обработчик получает команду, а результат
+    или ошибку можно получить после её завершения
+    """
+    __slots__ = ('command', 'priority', 'timeout', 'deadline', 'response',
+                 'error', 'done', '_callbacks')
+
+    def __init__(self, command, priority=PRIORITY_USER, timeout=None):
+        self.command = command
+        self.priority = priority
+        # Время ожидания ответа после отправки
+        self.timeout = timeout
+        # Момент по часам time.monotonic, после
+        # которого ответ уже не ожидается.
+        # Задаётся при отправке команды
+        self.deadline = None
+        self.response = None
+        self.error = None
+        self.done = False
+        self._callbacks = []
+
+    def __repr__(self):
+        return 'SimRequest({!r}, done={})'.format(self.command, self.done)
+
+    def add_done_callback(self, callback):
+        """
+        Метод добавления функции обработчика,
+        для завершённой команды она вызывается сразу
+        """
+        if self.done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def set_result(self, response):
+        self.response = response
+        self.finish()
+
+    def set_error(self, error):
+        self.error = error
+        self.finish()
+
+    def finish(self):
+        """
+        Метод завершения команды
+        с вызовом функций обработчиков
+        """
+        self.done = True
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                # Ошибка обработчика не должна
+                # прерывать приём остальных ответов
+                logging.exception('response handler of %r failed', self)
+
+    def result(self):
+        """
+        Метод получения ответа завершённой
+        команды или вызова её ошибки
+        """
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class CommandPipeline:
+    """
+    Класс очереди команд имитатору.
+    Одновременно отправлено не более depth команд,
+    остальные ждут в очередях своих приоритетов
+    """
+
+    def __init__(self, depth=1, clock=time.monotonic):
+        self.depth = depth
+        self._clock = clock
+        self._queues = {x: deque() for x in PRIORITIES}
+        # Отправленные команды в порядке отправки.
+        # Команда с истёкшим временем ожидания остаётся
+        # в очереди до ответа, чтобы её ответ не был
+        # сопоставлен следующей команде
+        self._in_flight = deque()
+        # Количество таких команд: они не занимают
+        # места отправленных, а их ответы пропускаются
+        self._expired = 0
+
+    def __len__(self):
+        return sum(len(x) for x in self._queues.values())
+
+    @property
+    def in_flight(self):
+        """
+        Количество команд, ожидающих ответа
+        """
+        return len(self._in_flight) - self._expired
+
+    def submit(self, command, priority=PRIORITY_USER, timeout=None):
+        """
+        Метод добавления команды в очередь.
+        Время ожидания отсчитывается от отправки,
+        по этому команда, ожидающая в очереди
+        за большими ответами, не устаревает
+        """
+        request = SimRequest(command, priority, timeout)
+        self._queues[priority].append(request)
+        return request
+
+    def take_ready(self):
+        """
+        Метод получения команд, которые можно
+        отправить. Команды переносятся в отправленные
+        """
+        ready = []
+        self.expire()
+        while self.in_flight < self.depth:
+            queue = next((x for x in self._queues.values() if x), None)
+            if queue is None:
+                break
+            request = queue.popleft()
+            if request.timeout is not None:
+                request.deadline = self._clock() + request.timeout
+            self._in_flight.append(request)
+            ready.append(request)
+        return ready
+
+    def on_response(self, response):
+        """
+        Метод сопоставления ответа самой ранней
+        отправленной команде. Возвращает команду,
+        для ответа без команды возвращает None.
+        Поздний ответ на команду с истёкшим временем
+        ожидания пропускается, команда возвращается
+        завершённой ошибкой
+        """
+        if not self._in_flight:
+            return None
+        request = self._in_flight.popleft()
+        if request.done:
+            self._expired -= 1
+            return request
+        request.set_result(response)
+        return request
+
+    def expire(self):
+        """
+        Метод завершения ошибкой TimeoutError отправленных
+        команд с истёкшим временем ожидания
+        """
+        now = self._clock()
+        expired = [x for x in self._in_flight if not x.done
+                   and x.deadline is not None and x.deadline <= now]
+        # Место истёкшей команды освобождается сразу,
+        # иначе без ответа на неё следующие команды
+        # не будут отправлены
+        self._expired += len(expired)
+        # Обработчики вызываются после изменения очередей,
+        # так как могут добавлять новые команды
+        for request in expired:
+            request.set_error(TimeoutError(request.command))
+
+    def has_deadlines(self):
+        """
+        Метод проверки наличия команд,
+        ожидающих ответа ограниченное время
+        """
+        return any(x.timeout is not None and not x.done
+                   for queue in (*self._queues.values(), self._in_flight)
+                   for x in queue)
+
+    def clear(self):
+        """
+        Метод отмены всех команд
+        """
+        requests = [x for queue in (*self._queues.values(), self._in_flight)
+                    for x in queue if not x.done]
+        for queue in (*self._queues.values(), self._in_flight):
+            queue.clear()
+        self._expired = 0
+        for request in requests:
+            request.set_error(ConnectionError(request.command))
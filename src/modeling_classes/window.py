@@ -1,14 +1,34 @@
+import logging
+import threading
+import time
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import Qt
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QAction
+from PyQt5.QtWidgets import QFileDialog
 from PyQt5.QtWidgets import QGridLayout
+from PyQt5.QtWidgets import QInputDialog
 from PyQt5.QtWidgets import QLabel
 from PyQt5.QtWidgets import QLineEdit
 from PyQt5.QtWidgets import QMainWindow
+from PyQt5.QtWidgets import QProgressDialog
 from PyQt5.QtWidgets import QPushButton
 from PyQt5.QtWidgets import QSizePolicy
 from PyQt5.QtWidgets import QSpacerItem
 from PyQt5.QtWidgets import QSpinBox
 from PyQt5.QtWidgets import QTabWidget
 from modeling_classes.connection import SimSocket
+from modeling_classes.journal_replay import JournalReplay
+from modeling_classes.sim_protocol import PRIORITY_BACKGROUND
+from modeling_classes.sim_protocol import PRIORITY_USER
+from modeling_classes.sim_protocol import break_command
+from modeling_classes.sim_protocol import go_command
+from modeling_classes.sim_protocol import variables_command
+from site_classes.query_dialog import QueryDialog
+from site_readers.log_parallel import parallel_log_parser
+from site_readers.log_query import ChangeIndex
+from site_readers.log_replay import LogReplay
 
 # @formatter:off
 SIM_ACTIONS = (
@@ -24,8 +44,23 @@ SIM_ACTIONS = (
     "RF",
     "NR",
     "FF",
+    "FS",
+    "FE",
+    "FG",
+    "FL",
+    "FQ",
+    "JC",
+    "JR",
 )
 # @formatter:on
+# Время обработки пакетов лог файла за один
+# шаг воспроизведения до конца, в секундах
+REPLAY_TICK_BUDGET = 0.05
+# Время ожидания ответа на фоновые запросы
+# переменных объекта от отправки команды, в
+# секундах. Без ответа команда не задерживает
+# следующие
+BACKGROUND_TIMEOUT = 5
 
 
 class SimTab(QTabWidget):
@@ -42,6 +77,7 @@ class SimTab(QTabWidget):
         grid.addWidget(QLabel("ADDRESS:"), 0, 0, 1, 1)
         grid.addWidget(QLabel("PORT:"), 1, 0, 1, 1)
         grid.addWidget(QLabel("ILS ID:"), 2, 0, 1, 1)
+        grid.addWidget(QLabel("REPLAY:"), 3, 0, 1, 1)
 
         # Добавляем поля ввода данных для подключения
         # и кнопку подключения
@@ -56,10 +92,19 @@ class SimTab(QTabWidget):
         self.spin_id.setMinimum(1)
         self.spin_id.setMaximum(8)
 
+        # Добавляем выбор скорости воспроизведения
+        # лог файла в циклах в секунду
+        self.spin_replay = QSpinBox()
+        self.spin_replay.setMinimum(1)
+        self.spin_replay.setMaximum(1000)
+        self.spin_replay.setValue(10)
+        self.spin_replay.setSuffix(" cycles/s")
+
         # Добавляем поля и кнопку на слой
         grid.addWidget(self._addr, 0, 1, 1, 1)
         grid.addWidget(self._port, 1, 1, 1, 1)
         grid.addWidget(self.spin_id, 2, 1, 1, 1)
+        grid.addWidget(self.spin_replay, 3, 1, 1, 1)
         grid.addWidget(self.connect_button, 4, 0, 1, 2)
 
         # Для более удобного вида
@@ -91,12 +136,31 @@ class SimTab(QTabWidget):
         """
         return self.spin_id.value()
 
+    @property
+    def replay_interval(self):
+        """
+        Метод получения интервала между циклами
+        воспроизведения лог файла в миллисекундах
+        """
+        return 1000 // self.spin_replay.value()
+
 
 class SimWindow(QMainWindow):
     """
     Класс добавляющий визуальные объекты
     взаимодействия с симулятором
     """
+    # Сигналы потока построения индекса циклов
+    # лог файла: ход построения в тысячных долях
+    # и завершение вида (ВОСПРОИЗВЕДЕНИЕ, ЦИКЛ, ОШИБКА)
+    index_progress = pyqtSignal(int)
+    index_built = pyqtSignal(object, object, object)
+    # Сигнал потока чтения состояния лог файла
+    # вида (ЛОГ_ФАЙЛ, ДАННЫЕ, ОШИБКА)
+    log_state_loaded = pyqtSignal(object, object, object)
+    # Сигнал потока построения индекса изменений
+    # вида (ЛОГ_ФАЙЛ, ИНДЕКС, ОШИБКА)
+    query_index_built = pyqtSignal(object, object, object)
 
     def __init__(self):
         super().__init__()
@@ -115,6 +179,34 @@ class SimWindow(QMainWindow):
         # Создаём объект соединения
         self._socket = SimSocket(self.simulation.connect_button)
 
+        # Воспроизведение лог файла: текущий файл,
+        # таймер циклов и функция применения пакета
+        # изменений вида ФУНКЦИЯ(ПАКЕТ, ОБНОВИТЬ_ВКЛАДКУ)
+        # и функция сброса значений перед переходом
+        self._replay = None
+        self._replay_to_end = False
+        self._replay_function = None
+        self._reset_function = None
+        # Окно хода построения индекса циклов
+        # или чтения состояния лог файла
+        self._progress = None
+        self.index_progress.connect(self.set_index_progress)
+        self.index_built.connect(self.on_index_built)
+        self.log_state_loaded.connect(self.on_log_state_loaded)
+        self._replay_timer = QTimer(self)
+        self._replay_timer.timeout.connect(self.replay_tick)
+        self.simulation.spin_replay.valueChanged.connect(
+            self.set_replay_speed)
+        # Окно поиска циклов по условию и индекс
+        # изменений лог файла вида (ЛОГ_ФАЙЛ, ИНДЕКС)
+        self._query_dialog = QueryDialog(self.jump_to_cycle)
+        self._query_index = None
+        # Лог файл, индекс изменений которого строится
+        self._query_building = None
+        self.query_index_built.connect(self.on_query_index_built)
+        # Воспроизведение журнала обмена с имитатором
+        self._journal_replay = None
+
         # Создаём действия для имитатора
         # и добавляем на панель быстрого доступа
         for name in SIM_ACTIONS:
@@ -137,6 +229,7 @@ class SimWindow(QMainWindow):
         # Получаем имя объекта вызвавшего функцию
         action_name = self.sender().text()
         string_to_sent = None
+        priority = PRIORITY_USER
         # Убираем лишние символы,
         # получая циклы/секунды
         # для имитации
@@ -146,32 +239,413 @@ class SimWindow(QMainWindow):
         # отправляем соответствующее воздействие
         # с идентификатором
         if action_name.startswith("GOS"):
-            string_to_sent = f"{self._site_id}/break seconds {time_to_sent}\n"
+            string_to_sent = break_command(self._site_id, "seconds",
+                                           time_to_sent)
         elif action_name.startswith("GOC"):
-            string_to_sent = f"{self._site_id}/break after {time_to_sent}\n"
+            string_to_sent = break_command(self._site_id, "after",
+                                           time_to_sent)
         elif action_name == "GOALL":
             # Если необходимы пересчёты всех
             # данных загруженных в имитатор
             # отправляем команду без идентификатора
-            string_to_sent = "go\n"
+            string_to_sent = go_command()
         elif action_name == "GO":
-            string_to_sent = f"{self._site_id}/go\n"
+            string_to_sent = go_command(self._site_id)
         elif action_name == "BS":
-            string_to_sent = f"{self._site_id}/break steady\n"
+            string_to_sent = break_command(self._site_id, "steady")
         elif action_name == "RF":
-            # Обновляем данные о всех объектах принудительно
-            string_to_sent = f"{self._site_id}/variables *\n"
+            # Обновляем данные о всех объектах принудительно.
+            # Ответ растёт с размером станции, по этому
+            # время его ожидания не ограничивается
+            string_to_sent = variables_command(self._site_id)
+            priority = PRIORITY_BACKGROUND
         elif action_name == "FF":
-            # TODO: Добавить загрузку данных из лог файла
-            pass
+            # Запускаем воспроизведение лог файла
+            # или ставим его на паузу
+            self.start_replay()
+        elif action_name == "FS":
+            self.step_replay()
+        elif action_name == "FE":
+            self.replay_to_end()
+        elif action_name == "FG":
+            self.seek_replay()
+        elif action_name == "FL":
+            self.load_log_state()
+        elif action_name == "FQ":
+            self.show_query_dialog()
+        elif action_name == "JC":
+            # Запускаем запись обмена с имитатором
+            # в журнал или завершаем её
+            self.toggle_capture()
+        elif action_name == "JR":
+            self.replay_journal()
         elif action_name == "NR":
             # TODO: Добавить воздействия для нормализации объектов
             pass
         if string_to_sent:
             # Обрабатываем получившееся воздействие
-            self.send_to_sim(string_to_sent)
+            self.send_to_sim(string_to_sent, priority)
+
+    def set_replay_function(self, replay_function, reset_function=None):
+        """
+        Метод установки функции применения
+        пакета изменений из лог файла и функции
+        сброса значений переменных к значениям
+        проекта перед переходом к циклу
+        """
+        self._replay_function = replay_function
+        self._reset_function = reset_function
+
+    def set_replay_speed(self):
+        """
+        Метод изменения скорости воспроизведения
+        """
+        if not self._replay_to_end:
+            self._replay_timer.setInterval(self.simulation.replay_interval)
+
+    def open_replay(self):
+        """
+        Метод выбора лог файла для воспроизведения.
+        Возвращает признак открытия файла
+        """
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open log file")
+        if not file_path:
+            return False
+        try:
+            self._replay = LogReplay(file_path)
+        except (OSError, ImportError) as error:
+            # Например, для сжатого файла может
+            # не быть модуля распаковки
+            logging.warning('log file %s not opened: %s', file_path, error)
+            return False
+        return True
+
+    def start_replay(self):
+        """
+        Метод запуска воспроизведения лог файла
+        с выбранной скоростью. Повторный вызов
+        ставит воспроизведение на паузу
+        """
+        if self._replay_timer.isActive():
+            self._replay_timer.stop()
+            return
+        if self._replay is None and not self.open_replay():
+            return
+        self._replay_to_end = False
+        self._replay_timer.start(self.simulation.replay_interval)
+
+    def step_replay(self):
+        """
+        Метод воспроизведения одного цикла
+        лог файла, воспроизведение по таймеру
+        при этом останавливается
+        """
+        self._replay_timer.stop()
+        if self._replay is None and not self.open_replay():
+            return
+        self.apply_replay(self._replay.step(), True)
+        if self._replay.finished:
+            self.stop_replay()
+
+    def replay_to_end(self):
+        """
+        Метод воспроизведения всех оставшихся
+        циклов лог файла без задержек
+        """
+        if self._replay is None and not self.open_replay():
+            return
+        self._replay_to_end = True
+        # Пакеты обрабатываются частями по таймеру,
+        # чтобы окно не переставало отвечать
+        self._replay_timer.start(0)
+
+    def seek_replay(self, cycle=None):
+        """
+        Метод перехода к заданному циклу лог файла,
+        без заданного цикла он запрашивается.
+        При первом переходе индекс циклов строится в
+        отдельном потоке, переход выполняется после
+        его построения
+        """
+        self._replay_timer.stop()
+        self._replay_to_end = False
+        if self._progress is not None:
+            # Индекс уже строится
+            return
+        if self._replay is None and not self.open_replay():
+            return
+        if cycle is None:
+            cycle, ok = QInputDialog.getText(self, "Go to cycle", "Cycle:")
+            if not ok or not cycle.strip():
+                return
+        cycle = cycle.strip()
+        if not self._replay.indexed:
+            self.build_replay_index(cycle)
+            return
+        try:
+            state = self._replay.seek(cycle)
+        except KeyError:
+            logging.warning('cycle %s not found in %s', cycle,
+                            self._replay.file_path)
+            return
+        # Переменные, изменившиеся только после
+        # цикла, в состоянии отсутствуют, по этому
+        # перед применением значения сбрасываются
+        if self._reset_function:
+            self._reset_function()
+        self.apply_replay(state, True)
+
+    def build_replay_index(self, cycle):
+        """
+        Метод построения индекса циклов лог файла
+        в отдельном потоке с отображением хода
+        построения
+        """
+        replay = self._replay
+        self.show_progress("Indexing {}".format(replay.file_path), 1000)
+        # Последнее переданное значение, чтобы
+        # не передавать одинаковые сигналы
+        last_value = [-1]
+
+        def progress(offset, size):
+            value = min(1000, offset * 1000 // size) if size else 0
+            if value != last_value[0]:
+                last_value[0] = value
+                self.index_progress.emit(value)
+
+        def run():
+            error = None
+            try:
+                replay.build_index(progress)
+            except (OSError, ImportError, ValueError) as build_error:
+                error = build_error
+            self.index_built.emit(replay, cycle, error)
+
+        # Поток не задерживает завершение программы
+        threading.Thread(target=run, daemon=True).start()
+
+    def show_progress(self, text, maximum):
+        """
+        Метод отображения окна хода работы потока,
+        при нулевом maximum ход не отображается
+        """
+        self._progress = QProgressDialog(text, None, 0, maximum, self)
+        self._progress.setWindowModality(Qt.WindowModal)
+        self._progress.setMinimumDuration(0)
+
+    def set_index_progress(self, value):
+        """
+        Метод отображения хода построения индекса
+        """
+        if self._progress is not None:
+            self._progress.setValue(value)
+
+    def on_index_built(self, replay, cycle, error):
+        """
+        Метод перехода к циклу после построения
+        индекса. Если за время построения файл
+        воспроизведения сменился, переход отменяется
+        """
+        self._progress.close()
+        self._progress = None
+        if error is not None:
+            logging.warning('log file %s not indexed: %s', replay.file_path,
+                            error)
+            return
+        if replay is self._replay:
+            self.seek_replay(cycle)
+
+    def load_log_state(self):
+        """
+        Метод применения состояния переменных на
+        конец выбранного лог файла. Файл разбирается
+        частями в нескольких процессах
+        """
+        if self._progress is not None:
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open log file")
+        if not file_path:
+            return
+        self.show_progress("Reading {}".format(file_path), 0)
+
+        def run():
+            log_data, error = None, None
+            try:
+                log_data = parallel_log_parser(file_path)
+            except (OSError, ImportError) as read_error:
+                error = read_error
+            self.log_state_loaded.emit(file_path, log_data, error)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def on_log_state_loaded(self, file_path, log_data, error):
+        """
+        Метод применения прочитанного
+        состояния лог файла
+        """
+        self._progress.close()
+        self._progress = None
+        if error is not None:
+            logging.warning('log file %s not read: %s', file_path, error)
+            return
+        # Состояние полное, как при переходе к циклу
+        if self._reset_function:
+            self._reset_function()
+        self.apply_replay(log_data, True)
+
+    def show_query_dialog(self):
+        """
+        Метод отображения окна поиска циклов
+        воспроизводимого лог файла по условию
+        """
+        if self._replay is None and not self.open_replay():
+            return
+        file_path = self._replay.file_path
+        self._query_dialog.show()
+        # Индекс изменений строится один раз для файла
+        # в отдельном потоке, поиск доступен после
+        # его построения
+        if self._query_index is not None and \
+                self._query_index[0] == file_path:
+            self._query_dialog.set_index(*self._query_index)
+            return
+        self._query_dialog.set_building(file_path)
+        if self._query_building == file_path:
+            return
+        self._query_building = file_path
+
+        def run():
+            index, error = None, None
+            try:
+                index = ChangeIndex.from_file(file_path)
+            except (OSError, ImportError) as build_error:
+                error = build_error
+            self.query_index_built.emit(file_path, index, error)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def on_query_index_built(self, file_path, index, error):
+        """
+        Метод передачи построенного индекса
+        изменений в окно поиска
+        """
+        if self._query_building == file_path:
+            self._query_building = None
+        # Пока индекс строился, окно могло быть
+        # открыто для другого файла
+        current = self._query_dialog.file_path == file_path
+        if error is not None:
+            logging.warning('log file %s not indexed: %s', file_path, error)
+            if current:
+                self._query_dialog.set_status(str(error))
+            return
+        self._query_index = file_path, index
+        if current:
+            self._query_dialog.set_index(file_path, index)
+
+    def jump_to_cycle(self, file_path, cycle):
+        """
+        Метод перехода к циклу лог файла из
+        окна поиска. Если файл уже не воспроизводится,
+        он открывается заново
+        """
+        if self._replay is None or self._replay.file_path != file_path:
+            self.stop_replay()
+            try:
+                self._replay = LogReplay(file_path)
+            except (OSError, ImportError) as error:
+                # Файл мог быть удалён или перемещён
+                # после построения индекса поиска
+                logging.warning('log file %s not opened: %s',
+                                file_path, error)
+                return
+        self.seek_replay(cycle)
+
+    def replay_tick(self):
+        """
+        Метод обработки срабатывания
+        таймера воспроизведения
+        """
+        if not self._replay_to_end:
+            self.apply_replay(self._replay.step(), True)
+        else:
+            # Вкладка параметров обновляется один раз
+            # за шаг, после всех пакетов шага
+            deadline = time.perf_counter() + REPLAY_TICK_BUDGET
+            applied = False
+            while time.perf_counter() < deadline:
+                batch = self._replay.step()
+                if batch is None:
+                    break
+                self.apply_replay(batch, False)
+                applied = True
+            if applied:
+                self.apply_replay({}, True)
+        if self._replay.finished:
+            self.stop_replay()
+
+    def apply_replay(self, batch, refresh):
+        """
+        Метод применения пакета изменений одного
+        цикла. Пустой пакет только обновляет
+        вкладку параметров
+        """
+        if batch is not None and self._replay_function:
+            self._replay_function(batch, refresh)
+
+    def stop_replay(self):
+        """
+        Метод завершения воспроизведения
+        """
+        self._replay_timer.stop()
+        self._replay_to_end = False
+        if self._replay is not None:
+            self._replay.close()
+            self._replay = None
+
+    def toggle_capture(self):
+        """
+        Метод запуска и завершения записи
+        журнала обмена с имитатором
+        """
+        if self._socket.capturing:
+            self._socket.stop_capture()
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Capture journal")
+        if not file_path:
+            return
+        try:
+            self._socket.start_capture(file_path)
+        except OSError as error:
+            logging.warning('journal %s not created: %s', file_path, error)
+
+    def replay_journal(self):
+        """
+        Метод воспроизведения журнала обмена с
+        имитатором с записанной скоростью.
+        Повторный вызов прекращает воспроизведение
+        """
+        if self._journal_replay is not None and self._journal_replay.active:
+            self._journal_replay.stop()
+            return
+        # Ответы журнала смешались бы
+        # с ответами имитатора
+        if self._socket.isOpen():
+            logging.warning('disconnect from the simulator to replay '
+                            'a journal')
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open journal")
+        if not file_path:
+            return
+        try:
+            self._journal_replay = JournalReplay(self._socket, file_path)
+        except (OSError, ValueError) as error:
+            logging.warning('journal %s not opened: %s', file_path, error)
+            return
+        self._journal_replay.start()
 
-    def send_to_sim(self, string_to_sent):
+    def send_to_sim(self, string_to_sent, priority=PRIORITY_USER,
+                    timeout=None):
         """
         Метод передачи воздействий в объект
         увязки с имитатором
@@ -179,7 +653,8 @@ class SimWindow(QMainWindow):
         # Если соединение активно,
         # передаём в него воздействие
         if self._socket.isOpen():
-            self._socket.send(string_to_sent)
+            self._socket.send(string_to_sent, priority=priority,
+                              timeout=timeout)
 
     def connect_to_sim(self):
         """
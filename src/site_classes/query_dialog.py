@@ -0,0 +1,112 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialog
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtWidgets import QLineEdit
+from PyQt5.QtWidgets import QListWidget
+from PyQt5.QtWidgets import QListWidgetItem
+from PyQt5.QtWidgets import QPushButton
+from PyQt5.QtWidgets import QVBoxLayout
+
+from site_readers.log_query import QueryError
+
+
+class QueryDialog(QDialog):
+    """
+    Класс окна поиска циклов лог файла по условию.
+    На вход принимает функцию перехода к циклу
+    вида ФУНКЦИЯ(ЛОГ_ФАЙЛ, ЦИКЛ)
+    """
+
+    def __init__(self, jump_function):
+        super().__init__()
+        self._jump_function = jump_function
+        self._file_path = None
+        self._index = None
+
+        self._query = QLineEdit()
+        self._query.setPlaceholderText("SECTION S12.OCC==1 and S13.OCC!=0")
+        self._find = QPushButton("Find")
+        self._status = QLabel()
+        self._results = QListWidget()
+
+        self.setWindowTitle("Log query")
+        self.setGeometry(400, 400, 400, 400)
+        layout = QVBoxLayout()
+        layout.addWidget(self._query)
+        layout.addWidget(self._find)
+        layout.addWidget(self._status)
+        layout.addWidget(self._results)
+        self.setLayout(layout)
+
+        # Поиск выполняется по кнопке и по вводу,
+        # двойное нажатие на результат переводит
+        # воспроизведение на его первый цикл
+        self._find.clicked.connect(self.find)
+        self._query.returnPressed.connect(self.find)
+        self._results.itemDoubleClicked.connect(self.jump)
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    def set_status(self, text):
+        """
+        Метод отображения состояния поиска
+        """
+        self._status.setText(text)
+
+    def set_building(self, file_path):
+        """
+        Метод перевода окна в ожидание построения
+        индекса изменений лог файла, поиск до его
+        построения недоступен
+        """
+        self._results.clear()
+        self._status.setText("Indexing {}".format(file_path))
+        self._file_path = file_path
+        self._index = None
+        self.set_enabled(False)
+
+    def set_index(self, file_path, index):
+        """
+        Метод установки индекса изменений лог файла
+        """
+        if file_path != self._file_path or self._index is None:
+            self._results.clear()
+            self._status.setText(file_path)
+        self._file_path = file_path
+        self._index = index
+        self.set_enabled(True)
+
+    def set_enabled(self, enabled):
+        """
+        Метод включения полей поиска
+        """
+        self._query.setEnabled(enabled)
+        self._find.setEnabled(enabled)
+
+    def find(self):
+        """
+        Метод поиска циклов по введённому условию
+        """
+        self._results.clear()
+        if self._index is None:
+            return
+        try:
+            ranges = self._index.query(self._query.text())
+        except QueryError as error:
+            self._status.setText(str(error))
+            return
+        self._status.setText("{} ranges found".format(len(ranges)))
+        for first, last in ranges:
+            text = str(first) if first == last else f"{first}-{last}"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, first)
+            self._results.addItem(item)
+
+    def jump(self, item):
+        """
+        Метод перехода воспроизведения к
+        первому циклу найденного интервала
+        """
+        self._jump_function(self._file_path, str(item.data(Qt.UserRole)))
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
-import copy
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
 from pathlib import Path
+from types import MappingProxyType
 
+from PyQt5.QtCore import QEventLoop
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QAction
 from PyQt5.QtWidgets import QDockWidget
@@ -28,7 +31,14 @@ from site_readers import logic_reader
 from site_readers.command_reader import command_data_parser
 from site_readers.configuration_reader import config_reader
 from site_readers.configuration_reader import get_path_to_key
-from site_readers.data_reader import interlocking_data_parser
+from site_readers.data_reader import LazyLogicalObjects
+from site_readers.data_reader import interlocking_data_index
+from site_readers.object_model import ChannelData
+from site_readers.object_model import ControlData
+from site_readers.object_model import DefaultsView
+from site_readers.object_model import IndicationData
+from site_readers.object_model import VariableData
+from site_readers.project_cache import ProjectCache
 from site_readers.scene_reader import read_scene_data
 
 
@@ -479,6 +489,9 @@ class ImportSiteDataMixin:
     Класс примесь, реализующий
     функционал загрузки данных проекта
     """
+    # Период обновления окна во время
+    # анализа файлов проекта в секундах
+    _wait_timeout = 0.05
 
     def __init__(self):
         super().__init__()
@@ -489,7 +502,10 @@ class ImportSiteDataMixin:
         self._ipu_objects = {}
         self._product_name = {}
         self._logic_data = {}
+        self._type_defaults = {}
         self._coordinates = {}
+        # Кэш результатов анализа файлов проекта
+        self._cache = ProjectCache()
 
     def load_coordinates(self, path):
         """
@@ -513,18 +529,16 @@ class ImportSiteDataMixin:
             #  об ошибках загрузки
             pass
 
-    def load_components(self, com_data_file):
+    def load_components(self, com_data):
         """
         Метод загрузки команд проекта
         """
-        com_data = command_data_parser(com_data_file)
         self._components = com_data["Components"]
 
-    def load_data(self, int_data_file):
+    def load_data(self, int_data):
         """
         Метод загрузки данных об объектах
         """
-        int_data = interlocking_data_parser(int_data_file)
         # Сохраняем отдельно данные о логических объектах
         # и объектах увязки с напольными устройствами
         self._logical_objects = int_data["Logical_objects"]
@@ -533,182 +547,141 @@ class ImportSiteDataMixin:
         # (кавычки могут быть только двойные)
         self._product_name = int_data["Site_product_name"].replace('"', '')
 
-    def add_variable_from_logic(self, obj, obj_type):
-        """
-        Метод добавления к объектам информации о
-        внутренних переменных
-        """
-
-        for key in self._logic_data[obj_type]["#OWN"]:
-            # Для каждой внутренней переменной для данного
-            # типа объекта, получаем начальное значение
-            # из файла описания логики и добавляем его к
-            # объекту
-            init = self._logic_data[obj_type]["#OWN"][key]["init"]
-            if "variables" not in self._logical_objects[obj]:
-                self._logical_objects[obj]["variables"] = {
-                    key: {"value": init}}
-            else:
-                self._logical_objects[obj]["variables"][key] = {"value": init}
-
-    def load_logic(self, ste_path):
+    def load_logic(self, logic_data):
         """
         Метод загрузки информации о логике проекта
         """
-        # Для загружаем логику по заданному пути
-        self._logic_data = logic_reader.logic_analyse(ste_path)
-
-        for obj in self._logical_objects:
-            # Проходим по каждому объекту и получаем его тип
-            obj_type = self._logical_objects[obj]["Type"]
-            if not self._logic_data.get(obj_type):
-                continue
-            if "#OWN" in self._logic_data.get(obj_type):
-                # Если у данного типа есть внутренние переменные
-                # добавляем информацию о них
-                self.add_variable_from_logic(obj, obj_type)
-            else:
-                # Если внутренних переменных нет, добавляем
-                # пустое значение
-                self._logical_objects[obj]["variables"] = {"value": ""}
-
-            # Добавляем остальную информацию о
-            # значения по умолчанию и наличию
-            # свойств объекта
-            self.add_channel(obj, obj_type)
-            self.add_ind(obj, obj_type)
-            self.add_orders(obj, obj_type)
-            self.add_indication(obj, obj_type)
-            self.add_status(obj, obj_type)
+        self._logic_data = logic_data
+        # Значения по умолчанию строятся один раз
+        # для каждого типа при загрузке первого
+        # объекта этого типа
+        self._type_defaults = {}
+        if isinstance(self._logical_objects, LazyLogicalObjects):
+            # Объекты загружаются при первом обращении к ним,
+            # информация из логики добавляется при загрузке
+            self._logical_objects.add_loader(self.add_logic_data)
+        else:
+            # Объекты, загруженные полностью,
+            # дополняются информацией сразу
+            for obj in self._logical_objects:
+                self.add_logic_data(obj)
         return True
 
-    def add_channel(self, obj, obj_type):
+    def reset_objects(self):
         """
-        Метод добавления к объектам информации о
-        канал связи с другими объектами
+        Метод сброса значений переменных объектов
+        к значениям из проекта и логики.
+        Полностью загруженные объекты не связаны
+        с файлом проекта и не сбрасываются
         """
-        # Если объект не связан каналами с другими
-        # то возвращаемся
-        if "#INOUT" not in self._logic_data[obj_type]:
-            return
-        # Для каждого канала для данного типа объекта
-        for key in self._logic_data[obj_type]["#INOUT"]:
-            channels = self._logic_data[obj_type]["#INOUT"][key]
-            # для каждого соединительного вывода
-            for leg in channels:
-                # Формируем информацию о начальных значениях
-                # входящей и исходящей информации по каналу
-                channel = channels[leg]["init"]
-                value = {"IN": channel, "OUT": channel}
-                # Формируем имя канала по образцу
-                # ИМЯ(СОЕДИНИТЕЛЬНЫЙ_ВЫВОД)
-                # и добавляем информацию к объекту
-                name = f'{key}({leg})'
-                if "channels" not in self._logical_objects[obj]:
-                    self._logical_objects[obj]["channels"] = {name: value}
-                else:
-                    self._logical_objects[obj]["channels"][name] = value
+        if isinstance(self._logical_objects, LazyLogicalObjects):
+            self._logical_objects.reset()
 
-    def add_ind(self, obj, obj_type):
+    def get_type_defaults(self, obj_type):
         """
-        Метод добавления к объектам информации об
-        индивидуализации
+        Метод получения общих для всех объектов
+        типа значений по умолчанию из логики
         """
-        # Cобираем все данные об индивидуализации из логики
-        all_ind = logic_reader.get_ibits_list(obj_type, self._logic_data)
-        # Cобираем все данные об индивидуализации из проекта
-        obj_ind = self._logical_objects[obj]["individualizations"]
-        # Формируем список неучтённых в проекте индивидуализаций
-        new_i_bit = [x for x in all_ind if x not in obj_ind]
-        # Добавляем их к объекту со значением по умолчанию
-        for i_bit in new_i_bit:
-            default_val = logic_reader.get_default_value(i_bit,
-                                                         obj_type,
-                                                         self._logic_data)
-
-            obj_ind[i_bit] = default_val
+        defaults = self._type_defaults.get(obj_type)
+        if defaults is None:
+            defaults = self.build_type_defaults(obj_type)
+            self._type_defaults[obj_type] = defaults
+        return defaults
 
-    def add_orders(self, obj, obj_type):
+    def build_type_defaults(self, obj_type):
         """
-        Метод добавления к объектам информации о
-        приказах передаваемых в напольные объекты
-        и в другие логические объекты
+        Метод построения шаблона значений по умолчанию
+        для типа объекта в виде разделов объекта.
+        Разделы шаблона неизменяемые, так как
+        общие для всех объектов типа
         """
+        type_data = self._logic_data[obj_type]
+        defaults = {}
 
-        if "#OUT" not in self._logic_data[obj_type]:
-            return
-        # Получаем все приказы объекта
+        # Внутренние переменные с начальными значениями,
+        # если их нет, добавляем пустое значение
+        if "#OWN" in type_data:
+            defaults["variables"] = {
+                key: VariableData(value["init"])
+                for key, value in type_data["#OWN"].items()}
+        else:
+            defaults["variables"] = {"value": ""}
+
+        # Каналы связи с другими объектами формируются
+        # по образцу ИМЯ(СОЕДИНИТЕЛЬНЫЙ_ВЫВОД) с начальными
+        # значениями входящей и исходящей информации
+        channels = {}
+        for key, legs in type_data.get("#INOUT", {}).items():
+            for leg, channel in legs.items():
+                channels[f'{key}({leg})'] = ChannelData(channel["init"],
+                                                        channel["init"])
+        if channels:
+            defaults["channels"] = channels
+
+        # Индивидуализации со значениями по умолчанию
+        defaults["individualizations"] = {
+            i_bit: type_data["#IN"][i_bit]["init"]
+            for i_bit in logic_reader.get_ibits_list(obj_type,
+                                                     self._logic_data)}
+
+        # Приказы в напольные объекты и приказы в другие
+        # логические объекты добавляются, только если
+        # у типа есть приказы в напольные объекты
         ste_orders = logic_reader.get_orders(obj_type, self._logic_data)
+        if ste_orders:
+            defaults["orders"] = {x: ControlData() for x in ste_orders}
+            logic_ofw = logic_reader.get_ofw(obj_type, self._logic_data)
+            if logic_ofw:
+                defaults["ofw"] = {x: ControlData() for x in logic_ofw}
 
-        if not ste_orders:
-            return
+        # Индикационные переменные значения по умолчанию не имеют
+        logic_ind = logic_reader.get_status(obj_type, self._logic_data)
+        defaults["indication"] = {x: IndicationData() for x in logic_ind}
 
-        # Если хотя бы какие-то приказы объекта задействованы в проекте
-        if "orders" in self._logical_objects[obj]:
-            # Формируем список из неиспользованных
-            obj_orders = self._logical_objects[obj]["orders"]
-            new_orders = [x for x in ste_orders if x not in obj_orders]
-            # Добавляем их к информации об объекте
-            for order in new_orders:
-                obj_orders[order] = {"ipu": "", "value": ""}
-        else:
-            # Если в объекте не было задействовано ни одного приказа
-            # добавляем все как новые
-            obj_orders = {}
-            for order in ste_orders:
-                obj_orders[order] = {"ipu": "", "value": ""}
-            self._logical_objects[obj]["orders"] = obj_orders
-        # Аналогично приказам в напольные объекты
-        # добавляем информацию о приказах в другие
-        # логические объекты
-        logic_ofw = logic_reader.get_ofw(obj_type, self._logic_data)
-        obj_ofw = self._logical_objects[obj]["ofw"]
-        if logic_ofw:
-            new_ofw = [x for x in logic_ofw if x not in obj_ofw]
-            for order in new_ofw:
-                self._logical_objects[obj]["ofw"][order] = {"ipu": "",
-                                                            "value": ""}
-
-    def add_indication(self, obj, obj_type):
-        """
-        Метод добавления к объектам информации о
-        индикационных переменных
-        """
-        # Добавляем значение индикационной переменной
-        # в ключ cos и поле value.
-        obj_indication = self._logical_objects[obj]["indication"]
-        for indication in self._logical_objects[obj]["indication"]:
-            cos = self._logical_objects[obj]["indication"][indication]
-            # Значение по умолчанию у данного типа переменных нет
-            obj_indication[indication] = {"cos": cos, "value": ""}
+        # Статусы с начальными значениями из логики
+        logic_status = logic_reader.get_checks(obj_type, self._logic_data)
+        defaults["status"] = {
+            x: ControlData("", type_data["#IN"][x]["init"])
+            for x in logic_status}
 
-        logic_ind = logic_reader.get_status(obj_type, self._logic_data)
-        for indication in logic_ind:
-            if indication not in obj_indication:
-                obj_indication[indication] = {"cos": "", "value": ""}
+        return {x: MappingProxyType(y) for x, y in defaults.items()}
 
-    def add_status(self, obj, obj_type):
+    def add_logic_data(self, obj):
         """
-        Метод добавления к объектам информации о
-        статусах
+        Метод добавления к объекту информации из логики.
+        Каждый раздел объекта дополняется общими для типа
+        значениями по умолчанию без их копирования
         """
-        logic_status = logic_reader.get_checks(obj_type, self._logic_data)
-        obj_status = self._logical_objects[obj]["status"]
-        new_status = [x for x in logic_status if x not in obj_status]
-        # Добавляем незадействованные статусы
-        for status in new_status:
-            obj_status[status] = {"ipu": "", "value": ""}
-        for status in obj_status:
+        log_obj = self._logical_objects[obj]
+        # Получаем тип объекта
+        obj_type = log_obj["Type"]
+        if not self._logic_data.get(obj_type):
+            return
+
+        # Начальные значения устанавливаются только
+        # статусам из проекта, статусы из логики
+        # уже содержат их в шаблоне
+        self.add_status(log_obj["status"], obj_type)
+        for chapter, chapter_defaults in self.get_type_defaults(
+                obj_type).items():
+            own = log_obj[chapter] if chapter in log_obj else {}
+            log_obj[chapter] = DefaultsView(own, chapter_defaults)
+
+    def add_status(self, obj_status, obj_type):
+        """
+        Метод установки начальных значений
+        статусам объекта из проекта
+        """
+        logic_in = self._logic_data[obj_type].get("#IN", {})
+        for status, status_data in obj_status.items():
             # Если в статус приходит информация от
             # другого логического объекта, не добавляем значения
             if status.count("."):
                 continue
-            # Получаем начальное значение из файлов логики
-            init = self._logic_data[obj_type]["#IN"][status]["init"]
             # Если статус из проекта есть в логике,
             # устанавливаем ему значение
-            if status in self._logic_data[obj_type]["#IN"]:
-                obj_status[status]["value"] = init
+            if status in logic_in:
+                status_data["value"] = logic_in[status]["init"]
             else:
                 # Если статус отсутствует в логике, значит данные
                 # проекта не корректны
@@ -731,18 +704,19 @@ class ImportSiteDataMixin:
             return
 
         # Получаем данные конфигурации проекта
-        config = config_reader(config_path)
+        config = self.read_config(config_path)
 
         # Формируем кортеж из критически важных
-        # ключей проекта
+        # ключей проекта, функций анализа
         # и функций обработчиков данных
         parsers = (
-            ("CommandTable", self.load_components),
-            ("IntData", self.load_data),
-            ("ILL_STERNOL_FILE", self.load_logic),
+            ("CommandTable", command_data_parser, self.load_components),
+            ("IntData", interlocking_data_index, self.load_data),
+            ("ILL_STERNOL_FILE", logic_reader.logic_analyse, self.load_logic),
         )
 
-        for key, parser in parsers:
+        data_keys = {}
+        for key, parser, loader in parsers:
             # Получаем путь к файлу по ключу из конфигурации
             path_to_key = get_path_to_key(config, key)
             if not path_to_key:
@@ -756,28 +730,82 @@ class ImportSiteDataMixin:
                 # то прекращаем загрузку
                 # TODO: Добавить логирование
                 return
+            data_keys[key] = path_to_key
+
+        # Файлы не зависят друг от друга,
+        # по этому анализируются одновременно
+        site_files = [(x, data_keys[x], y) for x, y, _ in parsers]
+        site_data = self.read_site_files(site_files)
+
         # Очищаем данные от предыдущих загрузок проектов
         self.clear_site()
-
-        data_keys = {}
-        # Для каждого критически важного ключа
-        # получаем его путь и производим анализ
-        for key, parser in parsers:
-            path_to_key = get_path_to_key(config, key)
-            data_keys[key] = path_to_key
-            with open(path_to_key) as file_data:
-                parser(file_data)
-
-        # Сохраняем данные, делая глубокую копию полученной
-        # информации, т.к. она содержит вложенные изменяемые
-        # объекты
-        self._site_keys.update(copy.deepcopy(data_keys))
-        self._config_data = copy.deepcopy(config)
+        # Загружаем данные в порядке объявления,
+        # так как данные логики дополняют
+        # информацию об объектах
+        for key, parser, loader in parsers:
+            loader(site_data[key])
+
+        # Сохраняем данные без копирования, так как
+        # словарь ключей создан для этой загрузки, а
+        # конфигурация собрана config_reader в новых
+        # словарях из записей кэша конфигурационных файлов
+        self._site_keys.update(data_keys)
+        self._config_data = config
         self.load_coordinates(ils_path)
 
         # Возвращаем информацию об удачной загрузке проекта
         return True
 
+    def read_site_files(self, site_files):
+        """
+        Метод получения данных файлов проекта.
+        Файлы, отсутствующие в кэше, анализируются
+        параллельно в отдельных процессах
+        """
+        site_data = {}
+        missed = []
+        for key, path_to_key, parser in site_files:
+            data = self._cache.load(parser.__name__, path_to_key)
+            if data is None:
+                missed.append((key, path_to_key, parser))
+            else:
+                site_data[key] = data
+        if not missed:
+            return site_data
+
+        with ProcessPoolExecutor(max_workers=len(missed)) as executor:
+            # Результат анализа сохраняется в кэш
+            # в процессе, который его получил
+            futures = {
+                executor.submit(self._cache.read_file, parser.__name__,
+                                path_to_key, parser): key
+                for key, path_to_key, parser in missed
+            }
+            pending = set(futures)
+            while pending:
+                # Пока файлы анализируются, продолжаем
+                # перерисовку окна без обработки
+                # действий пользователя
+                qApp.processEvents(QEventLoop.ExcludeUserInputEvents)
+                _, pending = wait(pending, timeout=self._wait_timeout)
+            for future, key in futures.items():
+                site_data[key] = future.result()
+        return site_data
+
+    def read_config(self, config_path):
+        """
+        Метод получения конфигурации проекта
+        с использованием кэша
+        """
+        config = self._cache.load(config_reader.__name__, config_path)
+        if config is None:
+            config = config_reader(config_path)
+            # Конфигурация зависит от всех прочитанных
+            # конфигурационных файлов подпродуктов
+            self._cache.save(config_reader.__name__, config_path, config,
+                             config["Sources"])
+        return config
+
     def clear_site(self):
         """
         Метод очистки данных проекта
@@ -789,4 +817,5 @@ class ImportSiteDataMixin:
         self._ipu_objects.clear()
         self._product_name = ""
         self._logic_data.clear()
+        self._type_defaults.clear()
         self._coordinates.clear()
@@ -2,10 +2,9 @@
 # ==____________Command_reader___________==
 # =========================================
 
-import re
-from copy import deepcopy
+from site_readers.tokenizer import get_word_line_data
 
-WORD_PATTERN = r'(?:[\w.-]|".*")+'
+WORD_PATTERN = r'(?:[\w.-]|"[^"]*")+'
 
 
 def get_line_data(line):
@@ -13,9 +12,7 @@ def get_line_data(line):
     Строка разбивается на слова в соответствии с шаблоном
     и исключаются закомментированные строки
     """
-    match = re.findall(WORD_PATTERN, line)
-    if match and "." != match[0][0]:
-        return match
+    return get_word_line_data(line)
 
 
 def cos_analyse(command_data, out_data):
@@ -36,10 +33,29 @@ def cos_analyse(command_data, out_data):
             }
 
 
+def new_component():
+    """
+    Функция создания новой записи компонента.
+    Каждый вызов возвращает независимую структуру,
+    по этому сохранённый компонент не копируется
+    """
+    return {
+        "Command": "",
+        "Route": "",
+        "Parameters": [],
+        "Areas": [],
+        "Shared": "",
+        "Pretest": (),
+        "Manoeuvres": [],
+    }
+
+
 def save_current_component(current_component, current_section):
     """
     Сохраняем текущий компонент в общее хранилище
-    в соответствии с именем объекта и типом компонента
+    в соответствии с именем объекта и типом компонента.
+    Компонент передаётся хранилищу без копирования,
+    после сохранения вызывающий создаёт новую запись
     """
     com_type = current_component["Command"]
     obj = current_component['Parameters']
@@ -48,18 +64,11 @@ def save_current_component(current_component, current_section):
     # без дополнительных параметров, вставляем пустой
     obj = obj[0] if obj else ""
 
-    # Если тип компонента уже есть в общем хранилище
-    # и если для объекта уже присутствуют компоненты
-    # добавляем к предыдущим,
-    # если нет создаём новую запись
-    if com_type in current_section:
-        if obj in current_section[com_type]:
-            current_section[com_type][obj].append(deepcopy(current_component))
-            return
-        current_section[com_type][obj] = [deepcopy(current_component), ]
-        return
-    current_section[com_type] = {obj: []}
-    current_section[com_type][obj].append(deepcopy(current_component))
+    # Если тип компонента или объект отсутствуют
+    # в общем хранилище, создаём новую запись,
+    # иначе добавляем к предыдущим
+    com_section = current_section.setdefault(com_type, {})
+    com_section.setdefault(obj, []).append(current_component)
 
 
 def components_analyse(command_data, out_data):
@@ -67,20 +76,9 @@ def components_analyse(command_data, out_data):
     Функция анализа компонентов
     """
 
-    # Шаблон структуры данных объекта
-    current_component_temp = {
-        "Command": "",
-        "Route": "",
-        "Parameters": [],
-        "Areas": [],
-        "Shared": "",
-        "Pretest": [],
-        "Manoeuvres": [],
-    }
-
     # Выбор секции для сохранения данных
     current_section = out_data['Components']
-    current_component = deepcopy(current_component_temp)
+    current_component = new_component()
     current_sub_section = None
     for line_num, line in enumerate(command_data):
         line = get_line_data(line)
@@ -99,7 +97,7 @@ def components_analyse(command_data, out_data):
                     return line[0]
 
                 current_sub_section = 'Header'
-                current_component = deepcopy(current_component_temp)
+                current_component = new_component()
 
                 continue
 
@@ -124,11 +122,14 @@ def components_analyse(command_data, out_data):
                 current_component['Shared'] = line[-1]
                 current_sub_section = 'Pretest'
             elif current_sub_section == 'Pretest':
-                # Если раздел претеста сохраняем его отдельно
-                current_component['Pretest'] = deepcopy(line)
+                # Если раздел претеста сохраняем его отдельно.
+                # Строки компонента хранятся кортежами, так как
+                # список слов после разбиения занимает
+                # в памяти место с запасом
+                current_component['Pretest'] = tuple(line)
             else:
                 # Всё остальное является телом команды
-                current_component['Manoeuvres'].append(deepcopy(line))
+                current_component['Manoeuvres'].append(tuple(line))
 
 
 def commands_analyse(command_data, out_data):
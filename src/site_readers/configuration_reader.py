@@ -2,16 +2,68 @@
 # ==____________Config_reader____________==
 # =========================================
 
+import logging
 import os
 import re
-from copy import deepcopy
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-HEADER_PATTERN = r'(?:[\w.-]|".*")+'
+from site_readers.tokenizer import get_config_body_line_data
+from site_readers.tokenizer import get_word_line_data
+
+HEADER_PATTERN = r'(?:[\w.-]|"[^"]*")+'
 BODY_PATTERN = r'[\w.\-\~\;>]+'
 ADAPT_PATH = os.environ.get('ADAPT_PATH', 'X:/eqv/adapt')
 
 PRODUCT_TYPES = ('File', 'Directory',)
+# Количество потоков получения конфигураций подпродуктов
+RESOLVE_WORKERS = 8
+
+# Кэш разобранных конфигурационных файлов в пределах процесса
+# в виде АБСОЛЮТНЫЙ_ПУТЬ:(ВРЕМЯ_ИЗМЕНЕНИЯ, ДАННЫЕ)
+_config_cache = {}
+_config_cache_lock = threading.Lock()
+
+
+class ProductConfig(dict):
+    """
+    Класс конфигурации продукта.
+    Помимо данных конфигурации содержит индекс
+    файлов и директорий по ключам
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._key_index = {}
+        self.build_key_index()
+
+    def build_key_index(self):
+        """
+        Метод построения индекса КЛЮЧ:СПИСОК_ФАЙЛОВ.
+        Порядок файлов в списке соответствует порядку
+        в конфигурации, первым идёт актуальная версия
+        """
+        self._key_index = {}
+        for proj_file in self.get('Files', []) + self.get('Directories', []):
+            for key in proj_file.get('Key') or []:
+                self._key_index.setdefault(key, []).append(proj_file)
+
+    def get_file(self, key):
+        """
+        Метод получения актуальной версии
+        файла/директории по ключу
+        """
+        versions = self._key_index.get(key)
+        if versions:
+            return versions[0]
+
+    def get_all_files(self, key):
+        """
+        Метод получения всех версий
+        файла/директории по ключу
+        """
+        return list(self._key_index.get(key, []))
 
 
 def get_line_data(line, word_pattern):
@@ -29,14 +81,14 @@ def get_header_line_data(line):
     """
     Получение информации из строки заголовка
     """
-    return get_line_data(line, HEADER_PATTERN)
+    return get_word_line_data(line)
 
 
 def get_obj_line_data(line):
     """
     Получение информации из строки тела файла
     """
-    return get_line_data(line, BODY_PATTERN)
+    return get_config_body_line_data(line)
 
 
 def get_product_path(line, config_path):
@@ -64,14 +116,23 @@ def get_name_and_version(obj_name):
     return obj_name, version, old_version
 
 
+def new_product():
+    """
+    Функция создания новой записи файла или директории.
+    Каждый вызов возвращает независимую структуру,
+    по этому запись сохраняется без копирования
+    """
+    return {'Name': '', 'Type': '', 'Identity': '', 'Key': [],
+            'version': '', 'old_version': '', 'Path': '', }
+
+
 def product_save(current_data, out_data, current_path):
     """
     Сохранение информации об объекте в общее хранилище
     """
     if not current_data:
         return
-    temp_product = {'Name': '', 'Type': '', 'Identity': '', 'Key': [],
-                    'version': '', 'old_version': '', 'Path': '', }
+    temp_product = new_product()
     # Если директория раздела reference,
     # то объекты из этой директории являются
     # ссылками на подпродукты
@@ -99,9 +160,9 @@ def product_save(current_data, out_data, current_path):
     temp_product['Path'] = current_path
     # Сохраняем объект в соответствующий раздел
     if temp_product['Type'] == 'File':
-        out_data['Files'].append(deepcopy(temp_product))
+        out_data['Files'].append(temp_product)
         return
-    out_data['Directories'].append(deepcopy(temp_product))
+    out_data['Directories'].append(temp_product)
 
 
 def path_analyse(last_line, config_data, file_path):
@@ -176,14 +237,23 @@ def header_analyse(config_data):
     return None, out_data
 
 
-def get_path_to_product(product_data, adapt_path=ADAPT_PATH):
+def get_product_config_path(product_data, adapt_path=ADAPT_PATH):
     """
     Функция получения абсолютного пути
     до конфигурационного файла подпродукта
+    без проверки его наличия
     """
     product = product_data['Name'] + '-' + product_data['version']
-    product_path = os.path.join(adapt_path, product_data['Name'], product,
-                                product_data['Name'], 'ConfigInfo.CI')
+    return os.path.join(adapt_path, product_data['Name'], product,
+                        product_data['Name'], 'ConfigInfo.CI')
+
+
+def get_path_to_product(product_data, adapt_path=ADAPT_PATH):
+    """
+    Функция получения абсолютного пути
+    до конфигурационного файла подпродукта
+    """
+    product_path = get_product_config_path(product_data, adapt_path)
     if os.path.exists(product_path):
         return product_path
 
@@ -201,33 +271,140 @@ def config_parser(file_path):
         out_data['Header'] = header
         if last_line:
             products = path_analyse(last_line, config_data, file_path)
-            out_data.update(deepcopy(products))
+            # Разделы созданы анализом этого файла,
+            # по этому передаются без копирования
+            out_data.update(products)
     return out_data
 
 
-def config_reader(file_path, adapt_path=ADAPT_PATH):
+def read_config_file(file_path):
     """
-    Функция сбора информации конфигурации продукта,
-    включая все подпродукты на которые он ссылается
+    Функция получения данных конфигурационного файла
+    с кэшированием в пределах процесса.
+    Возвращённые данные общие для всех вызовов
+    и не должны изменяться
     """
-    # Получаем информацию о продукте
-    product_config = config_parser(file_path)
+    file_path = os.path.abspath(file_path)
+    # Отсутствие файла определяется этим же
+    # обращением к файловой системе
+    mtime = os.stat(file_path).st_mtime_ns
+    with _config_cache_lock:
+        cached = _config_cache.get(file_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    config = config_parser(file_path)
+    with _config_cache_lock:
+        _config_cache[file_path] = (mtime, config)
+    return config
+
+
+def read_sub_product(product_path):
+    """
+    Функция получения данных подпродукта.
+    Если подпродукт не найден, возвращается None
+    """
+    try:
+        return read_config_file(product_path)
+    except FileNotFoundError:
+        return None
 
-    # Для каждого подпродукта собираем информацию
-    # о нём и добавляем в общую структуру
-    for sub_prod in product_config.get('Products', []):
 
-        # Получаем абсолютный пути до подпродукта
-        path_to_sub = get_path_to_product(product_config['Products'][sub_prod])
-        # Если подпродукт не найден, переходим к следующему
-        if not path_to_sub:
+def resolve_products(root_path, root_config, adapt_path=ADAPT_PATH):
+    """
+    Функция обхода графа подпродуктов в ширину.
+    Каждый подпродукт читается один раз, подпродукты
+    одного уровня читаются параллельно.
+    Возвращает словарь ПУТЬ:ДАННЫЕ
+    """
+    products = {root_path: root_config}
+    level = [root_config]
+    with ThreadPoolExecutor(max_workers=RESOLVE_WORKERS) as executor:
+        while level:
+            # Собираем ещё не прочитанные подпродукты,
+            # на которые ссылаются продукты текущего уровня
+            new_paths = []
+            for config in level:
+                for sub_prod in config.get('Products', {}).values():
+                    path = os.path.abspath(
+                        get_product_config_path(sub_prod, adapt_path))
+                    if path not in products:
+                        products[path] = None
+                        new_paths.append(path)
+            sub_configs = executor.map(read_sub_product, new_paths)
+            level = []
+            for path, sub_config in zip(new_paths, sub_configs):
+                products[path] = sub_config
+                if sub_config is not None:
+                    level.append(sub_config)
+    return products
+
+
+def collect_products(config, products, adapt_path, stack, visited):
+    """
+    Функция получения путей подпродуктов в порядке
+    обхода в глубину, что соответствует приоритету
+    версий файлов.
+    Ссылки на продукт, находящийся выше по цепочке,
+    считаются циклом и пропускаются
+    """
+    out_paths = []
+    for sub_prod in config.get('Products', {}).values():
+        path = os.path.abspath(get_product_config_path(sub_prod, adapt_path))
+        if path in stack:
+            logging.error('cyclic reference to product %s from %s',
+                          path, stack[-1])
+            continue
+        # Если подпродукт не найден или уже был
+        # добавлен, переходим к следующему
+        if path in visited or products.get(path) is None:
             continue
+        visited.add(path)
+        out_paths.append(path)
+        stack.append(path)
+        out_paths += collect_products(products[path], products, adapt_path,
+                                      stack, visited)
+        stack.pop()
+    return out_paths
 
-        sub_data = config_reader(path_to_sub, adapt_path)
-        product_config['Files'] += sub_data['Files']
-        product_config['Directories'] += sub_data['Directories']
 
-    return product_config
+def config_reader(file_path, adapt_path=ADAPT_PATH):
+    """
+    Функция сбора информации конфигурации продукта,
+    включая все подпродукты на которые он ссылается
+    """
+    root_path = os.path.abspath(file_path)
+    # Получаем информацию о продукте
+    root_config = read_config_file(root_path)
+    products = resolve_products(root_path, root_config, adapt_path)
+    sub_paths = collect_products(root_config, products, adapt_path,
+                                 [root_path], {root_path})
+
+    files = list(root_config.get('Files', []))
+    directories = list(root_config.get('Directories', []))
+    # Запоминаем все прочитанные конфигурационные
+    # файлы для проверки актуальности данных
+    sources = [file_path]
+    # Для каждого подпродукта добавляем
+    # информацию о нём в общую структуру
+    for path in sub_paths:
+        files += products[path].get('Files', [])
+        directories += products[path].get('Directories', [])
+        sources.append(path)
+    # Ненайденные подпродукты тоже запоминаем:
+    # их появление меняет конфигурацию проекта
+    sources += [x for x, y in products.items() if y is None]
+
+    # Данные продуктов общие для всех вызовов
+    # read_config_file, по этому конфигурация проекта
+    # собирается в новых словарях. Записи файлов и
+    # директорий копируются вместе со списками ключей,
+    # остальные их значения - неизменяемые строки
+    config = {x: y for x, y in root_config.items()
+              if x not in ('Files', 'Directories')}
+    files = [dict(x, Key=list(x['Key'])) for x in files]
+    directories = [dict(x, Key=list(x['Key'])) for x in directories]
+    return ProductConfig(config, Files=files, Directories=directories,
+                         Sources=sources)
 
 
 def get_file_with_key(config_information, key):
@@ -235,6 +412,10 @@ def get_file_with_key(config_information, key):
     Функция получения файла/директории по ключу
     из конфигурационной информации проекта
     """
+    # Если конфигурация содержит индекс ключей,
+    # получаем данные из него
+    if isinstance(config_information, ProductConfig):
+        return config_information.get_file(key)
 
     # Для исключения проверки вхождения в список
     # ключей обёрнуто в перехват исключения
@@ -253,6 +434,18 @@ def get_file_with_key(config_information, key):
         return
 
 
+def get_all_files_with_key(config_information, key):
+    """
+    Функция получения всех версий файла/директории
+    по ключу из конфигурационной информации проекта
+    """
+    if isinstance(config_information, ProductConfig):
+        return config_information.get_all_files(key)
+    files = config_information.get('Files', [])
+    directories = config_information.get('Directories', [])
+    return [x for x in files + directories if key in (x.get('Key') or [])]
+
+
 def get_path_to_key(config_information, key):
     """
     Функция получения абсолютного пути до
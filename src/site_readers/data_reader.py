@@ -2,10 +2,18 @@
 # ==___________Int_data_reader___________==
 # =========================================
 
+import logging
+import os
 import re
-from copy import deepcopy
+from collections.abc import MutableMapping
 
-WORD_PATTERN = r'(?:[\w.-]|".*")+'
+from site_readers.object_model import ControlData
+from site_readers.object_model import IndicationData
+from site_readers.object_model import Leg
+from site_readers.object_model import LogicalObjectData
+from site_readers.tokenizer import get_word_line_data
+
+WORD_PATTERN = r'(?:[\w.-]|"[^"]*")+'
 
 
 def get_line_data(line, pattern=WORD_PATTERN):
@@ -13,6 +21,8 @@ def get_line_data(line, pattern=WORD_PATTERN):
     Строка разбивается на слова в соответствии с шаблоном
     и исключаются закомментированные строки
     """
+    if pattern == WORD_PATTERN:
+        return get_word_line_data(line)
     match = re.findall(pattern, line)
     if match and "." != match[0][0]:
         return match
@@ -23,8 +33,7 @@ def leg_analyse(line, current_obj):
     Информация о соседних объектах и их соединении
     собирается для каждого вывода объекта
     """
-    current_obj['legs'][line[0]] = {"neighbour": line[1],
-                                    "neighbour_leg": line[2], }
+    current_obj['legs'][line[0]] = Leg(line[1], line[2])
 
 
 def individ_analyse(line, current_obj):
@@ -45,11 +54,11 @@ def ofw_analyse(line, current_obj):
     if line[0] in current_obj["ofw"]:
         current_obj["ofw"][line[0]]["ipu"] += line[1:]
     else:
-        current_obj["ofw"][line[0]] = {"ipu": line[1:], "value": ""}
+        current_obj["ofw"][line[0]] = ControlData(line[1:], "")
 
 
 def order_status_analyse(line, current_section):
-    current_section[line[0]] = {"ipu": line[1], "value": ""}
+    current_section[line[0]] = ControlData(line[1], "")
 
 
 def order_analyse(line, current_obj):
@@ -70,7 +79,7 @@ def indication_analyse(line, current_obj):
     """
     Информация передаваемая на АРМ
     """
-    current_obj["indication"][line[0]] = line[1]
+    current_obj["indication"][line[0]] = IndicationData(line[1])
 
 
 def automaton_analyse(line, current_obj):
@@ -97,30 +106,74 @@ def connection_check_analyse(line, current_obj):
     current_obj["Check"].append(line)
 
 
+def new_logical_object(name='', obj_type=''):
+    """
+    Функция создания новой записи логического объекта.
+    Каждый вызов возвращает независимую структуру,
+    по этому готовый объект сохраняется без копирования
+    """
+    return LogicalObjectData(Name=name, Type=obj_type, legs={},
+                             individualizations={}, orders={},
+                             status={}, indication={}, ITI=[],
+                             ofw={}, incoming={}, telegram=[],
+                             command={}, Check=[])
+
+
+# Функции анализа атрибутов объекта
+# собраны для удобства вызова
+# в пары ключевое слово:функция
+ANALYSE_FUNC = {'Leg': leg_analyse, 'Individualizations': individ_analyse,
+                'Ofw': ofw_analyse, 'Order': order_analyse,
+                'Status': status_analyse, 'Indication': indication_analyse,
+                'Command': automaton_analyse, 'Telegram': telegram_analyse,
+                'Check': connection_check_analyse, }
+
+
+def get_sub_section(line, current_sub_section):
+    """
+    Функция получения подраздела объекта по строке.
+    Если строка не является заголовком подраздела,
+    возвращается None
+    """
+    if line[0] == 'Order':
+        # Заголовки одинаковые, но информация различается
+        # для передачи в контроллеры и в другие объекты
+        if current_sub_section != 'Ofw':
+            return 'Ofw'
+        return 'Order'
+    if line[0] in ANALYSE_FUNC:
+        # Если строка начинается с ключевого слова,
+        # то изменяем текущую подсекцию
+        return line[0]
+
+
+def object_lines_analyse(lines, cur_object, current_sub_section):
+    """
+    Функция анализа строк тела объекта.
+    Возвращает подраздел последней строки
+    """
+    for line in lines:
+        line = get_line_data(line)
+        if not line:
+            continue
+        sub_section = get_sub_section(line, current_sub_section)
+        if sub_section:
+            current_sub_section = sub_section
+        else:
+            # Обработка строки в соответствии с текущей подсекцией
+            ANALYSE_FUNC[current_sub_section](line, cur_object)
+    return current_sub_section
+
+
 def log_objects_analyse(interlocking_data, out_data):
     """
     Функция анализа информации объекта и записи
     в итоговый словарь
     """
 
-    # Шаблон структуры данных объекта
-    current_object_temp = {"Name": '', "Type": '', "legs": {},
-                           "individualizations": {}, "orders": {},
-                           "status": {}, "indication": {}, "ITI": [],
-                           "ofw": {}, "incoming": {}, "telegram": [],
-                           "command": {}, "Check": [], }
-
-    # Функции анализа атрибутов объекта
-    # собраны для удобства вызова
-    # в пары ключевое слово:функция
-    analyse_func = {'Leg': leg_analyse, 'Individualizations': individ_analyse,
-                    'Ofw': ofw_analyse, 'Order': order_analyse,
-                    'Status': status_analyse, 'Indication': indication_analyse,
-                    'Command': automaton_analyse, 'Telegram': telegram_analyse,
-                    'Check': connection_check_analyse, }
     current_section = out_data['Logical_objects']
 
-    cur_object = deepcopy(current_object_temp)
+    cur_object = new_logical_object()
     current_sub_section = None
     for line in interlocking_data:
         line = get_line_data(line)
@@ -129,34 +182,24 @@ def log_objects_analyse(interlocking_data, out_data):
             continue
         if line[0] in ('End', 'COS', 'IPU', 'External'):
             # Если раздел объекта закончен и предыдущий объект
-            # не пустой, то сохранением его данные
+            # не пустой, то передаём его в итоговый словарь
             if cur_object['Name']:
-                current_section[cur_object['Name']] = deepcopy(cur_object)
+                current_section[cur_object['Name']] = cur_object
             # Если далее следует не новый объект, то завершаем анализ
             if line[0] != 'External':
                 return line[0]
 
-            # Обнуляем текущую информацию об объекте
-            cur_object = deepcopy(current_object_temp)
-            cur_object['Name'] = line[2]
-            cur_object['Type'] = line[4]
+            # Начинаем новую запись объекта
+            cur_object = new_logical_object(line[2], line[4])
             continue
 
         # Выбор подраздела объекта по заголовку
-        if line[0] == 'Order':
-            # Заголовки одинаковые, но информация различается
-            # для передачи в контроллеры и в другие объекты
-            if current_sub_section != 'Ofw':
-                current_sub_section = 'Ofw'
-            else:
-                current_sub_section = 'Order'
-        elif line[0] in analyse_func:
-            # Если строка начинается с ключевого слова,
-            # то изменяем текущую подсекцию
-            current_sub_section = line[0]
+        sub_section = get_sub_section(line, current_sub_section)
+        if sub_section:
+            current_sub_section = sub_section
         else:
             # Обработка строки в соответствии с текущей подсекцией
-            current_func = analyse_func[current_sub_section]
+            current_func = ANALYSE_FUNC[current_sub_section]
             current_func(line, cur_object)
 
 
@@ -191,25 +234,34 @@ def ipu_objects_analyse(interlocking_data, out_data):
                                                 "Consists": line[4:], }
 
 
-def add_cfw(out_data, obj_name, ils_id=""):
+def get_cfw(obj_name, ofw_data, ils_id=""):
     """
-    Функция добавления информации о входящих данных
-    получаемых в объекте от приказов свободного монтажа
+    Функция получения входящих данных, которые объект
+    передаёт приказами свободного монтажа.
+    Возвращает пары ОБЪЕКТ_ПРИЁМА:(СТАТУС, ДАННЫЕ)
     """
     # При наличии нескольких централизаций получаем
     # номер необходимой
     if "-" in obj_name:
         ils_id = obj_name.split("-")[-1]
-    # Для всех направлений приказа добавляем информацию
-    # об объекте передачи в объект приёма
-    for ofw in out_data[obj_name]["ofw"]:
-        for log_obj, check in zip(out_data[obj_name]["ofw"][ofw]["ipu"][::2],
-                                  out_data[obj_name]["ofw"][ofw]["ipu"][
-                                  1::2], ):
+    for ofw in ofw_data:
+        ipu = ofw_data[ofw]["ipu"]
+        for log_obj, check in zip(ipu[::2], ipu[1::2]):
             if ils_id:
                 log_obj = log_obj + "-" + ils_id
-            ipu = obj_name + "." + ofw
-            out_data[log_obj]["status"][check] = {"value": 0, "ipu": ipu}
+            yield log_obj, check, ControlData(obj_name + "." + ofw, 0)
+
+
+def add_cfw(out_data, obj_name, ils_id=""):
+    """
+    Функция добавления информации о входящих данных
+    получаемых в объекте от приказов свободного монтажа
+    """
+    # Для всех направлений приказа добавляем информацию
+    # об объекте передачи в объект приёма
+    for log_obj, check, status in get_cfw(obj_name,
+                                          out_data[obj_name]["ofw"], ils_id):
+        out_data[log_obj]["status"][check] = status
 
 
 def ofw_cfw_mapping(out_data):
@@ -224,6 +276,330 @@ def ofw_cfw_mapping(out_data):
         add_cfw(out_data["Logical_objects"], log_obj)
 
 
+class LazyLogicalObjects(MutableMapping):
+    """
+    Класс хранилища логических объектов
+    с отложенной загрузкой.
+    Для каждого объекта заранее известны только
+    имя, тип, выводы и положение в файле IntData.
+    Остальные данные считываются из файла при
+    первом обращении к объекту.
+    """
+
+    def __init__(self, file_path, encoding):
+        super().__init__()
+        self._file_path = file_path
+        self._encoding = encoding
+        stat = os.stat(file_path)
+        self._file_stat = (stat.st_size, stat.st_mtime_ns)
+        # Заголовки объектов в порядке следования в файле
+        self._headers = {}
+        # Положение тела объекта в файле и подраздел,
+        # действующий к его началу
+        self._ranges = {}
+        # Входящие данные от приказов свободного монтажа
+        self._incoming = {}
+        # Полностью загруженные объекты
+        self._objects = {}
+        # Заголовки загруженных объектов для их сброса
+        self._file_headers = {}
+        # Функции дополнения загружаемых объектов
+        self._loaders = []
+
+    def __getstate__(self):
+        # Функции дополнения привязаны к окну
+        # и не сохраняются
+        state = self.__dict__.copy()
+        state['_loaders'] = []
+        return state
+
+    def __getitem__(self, name):
+        obj = self._objects.get(name)
+        if obj is None:
+            if name not in self._ranges:
+                raise KeyError(name)
+            obj = self.load_object(name)
+        return obj
+
+    def __setitem__(self, name, obj):
+        self._headers[name] = obj
+        self._objects[name] = obj
+        self._ranges.pop(name, None)
+        self._file_headers.pop(name, None)
+
+    def __delitem__(self, name):
+        del self._headers[name]
+        self._objects.pop(name, None)
+        self._ranges.pop(name, None)
+        self._file_headers.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._headers
+
+    def __iter__(self):
+        return iter(self._headers)
+
+    def __len__(self):
+        return len(self._headers)
+
+    def clear(self):
+        self._headers.clear()
+        self._ranges.clear()
+        self._incoming.clear()
+        self._objects.clear()
+        self._file_headers.clear()
+        self._loaders.clear()
+
+    def add_header(self, header, start, end, sub_section):
+        """
+        Метод добавления заголовка объекта
+        и положения его тела в файле
+        """
+        self._headers[header['Name']] = header
+        self._ranges[header['Name']] = (start, end, sub_section)
+
+    def add_incoming(self, obj_name, check, status):
+        """
+        Метод добавления статуса, получаемого объектом
+        от приказа свободного монтажа
+        """
+        self._incoming.setdefault(obj_name, {})[check] = status
+
+    def add_loader(self, loader):
+        """
+        Метод добавления функции дополнения объекта.
+        Функция вызывается с именем объекта после его
+        загрузки, для уже загруженных объектов сразу
+        """
+        self._loaders.append(loader)
+        for name in list(self._objects):
+            loader(name)
+
+    def header(self, name):
+        """
+        Метод получения данных объекта без его загрузки:
+        имени, типа и выводов
+        """
+        return self._headers[name]
+
+    def headers(self):
+        """
+        Метод получения заголовков всех объектов
+        """
+        return dict(self._headers)
+
+    def is_loaded(self, name):
+        """
+        Метод проверки загрузки объекта
+        """
+        return name in self._objects
+
+    def reset(self):
+        """
+        Метод сброса загруженных из файла объектов.
+        При следующем обращении они загружаются заново
+        со значениями из проекта, положение объектов
+        в файле не определяется заново
+        """
+        for name, header in self._file_headers.items():
+            self._headers[name] = header
+            del self._objects[name]
+        self._file_headers.clear()
+
+    def reindex(self):
+        """
+        Метод обновления положения объектов по
+        изменившемуся файлу. Незагруженные объекты,
+        отсутствующие в файле, удаляются, загруженные
+        остаются и больше не сбрасываются
+        """
+        with open(self._file_path, encoding=self._encoding) as int_data:
+            index = interlocking_data_index(int_data)['Logical_objects']
+        for name in list(self._headers):
+            loaded = name in self._objects
+            if name in index._ranges:
+                self._ranges[name] = index._ranges[name]
+                if not loaded:
+                    self._headers[name] = index._headers[name]
+                elif name in self._file_headers:
+                    self._file_headers[name] = index._headers[name]
+            elif loaded:
+                self._ranges.pop(name, None)
+                self._file_headers.pop(name, None)
+            else:
+                del self[name]
+        self._incoming = {x: y for x, y in index._incoming.items()
+                          if x in self._ranges}
+        self._file_stat = index._file_stat
+
+    def read_object_lines(self, name):
+        """
+        Метод чтения строк тела объекта из файла.
+        Если файл изменился после построения индекса,
+        положение объектов определяется заново
+        """
+        stat = os.stat(self._file_path)
+        if (stat.st_size, stat.st_mtime_ns) != self._file_stat:
+            logging.warning('%s changed after loading, objects are '
+                            'indexed again', self._file_path)
+            self.reindex()
+        start, end, _ = self._ranges[name]
+        with open(self._file_path, 'rb') as int_data:
+            int_data.seek(start)
+            body = int_data.read(end - start)
+        return body.decode(self._encoding).splitlines()
+
+    def load_object(self, name):
+        """
+        Метод полной загрузки объекта из файла
+        """
+        # Строки читаются до получения заголовка, так как
+        # при изменении файла он индексируется заново
+        lines = self.read_object_lines(name)
+        header = self._headers[name]
+        _, _, sub_section = self._ranges[name]
+
+        obj = new_logical_object(header['Name'], header['Type'])
+        object_lines_analyse(lines, obj, sub_section)
+        # Добавляем статусы от приказов свободного монтажа
+        # других объектов. Статусы копируются, так как
+        # сброшенный объект загружается заново
+        obj['status'].update({x: y.copy() for x, y in
+                              self._incoming.get(name, {}).items()})
+
+        # Объект сохраняется до вызова функций дополнения,
+        # так как они могут обращаться к нему по имени.
+        # Положение в файле и заголовок остаются для сброса
+        self._objects[name] = obj
+        self._file_headers[name] = header
+        self._headers[name] = obj
+        for loader in self._loaders:
+            loader(name)
+        return obj
+
+
+class OffsetLines:
+    """
+    Класс итерации по строкам двоичного файла
+    с сохранением положения текущей строки
+    """
+
+    def __init__(self, raw_data, encoding):
+        self._raw_data = raw_data
+        self._encoding = encoding
+        # Начало и конец последней прочитанной строки
+        self.line_start = 0
+        self.line_end = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self._raw_data.readline()
+        if not line:
+            raise StopIteration
+        self.line_start = self.line_end
+        self.line_end += len(line)
+        return line.decode(self._encoding)
+
+
+def log_objects_index(lines, out_data):
+    """
+    Функция построения индекса объектов.
+    Для каждого объекта анализируются только заголовок,
+    выводы и приказы свободного монтажа, для остальных
+    данных запоминается их положение в файле
+    """
+    objects = out_data['Logical_objects']
+    ofw_data = {}
+    header = None
+    start = 0
+    start_sub_section = None
+    current_sub_section = None
+    next_section = None
+    for line in lines:
+        line = get_line_data(line)
+
+        if not line:
+            continue
+        if line[0] in ('End', 'COS', 'IPU', 'External'):
+            # Если раздел объекта закончен, то сохраняем
+            # заголовок и положение тела объекта
+            if header:
+                objects.add_header(header, start, lines.line_start,
+                                   start_sub_section)
+                header = None
+            # Если далее следует не новый объект, то завершаем анализ
+            if line[0] != 'External':
+                next_section = line[0]
+                break
+
+            header = LogicalObjectData(Name=line[2], Type=line[4], legs={})
+            start = lines.line_end
+            start_sub_section = current_sub_section
+            continue
+
+        sub_section = get_sub_section(line, current_sub_section)
+        if sub_section:
+            current_sub_section = sub_section
+        elif current_sub_section == 'Leg':
+            leg_analyse(line, header)
+        elif current_sub_section == 'Ofw':
+            # Приказы свободного монтажа нужны заранее,
+            # так как дополняют статусы других объектов
+            ofw_analyse(line, ofw_data.setdefault(header['Name'], {'ofw': {}}))
+    # Если файл закончился внутри объекта,
+    # сохраняем его до конца файла
+    if header:
+        objects.add_header(header, start, lines.line_end, start_sub_section)
+
+    for obj_name in ofw_data:
+        for log_obj, check, status in get_cfw(obj_name,
+                                              ofw_data[obj_name]['ofw']):
+            objects.add_incoming(log_obj, check, status)
+    return next_section
+
+
+def interlocking_data_index(interlocking_data):
+    """
+    Функция получения данных объектов из открытого файла
+    станции с отложенной загрузкой логических объектов.
+    Данные заголовка, контроллеров и индикационных
+    объектов загружаются сразу
+    """
+    file_path = os.path.abspath(interlocking_data.name)
+    encoding = interlocking_data.encoding
+    # Файл читается в двоичном виде для получения
+    # положения объектов в файле
+    lines = OffsetLines(interlocking_data.buffer, encoding)
+
+    current_section = 'Header'
+    out_data = {'Header': {},
+                'Logical_objects': LazyLogicalObjects(file_path, encoding),
+                'IPU_objects': {}, 'COS_objects': {},
+                'Site_product_name': '', }
+    for line in lines:
+        line = get_line_data(line)
+        if not line:
+            continue
+        if line == ['Logical', 'objects']:
+            current_section = 'Logical'
+
+        if current_section == 'Header':
+            out_data['Header'][line[0]] = line[1:]
+            if line[0] == 'Site_product_name':
+                out_data['Site_product_name'] = line[1]
+            continue
+        if current_section == 'Logical':
+            current_section = log_objects_index(lines, out_data)
+        if current_section == 'IPU':
+            current_section = ipu_objects_analyse(lines, out_data)
+        if current_section == 'COS':
+            cos_objects_analyse(lines, out_data)
+            break
+    return out_data
+
+
 def interlocking_data_parser(interlocking_data):
     """
     Функция получения данных объектов из файла станции.
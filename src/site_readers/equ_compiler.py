@@ -0,0 +1,400 @@
+# =========================================
+# ==_____________Equ_compiler____________==
+# =========================================
+"""
+Разбор и компиляция уравнений раздела #EQU
+типов логических объектов.
+
+Грамматика уравнения:
+
+    equation := target '=' expr ';'
+    target   := NAME | NAME '(' NUMBER ')'
+    expr     := IF expr THEN expr ELSE expr | or
+    or       := and {OR and}
+    and      := not {AND not}
+    not      := NOT not | compare
+    compare  := sum [('=' | '<>' | '<' | '>' | '<=' | '>=') sum]
+    sum      := term {('+' | '-') term}
+    term     := unary {('*' | '/') unary}
+    unary    := '-' unary | atom
+    atom     := NUMBER | NAME | NAME '(' NUMBER ')' | '(' expr ')'
+
+NAME - переменная раздела #OWN, #IN или #OUT, константа
+раздела #CONST или канал раздела #INOUT. Канал
+записывается с номером соединительного вывода:
+чтение канала даёт входящее значение, присвоение
+задаёт исходящее.
+Все значения целые, логические операции и сравнения
+дают 1 или 0, деление целочисленное, деление на
+ноль даёт 0.
+
+Дерево уравнения хранится кортежами:
+    ('num', ЗНАЧЕНИЕ), ('var', ИМЯ), ('chan', ИМЯ, ВЫВОД),
+    ('not', X), ('neg', X), ('op', ОПЕРАЦИЯ, X, Y),
+    ('if', УСЛОВИЕ, X, Y)
+"""
+
+import re
+
+TOKEN_PATTERN = re.compile(
+    r'\s*(?:(\d+)|([A-Za-z_]\w*)|(<>|<=|>=|[=<>+\-*/();]))')
+KEYWORDS = ('IF', 'THEN', 'ELSE', 'AND', 'OR', 'NOT')
+COMPARE_OPS = ('=', '<>', '<', '>', '<=', '>=')
+
+# Шаблоны кода Python для операций,
+# результат которых является числом
+OP_TEMPLATES = {
+    '+': '({} + {})',
+    '-': '({} - {})',
+    '*': '({} * {})',
+    '/': '_div({}, {})',
+}
+# Шаблоны кода Python для логических операций
+# и сравнений в месте, где нужно условие
+COND_TEMPLATES = {
+    'OR': '({} or {})',
+    'AND': '({} and {})',
+    '=': '({} == {})',
+    '<>': '({} != {})',
+    '<': '({} < {})',
+    '>': '({} > {})',
+    '<=': '({} <= {})',
+    '>=': '({} >= {})',
+}
+
+
+class EquError(ValueError):
+    """
+    Ошибка разбора или компиляции уравнения
+    """
+
+
+def to_int(value):
+    """
+    Функция приведения значения из файлов
+    проекта к целому числу
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _div(left, right):
+    return left // right if right else 0
+
+
+def tokenize(text):
+    """
+    Функция разбиения уравнения на лексемы.
+    Лексема - пара ВИД:ЗНАЧЕНИЕ, где вид
+    'num', 'name', 'kw' или 'op'
+    """
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match:
+            raise EquError('unexpected symbol {!r} in {!r}'.format(
+                text[position:].strip()[:1], text))
+        number, name, operation = match.groups()
+        if number is not None:
+            tokens.append(('num', int(number)))
+        elif name is not None:
+            if name.upper() in KEYWORDS:
+                tokens.append(('kw', name.upper()))
+            else:
+                tokens.append(('name', name))
+        else:
+            tokens.append(('op', operation))
+        position = match.end()
+    return tokens
+
+
+class EquParser:
+    """
+    Класс разбора уравнения методом
+    рекурсивного спуска
+    """
+
+    def __init__(self, text):
+        self._text = text
+        self._tokens = tokenize(text)
+        self._position = 0
+
+    def error(self, message):
+        return EquError('{} in {!r}'.format(message, self._text))
+
+    def peek(self):
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return None, None
+
+    def take(self):
+        token = self.peek()
+        if token[0] is None:
+            raise self.error('unexpected end')
+        self._position += 1
+        return token
+
+    def accept(self, kind, value):
+        """
+        Метод пропуска ожидаемой лексемы.
+        Возвращает признак её наличия
+        """
+        if self.peek() == (kind, value):
+            self._position += 1
+            return True
+        return False
+
+    def expect(self, kind, value):
+        if not self.accept(kind, value):
+            raise self.error('{!r} expected'.format(value))
+
+    def equation(self):
+        target = self.name_or_channel()
+        if target[0] == 'num':
+            raise self.error('assignment to a number')
+        self.expect('op', '=')
+        expr = self.expr()
+        self.expect('op', ';')
+        if self.peek()[0] is not None:
+            raise self.error('text after ";"')
+        return target, expr
+
+    def expr(self):
+        if self.accept('kw', 'IF'):
+            condition = self.expr()
+            self.expect('kw', 'THEN')
+            then_expr = self.expr()
+            self.expect('kw', 'ELSE')
+            else_expr = self.expr()
+            return 'if', condition, then_expr, else_expr
+        return self.or_expr()
+
+    def or_expr(self):
+        left = self.and_expr()
+        while self.accept('kw', 'OR'):
+            left = 'op', 'OR', left, self.and_expr()
+        return left
+
+    def and_expr(self):
+        left = self.not_expr()
+        while self.accept('kw', 'AND'):
+            left = 'op', 'AND', left, self.not_expr()
+        return left
+
+    def not_expr(self):
+        if self.accept('kw', 'NOT'):
+            return 'not', self.not_expr()
+        return self.compare()
+
+    def compare(self):
+        left = self.sum()
+        kind, value = self.peek()
+        if kind == 'op' and value in COMPARE_OPS:
+            self._position += 1
+            return 'op', value, left, self.sum()
+        return left
+
+    def sum(self):
+        left = self.term()
+        while self.peek() in (('op', '+'), ('op', '-')):
+            left = 'op', self.take()[1], left, self.term()
+        return left
+
+    def term(self):
+        left = self.unary()
+        while self.peek() in (('op', '*'), ('op', '/')):
+            left = 'op', self.take()[1], left, self.unary()
+        return left
+
+    def unary(self):
+        if self.accept('op', '-'):
+            return 'neg', self.unary()
+        return self.atom()
+
+    def atom(self):
+        if self.accept('op', '('):
+            expr = self.expr()
+            self.expect('op', ')')
+            return expr
+        return self.name_or_channel()
+
+    def name_or_channel(self):
+        kind, value = self.take()
+        if kind == 'num':
+            return 'num', value
+        if kind != 'name':
+            raise self.error('unexpected {!r}'.format(value))
+        if self.accept('op', '('):
+            kind, leg = self.take()
+            if kind != 'num':
+                raise self.error('leg number expected')
+            self.expect('op', ')')
+            return 'chan', value, str(leg)
+        return 'var', value
+
+
+def parse_equation(text):
+    """
+    Функция разбора уравнения в дерево.
+    Возвращает пару ЦЕЛЬ:ВЫРАЖЕНИЕ
+    """
+    return EquParser(text).equation()
+
+
+class TypeProgram:
+    """
+    Скомпилированные уравнения типа объекта.
+    Значения переменных объекта хранятся списком
+    в порядке slots, значения каналов - списками
+    входящих и исходящих значений в порядке channels.
+    Функция run пересчитывает все переданные объекты
+    типа, каждый объект - кортеж из трёх списков
+    """
+    __slots__ = ('obj_type', 'slots', 'channels', 'slot_index',
+                 'channel_index', 'init', 'channels_init', 'source', 'run')
+
+    def __init__(self, obj_type, slots, channels, init, channels_init,
+                 source, run):
+        self.obj_type = obj_type
+        self.slots = slots
+        self.channels = channels
+        # Индексы переменных и каналов по имени
+        self.slot_index = {x: i for i, x in enumerate(slots)}
+        self.channel_index = {x: i for i, x in enumerate(channels)}
+        self.init = init
+        self.channels_init = channels_init
+        self.source = source
+        self.run = run
+
+
+class TypeCompiler:
+    """
+    Класс компиляции уравнений типа объекта
+    в функцию Python
+    """
+
+    def __init__(self, obj_type, type_data, constants):
+        self._obj_type = obj_type
+        self._constants = constants
+        # Переменные объекта с индексами в списке значений
+        self._slots = {}
+        self._init = []
+        for section in ('#OWN', '#IN', '#OUT'):
+            for name, params in type_data.get(section, {}).items():
+                if name not in self._slots:
+                    self._slots[name] = len(self._init)
+                    self._init.append(to_int(params['init']))
+        # Каналы объекта в виде ИМЯ(ВЫВОД)
+        self._channels = {}
+        self._channels_init = []
+        for name, legs in type_data.get('#INOUT', {}).items():
+            for leg, params in legs.items():
+                self._channels[f'{name}({leg})'] = len(self._channels_init)
+                self._channels_init.append(to_int(params['init']))
+        self._equations = type_data.get('#EQU', [])
+
+    def error(self, message):
+        return EquError('{}: {}'.format(self._obj_type, message))
+
+    def channel(self, name, leg):
+        channel = f'{name}({leg})'
+        if channel not in self._channels:
+            raise self.error('unknown channel {}'.format(channel))
+        return self._channels[channel]
+
+    def expr_source(self, node):
+        """
+        Метод получения кода Python для выражения
+        """
+        kind = node[0]
+        if kind == 'num':
+            return str(node[1])
+        if kind == 'var':
+            name = node[1]
+            if name in self._slots:
+                return 's[{}]'.format(self._slots[name])
+            if name in self._constants:
+                return str(self._constants[name])
+            raise self.error('unknown variable {}'.format(name))
+        if kind == 'chan':
+            return 'ci[{}]'.format(self.channel(node[1], node[2]))
+        if kind == 'not':
+            return '(0 if {} else 1)'.format(self.cond_source(node[1]))
+        if kind == 'neg':
+            return '(-{})'.format(self.expr_source(node[1]))
+        if kind == 'op' and node[1] in OP_TEMPLATES:
+            return OP_TEMPLATES[node[1]].format(self.expr_source(node[2]),
+                                                self.expr_source(node[3]))
+        if kind == 'op':
+            # Результат логической операции
+            # или сравнения приводится к 1 или 0
+            return '(1 if {} else 0)'.format(self.cond_source(node))
+        if kind == 'if':
+            then_source = self.expr_source(node[2])
+            else_source = self.expr_source(node[3])
+            return '({} if {} else {})'.format(then_source,
+                                               self.cond_source(node[1]),
+                                               else_source)
+        raise self.error('unknown node {!r}'.format(kind))
+
+    def cond_source(self, node):
+        """
+        Метод получения кода Python для выражения
+        в месте, где нужно условие. Логические
+        операции и сравнения не приводятся к числу
+        """
+        if node[0] == 'not':
+            return '(not {})'.format(self.cond_source(node[1]))
+        if node[0] == 'op' and node[1] in ('AND', 'OR'):
+            return COND_TEMPLATES[node[1]].format(self.cond_source(node[2]),
+                                                  self.cond_source(node[3]))
+        if node[0] == 'op' and node[1] in COND_TEMPLATES:
+            return COND_TEMPLATES[node[1]].format(self.expr_source(node[2]),
+                                                  self.expr_source(node[3]))
+        return self.expr_source(node)
+
+    def target_source(self, node):
+        """
+        Метод получения кода Python для цели присвоения
+        """
+        if node[0] == 'chan':
+            return 'co[{}]'.format(self.channel(node[1], node[2]))
+        if node[1] not in self._slots:
+            raise self.error('unknown variable {}'.format(node[1]))
+        return 's[{}]'.format(self._slots[node[1]])
+
+    def compile(self):
+        """
+        Метод компиляции всех уравнений типа
+        """
+        lines = ['def run(objects):', '    for s, ci, co in objects:']
+        for text in self._equations:
+            try:
+                target, expr = parse_equation(text)
+            except EquError as error:
+                raise self.error(error) from None
+            lines.append('        {} = {}'.format(self.target_source(target),
+                                                  self.expr_source(expr)))
+        if len(lines) == 2:
+            lines.append('        pass')
+        source = '\n'.join(lines) + '\n'
+        namespace = {'_div': _div}
+        exec(compile(source, '<equ {}>'.format(self._obj_type), 'exec'),
+             namespace)
+        return TypeProgram(self._obj_type, tuple(self._slots),
+                           tuple(self._channels), tuple(self._init),
+                           tuple(self._channels_init), source,
+                           namespace['run'])
+
+
+def compile_type(obj_type, logic_data):
+    """
+    Функция компиляции уравнений типа объекта
+    из данных логики
+    """
+    constants = {x: to_int(y) for x, y in logic_data.get('CONST', {}).items()}
+    return TypeCompiler(obj_type, logic_data[obj_type], constants).compile()
@@ -0,0 +1,161 @@
+# =========================================
+# ==_______________Log_diff______________==
+# =========================================
+"""
+Поиск первого расхождения состояний станции
+в двух лог файлах, например в прогонах эталонной
+и новой версии логики.
+
+Состояние станции - значения всех переменных на
+конец цикла. Хэш состояния - сумма хэшей пар
+ПЕРЕМЕННАЯ:ЗНАЧЕНИЕ, при изменении переменной он
+обновляется вычитанием хэша старой пары и
+прибавлением хэша новой, без обхода всего состояния.
+Оба лога читаются одновременно по циклам, после
+каждого цикла хэши состояний сравниваются, чтение
+прекращается на первом расхождении. Так как до
+этого цикла состояния совпадали, поэлементно
+сравниваются только переменные, изменившиеся в нём.
+
+Номера циклов в логе возрастают, уменьшение номера
+(например, после перезапуска имитатора) считается
+началом нового прогона: циклы упорядочиваются парами
+ПРОГОН:НОМЕР, по этому логи сравниваются правильно,
+если перезапуски в них происходили на тех же циклах.
+
+Запуск из каталога src:
+    python -m site_readers.log_diff ЭТАЛОННЫЙ_ЛОГ НОВЫЙ_ЛОГ
+"""
+
+import argparse
+
+from site_readers.log_files import open_log
+from site_readers.log_reader import CYCLE_INDEX
+from site_readers.log_reader import get_line_value
+from site_readers.log_reader import get_lines
+from site_readers.log_reader import to_cycle
+
+HASH_MASK = 2 ** 64 - 1
+
+
+def iter_cycle_values(input_data):
+    """
+    Функция генератор новых значений переменных
+    по циклам. Возвращает тройки
+    (ПРОГОН, НОМЕР_ЦИКЛА):ЦИКЛ:ЗНАЧЕНИЯ, где значения -
+    словарь ПЕРЕМЕННАЯ:ПОСЛЕДНЕЕ_ЗНАЧЕНИЕ_В_ЦИКЛЕ
+    """
+    run = 0
+    cycle = None
+    number = None
+    values = {}
+    for line in get_lines(input_data):
+        if line[CYCLE_INDEX] != cycle:
+            if cycle is not None:
+                yield (run, number), cycle, values
+            cycle = line[CYCLE_INDEX]
+            new_number = to_cycle(cycle)
+            if number is not None and new_number < number:
+                run += 1
+            number = new_number
+            values = {}
+        key, value = get_line_value(line)
+        values[key] = value
+    if cycle is not None:
+        yield (run, number), cycle, values
+
+
+def update_state(state, state_hash, values):
+    """
+    Функция применения значений цикла к состоянию.
+    Возвращает новый хэш состояния
+    """
+    for key, value in values.items():
+        old_value = state.get(key)
+        if old_value == value:
+            continue
+        if old_value is not None:
+            state_hash -= hash((key, old_value))
+        state_hash = (state_hash + hash((key, value))) & HASH_MASK
+        state[key] = value
+    return state_hash
+
+
+def find_divergence(cycles, other_cycles):
+    """
+    Функция поиска первого цикла, на конец которого
+    состояния станции различаются. Принимает
+    генераторы iter_cycle_values двух логов.
+    Возвращает номер цикла и список различий,
+    для совпадающих логов - (None, [])
+    """
+    state, other_state = {}, {}
+    state_hash = other_hash = 0
+    item, other_item = next(cycles, None), next(other_cycles, None)
+    while item is not None or other_item is not None:
+        # Цикл, отсутствующий в одном из логов, не
+        # изменял в нём состояния станции
+        if other_item is None or (item is not None
+                                  and item[0] <= other_item[0]):
+            order, cycle, values = item
+        else:
+            order, cycle, values = other_item
+        changed = set()
+        if item is not None and item[0] == order:
+            state_hash = update_state(state, state_hash, item[2])
+            changed.update(item[2])
+            item = next(cycles, None)
+        if other_item is not None and other_item[0] == order:
+            other_hash = update_state(other_state, other_hash, other_item[2])
+            changed.update(other_item[2])
+            other_item = next(other_cycles, None)
+        if state_hash != other_hash:
+            return cycle, compare_states(
+                {x: state.get(x) for x in changed},
+                {x: other_state.get(x) for x in changed})
+    return None, []
+
+
+def compare_states(state, other_state):
+    """
+    Функция поэлементного сравнения состояний.
+    Возвращает список (ПЕРЕМЕННАЯ, ЗНАЧЕНИЕ, ДРУГОЕ_ЗНАЧЕНИЕ),
+    отсутствующее значение - None
+    """
+    differences = []
+    for key in sorted(state.keys() | other_state.keys()):
+        value, other_value = state.get(key), other_state.get(key)
+        if value != other_value:
+            differences.append((key, value, other_value))
+    return differences
+
+
+def diff_log_files(file_path, other_path):
+    """
+    Функция поиска первого расхождения состояний
+    двух лог файлов. Возвращает номер цикла и список
+    различий, для совпадающих логов - (None, [])
+    """
+    with open_log(file_path, errors='replace') as log_data, \
+            open_log(other_path, errors='replace') as other_data:
+        return find_divergence(iter_cycle_values(log_data),
+                               iter_cycle_values(other_data))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find the first cycle where two logic logs diverge')
+    parser.add_argument('reference', help='reference log file')
+    parser.add_argument('log', help='log file to compare')
+    args = parser.parse_args()
+    cycle, differences = diff_log_files(args.reference, args.log)
+    if cycle is None:
+        print('logs are identical')
+        return
+    print(f'first difference at cycle {cycle}')
+    for (site, obj_name, var_name), value, other_value in differences:
+        print(f'{site} {obj_name} {var_name}: {value} -> {other_value}')
+
+
+if __name__ == '__main__':
+    main()
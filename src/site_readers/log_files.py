@@ -0,0 +1,88 @@
+# =========================================
+# ==_______________Log_files_____________==
+# =========================================
+"""
+Открытие лог файлов, в том числе сжатых.
+
+Сжатый файл определяется по первым байтам и
+распаковывается по мере чтения, без временной
+распакованной копии на диске. Форматы gzip, xz и
+bz2 поддерживаются стандартной библиотекой, для
+zstd нужен модуль compression.zstd (Python 3.14)
+или пакет zstandard.
+
+Лог файлы читаются в кодировке LOG_ENCODING
+независимо от настроек системы, модули, читающие
+байты файла, декодируют их так же.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+# Пары ПЕРВЫЕ_БАЙТЫ:ФОРМАТ сжатых файлов
+COMPRESSIONS = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'BZh', 'bz2'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+)
+MAGIC_SIZE = max(len(x[0]) for x in COMPRESSIONS)
+# Кодировка лог файлов, как и ответов имитатора
+LOG_ENCODING = 'utf-8'
+
+
+def get_compression(file_path):
+    """
+    Функция определения формата сжатия файла,
+    для несжатого файла возвращается None
+    """
+    with open(file_path, 'rb') as file_data:
+        magic = file_data.read(MAGIC_SIZE)
+    for prefix, compression in COMPRESSIONS:
+        if magic.startswith(prefix):
+            return compression
+    return None
+
+
+def open_compressed(file_path, compression):
+    """
+    Функция открытия потока распаковки
+    сжатого файла в двоичном режиме
+    """
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rb')
+    if compression == 'xz':
+        return lzma.open(file_path, 'rb')
+    if compression == 'bz2':
+        return bz2.open(file_path, 'rb')
+    if zstd is None:
+        raise ImportError('zstandard package is required to read {}'.format(
+            file_path))
+    return zstd.open(file_path, 'rb')
+
+
+def open_log(file_path, mode='r', errors=None):
+    """
+    Функция открытия лог файла на чтение в текстовом
+    ('r') в кодировке LOG_ENCODING или двоичном ('rb')
+    режиме. Сжатый файл распаковывается по мере чтения
+    """
+    compression = get_compression(file_path)
+    if compression is None:
+        if 'b' in mode:
+            return open(file_path, 'rb')
+        return open(file_path, encoding=LOG_ENCODING, errors=errors)
+    stream = open_compressed(file_path, compression)
+    if 'b' in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding=LOG_ENCODING, errors=errors)
@@ -0,0 +1,292 @@
+# =========================================
+# ==_______________Log_index_____________==
+# =========================================
+"""
+Индекс циклов пересчёта лог файла.
+
+Индекс строится одним проходом по отображённому
+в память файлу (сжатый файл читается потоком
+распаковки) и сохраняется рядом с ним в файле
+с суффиксом INDEX_SUFFIX. Файл индекса содержит:
+    заголовок - версию формата, размер и время
+        изменения лог файла;
+    контрольные точки - полное состояние переменных
+        вида СТАНЦИЯ:ОБЪЕКТ:ПЕРЕМЕННАЯ перед каждым
+        CHECKPOINT_INTERVAL циклом;
+    индекс - номера циклов, смещения их первых строк,
+        размер распакованных данных лог файла и
+        смещения контрольных точек в файле индекса;
+    смещение индекса - 8 байт в конце файла.
+Контрольные точки читаются только при переходе,
+по этому размер индекса в памяти не зависит от
+количества переменных.
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import pickle
+import struct
+from array import array
+
+from site_readers.log_files import LOG_ENCODING
+from site_readers.log_files import get_compression
+from site_readers.log_files import open_log
+from site_readers.log_reader import CYCLE_INDEX
+from site_readers.log_reader import add_line_data
+from site_readers.log_reader import get_lines
+from site_readers.tokenizer import split_log_line
+
+INDEX_SUFFIX = '.idx'
+# Версия формата индекса, увеличивается при
+# изменении состава или вида сохраняемых данных
+INDEX_VERSION = 2
+# Количество циклов между контрольными точками
+CHECKPOINT_INTERVAL = 200
+TRAILER = struct.Struct('<Q')
+
+
+def get_index_path(log_path):
+    """
+    Функция получения пути файла индекса
+    """
+    return log_path + INDEX_SUFFIX
+
+
+def get_log_stamp(log_path):
+    """
+    Функция получения отметки лог файла.
+    Хэш содержимого не считается, так как лог
+    файлы могут занимать несколько гигабайт
+    """
+    stat = os.stat(log_path)
+    return {'version': INDEX_VERSION,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns, }
+
+
+def scan_lines(log_map):
+    """
+    Функция генератор строк с информацией о
+    переменных в отображённом в память файле.
+    Возвращает пары СМЕЩЕНИЕ_СТРОКИ:СЛОВА_СТРОКИ
+    """
+    find = log_map.find
+    rfind = log_map.rfind
+    size = len(log_map)
+    position = find(b'!')
+    while position != -1:
+        # Строки без восклицательного знака
+        # пропускаются без декодирования
+        start = rfind(b'\n', 0, position) + 1
+        end = find(b'\n', position)
+        if end == -1:
+            end = size
+        line = log_map[start:end].decode(LOG_ENCODING, 'replace')
+        match = split_log_line(line)
+        if match and match[0] == '!' and 'P' not in match:
+            yield start, match
+        position = find(b'!', end)
+
+
+def map_lines(log_data):
+    """
+    Функция генератор строк с информацией о
+    переменных несжатого файла через его
+    отображение в память
+    """
+    if not os.fstat(log_data.fileno()).st_size:
+        return
+    with mmap.mmap(log_data.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+        yield from scan_lines(log_map)
+
+
+def scan_stream(log_data):
+    """
+    Функция генератор строк с информацией о
+    переменных из потока распаковки сжатого файла.
+    Смещения строк считаются в распакованных данных
+    """
+    offset = 0
+    for raw_line in log_data:
+        if b'!' in raw_line:
+            match = split_log_line(raw_line.decode(LOG_ENCODING, 'replace'))
+            if match and match[0] == '!' and 'P' not in match:
+                yield offset, match
+        offset += len(raw_line)
+
+
+class LogIndex:
+    """
+    Класс индекса циклов лог файла для перехода
+    к состоянию переменных на любом цикле
+    """
+
+    def __init__(self, log_path, cycles, offsets, end, checkpoints):
+        self.log_path = log_path
+        # Номера циклов в порядке следования в файле
+        self.cycles = cycles
+        # Смещения первых строк циклов в лог файле
+        self.offsets = offsets
+        # Размер распакованных данных лог файла
+        self.end = end
+        # Пары ПОЗИЦИЯ_ЦИКЛА:СМЕЩЕНИЕ_В_ФАЙЛЕ_ИНДЕКСА
+        self.checkpoints = checkpoints
+        self._positions = None
+
+    @classmethod
+    def open(cls, log_path, progress=None):
+        """
+        Метод получения индекса лог файла.
+        Устаревший или отсутствующий индекс строится
+        заново, ход построения передаётся функции
+        progress (см. build)
+        """
+        index_path = get_index_path(log_path)
+        try:
+            return cls.load(log_path, index_path)
+        except (OSError, EOFError, ValueError, KeyError,
+                pickle.UnpicklingError) as error:
+            logging.info('log index %s rebuilt: %s', index_path, error)
+        try:
+            return cls.build(log_path, index_path, progress)
+        except OSError as error:
+            # Если каталог лог файла недоступен для записи,
+            # индекс строится без контрольных точек
+            logging.warning('log index %s not saved: %s', index_path, error)
+            return cls.build(log_path, os.devnull, progress)
+
+    @classmethod
+    def load(cls, log_path, index_path):
+        """
+        Метод чтения индекса из файла
+        """
+        with open(index_path, 'rb') as index_data:
+            if pickle.load(index_data) != get_log_stamp(log_path):
+                raise ValueError('log file changed')
+            index_data.seek(-TRAILER.size, os.SEEK_END)
+            index_data.seek(TRAILER.unpack(index_data.read(TRAILER.size))[0])
+            data = pickle.load(index_data)
+        return cls(log_path, data['cycles'], data['offsets'], data['end'],
+                   data['checkpoints'])
+
+    @classmethod
+    def build(cls, log_path, index_path, progress=None):
+        """
+        Метод построения индекса одним проходом
+        по лог файлу с записью в файл индекса.
+        На каждой контрольной точке вызывается функция
+        progress вида ФУНКЦИЯ(СМЕЩЕНИЕ, РАЗМЕР_ФАЙЛА),
+        для сжатого файла размер равен None
+        """
+        cycles = []
+        offsets = array('q')
+        checkpoints = []
+        # Состояние переменных на текущий цикл,
+        # значения переменных в нём не изменяются,
+        # а заменяются, по этому контрольная точка
+        # сохраняется без копирования
+        state = {}
+        temp_path = index_path + '.tmp'
+        if index_path == os.devnull:
+            temp_path = index_path
+        compression = get_compression(log_path)
+        size = None if compression else os.path.getsize(log_path)
+        with open_log(log_path, 'rb') as log_data, \
+                open(temp_path, 'wb') as index_data:
+            pickle.dump(get_log_stamp(log_path), index_data,
+                        pickle.HIGHEST_PROTOCOL)
+            if compression is None:
+                lines = map_lines(log_data)
+            else:
+                lines = scan_stream(log_data)
+            for offset, line in lines:
+                if cycles and line[CYCLE_INDEX] == cycles[-1]:
+                    add_line_data(line, state)
+                    continue
+                # Контрольная точка сохраняет состояние
+                # перед началом очередного цикла
+                if cycles and not len(cycles) % CHECKPOINT_INTERVAL:
+                    checkpoints.append((len(cycles), index_data.tell()))
+                    pickle.dump(state, index_data, pickle.HIGHEST_PROTOCOL)
+                    if progress:
+                        progress(offset, size)
+                cycles.append(line[CYCLE_INDEX])
+                offsets.append(offset)
+                add_line_data(line, state)
+            if compression is None:
+                end = os.fstat(log_data.fileno()).st_size
+            else:
+                end = log_data.tell()
+            if index_path == os.devnull:
+                checkpoints = []
+            index_offset = index_data.tell()
+            pickle.dump({'cycles': cycles,
+                         'offsets': offsets,
+                         'end': end,
+                         'checkpoints': checkpoints, },
+                        index_data, pickle.HIGHEST_PROTOCOL)
+            index_data.write(TRAILER.pack(index_offset))
+        if temp_path != index_path:
+            os.replace(temp_path, index_path)
+        return cls(log_path, cycles, offsets, end, checkpoints)
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def __contains__(self, cycle):
+        return cycle in self.get_positions()
+
+    def get_positions(self):
+        """
+        Метод получения словаря ЦИКЛ:ПОЗИЦИЯ,
+        строится при первом обращении
+        """
+        if self._positions is None:
+            self._positions = {x: i for i, x in enumerate(self.cycles)}
+        return self._positions
+
+    def get_next_offset(self, position):
+        """
+        Метод получения смещения начала цикла,
+        следующего за заданным. Для последнего
+        цикла возвращается размер лог файла
+        """
+        if position + 1 < len(self.offsets):
+            return self.offsets[position + 1]
+        return self.end
+
+    def load_checkpoint(self, position):
+        """
+        Метод получения ближайшей к циклу контрольной
+        точки. Возвращает пару ПОЗИЦИЯ_ТОЧКИ:СОСТОЯНИЕ
+        """
+        index = bisect.bisect_right(self.checkpoints, (position, float('inf')))
+        if not index:
+            return 0, {}
+        checkpoint_position, offset = self.checkpoints[index - 1]
+        with open(get_index_path(self.log_path), 'rb') as index_data:
+            index_data.seek(offset)
+            return checkpoint_position, pickle.load(index_data)
+
+    def get_state(self, cycle):
+        """
+        Метод получения состояния переменных на конец
+        цикла: состояние ближайшей контрольной точки
+        и изменения циклов после неё.
+        Возвращает пару СОСТОЯНИЕ:СМЕЩЕНИЕ_СЛЕДУЮЩЕГО_ЦИКЛА
+        """
+        position = self.get_positions()[cycle]
+        start_position, state = self.load_checkpoint(position)
+        start = self.offsets[start_position]
+        end = self.get_next_offset(position)
+        # В сжатом файле переход к смещению выполняется
+        # распаковкой данных от начала файла
+        with open_log(self.log_path, 'rb') as log_data:
+            log_data.seek(start)
+            lines = log_data.read(end - start).decode(LOG_ENCODING,
+                                                      'replace')
+        for line in get_lines(lines.splitlines()):
+            add_line_data(line, state)
+        return state, end
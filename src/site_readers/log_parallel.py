@@ -0,0 +1,135 @@
+# =========================================
+# ==_____________Log_parallel_____________==
+# =========================================
+"""
+Параллельный разбор больших лог файлов.
+
+Файл делится на части по границам строк, каждая
+часть разбирается в отдельном процессе в последние
+значения переменных части, результаты частей
+объединяются в порядке их следования в файле.
+Значение переменной из более поздней части заменяет
+более раннее, по этому результат совпадает с
+результатом log_data_parser для файла целиком.
+Сжатый файл не допускает чтения с произвольного
+места без распаковки от начала, по этому он
+разбирается одним процессом по мере распаковки.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from site_readers.log_files import LOG_ENCODING
+from site_readers.log_files import get_compression
+from site_readers.log_files import open_log
+from site_readers.log_reader import get_lines
+from site_readers.log_reader import log_data_parser
+
+# Размер части файла для одного процесса в байтах
+CHUNK_SIZE = 16 * 2 ** 20
+
+
+def split_chunks(file_path, chunk_size=CHUNK_SIZE):
+    """
+    Функция разбиения файла на части по границам
+    строк. Возвращает список пар НАЧАЛО:КОНЕЦ
+    """
+    size = os.path.getsize(file_path)
+    chunks = []
+    start = 0
+    with open(file_path, 'rb') as log_data:
+        while start < size:
+            # Конец части переносится на конец строки,
+            # в которую попала граница
+            log_data.seek(min(start + chunk_size, size))
+            log_data.readline()
+            end = min(log_data.tell(), size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def parse_chunk(file_path, start, end):
+    """
+    Функция разбора части лог файла.
+    Возвращает последние значения переменных части
+    вида СТАНЦИЯ:ОБЪЕКТ:ПЕРЕМЕННАЯ:(ЗНАЧЕНИЕ,
+    ПРЕДЫДУЩЕЕ_ЗНАЧЕНИЕ, ПРИЗНАК_КАНАЛА): кортежи
+    передаются из процесса быстрее словарей
+    значений log_data_parser
+    """
+    with open(file_path, 'rb') as log_data:
+        log_data.seek(start)
+        text = log_data.read(end - start).decode(LOG_ENCODING, 'replace')
+    values = {}
+    # Разбор строк совпадает с add_line_data
+    for line in get_lines(text.splitlines()):
+        obj_values = values.setdefault(line[1], {}).setdefault(line[4], {})
+        if line[-1] == 'channel':
+            obj_values[f'{line[5]}({line[6]})'] = (line[10], line[11], True)
+        else:
+            obj_values[line[5]] = (line[6], line[7], False)
+    return values
+
+
+def merge_values(out_values, chunk_values):
+    """
+    Функция добавления значений части файла
+    к значениям предыдущих частей
+    """
+    for site, objects in chunk_values.items():
+        site_values = out_values.setdefault(site, {})
+        for obj_name, variables in objects.items():
+            if obj_name in site_values:
+                site_values[obj_name].update(variables)
+            else:
+                site_values[obj_name] = variables
+    return out_values
+
+
+def build_log_data(values):
+    """
+    Функция преобразования значений переменных
+    в данные вида log_data_parser
+    """
+    out_data = {}
+    for site, objects in values.items():
+        site_data = out_data[site] = {}
+        for obj_name, variables in objects.items():
+            obj_data = site_data[obj_name] = {}
+            for var_name, (value, old_value, channel) in variables.items():
+                if channel:
+                    obj_data[var_name] = {'value_out': value,
+                                          'old_value_out': old_value}
+                else:
+                    obj_data[var_name] = {'value': value,
+                                          'old_value': old_value}
+    return out_data
+
+
+def parallel_log_parser(file_path, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Функция разбора лог файла в нескольких процессах.
+    Результат имеет тот же вид, что и результат
+    log_data_parser. По умолчанию количество процессов
+    равно количеству процессоров
+    """
+    if get_compression(file_path) is not None:
+        with open_log(file_path, errors='replace') as log_data:
+            return log_data_parser(log_data)
+    workers = workers or os.cpu_count() or 1
+    chunks = split_chunks(file_path, chunk_size)
+    values = {}
+    if workers == 1 or len(chunks) < 2:
+        for start, end in chunks:
+            merge_values(values, parse_chunk(file_path, start, end))
+        return build_log_data(values)
+    count = len(chunks)
+    with ProcessPoolExecutor(min(workers, count)) as executor:
+        # Результаты возвращаются в порядке частей
+        results = executor.map(parse_chunk, [file_path] * count,
+                               [x[0] for x in chunks],
+                               [x[1] for x in chunks])
+        for chunk_values in results:
+            merge_values(values, chunk_values)
+    return build_log_data(values)
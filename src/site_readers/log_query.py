@@ -0,0 +1,372 @@
+# =========================================
+# ==_______________Log_query_____________==
+# =========================================
+"""
+Поиск циклов лог файла по условию на значения
+переменных объектов.
+
+Грамматика условия:
+
+    expr       := and {OR and}
+    and        := not {AND not}
+    not        := NOT not | primary
+    primary    := '(' expr ')' | comparison
+    comparison := [ТИП] ПЕРЕМЕННАЯ OP ЗНАЧЕНИЕ
+    OP         := '==' | '=' | '!=' | '<' | '>' | '<=' | '>='
+
+ПЕРЕМЕННАЯ записывается как ОБЪЕКТ.ПЕРЕМЕННАЯ или
+СТАНЦИЯ.ОБЪЕКТ.ПЕРЕМЕННАЯ, канал - с номером вывода:
+S1.CH(2). Тип объекта перед переменной необязателен,
+например SECTION S12.OCC==1 and SIGNAL A.ASPECT!=0.
+
+Для поиска лог файл один раз читается в индекс
+изменений: для каждой переменной хранятся циклы её
+изменений и новые значения. Каждое сравнение
+превращается в список интервалов циклов, на которых
+оно выполняется, по изменениям только своей
+переменной, логические операции выполняются над
+интервалами. Интервал - пара НАЧАЛО:КОНЕЦ, конец
+не включается. До первого изменения значение
+переменной неизвестно и сравнение не выполняется.
+
+Запуск из каталога src:
+    python -m site_readers.log_query ЛОГ_ФАЙЛ УСЛОВИЕ
+"""
+
+import argparse
+import re
+from array import array
+
+from site_readers.log_files import open_log
+from site_readers.log_reader import CYCLE_INDEX
+from site_readers.log_reader import get_line_value
+from site_readers.log_reader import get_lines
+from site_readers.log_reader import to_cycle
+
+TOKEN_PATTERN = re.compile(
+    r'\s*(?:(==|!=|<=|>=|=|<|>)|([\w.]+(?:\(\d+\))?)|([()]))')
+KEYWORDS = ('AND', 'OR', 'NOT')
+COMPARE_FUNCTIONS = {
+    '==': lambda x, y: x == y,
+    '=': lambda x, y: x == y,
+    '!=': lambda x, y: x != y,
+    '<': lambda x, y: x < y,
+    '>': lambda x, y: x > y,
+    '<=': lambda x, y: x <= y,
+    '>=': lambda x, y: x >= y,
+}
+
+
+class QueryError(ValueError):
+    """
+    Ошибка разбора или выполнения условия
+    """
+
+
+def tokenize(text):
+    """
+    Функция разбиения условия на лексемы.
+    Лексема - пара ВИД:ЗНАЧЕНИЕ, где вид
+    'op', 'name', 'kw' или 'paren'
+    """
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if not match:
+            raise QueryError('unexpected symbol {!r} in {!r}'.format(
+                text[position:].strip()[:1], text))
+        operation, name, paren = match.groups()
+        if operation is not None:
+            tokens.append(('op', operation))
+        elif paren is not None:
+            tokens.append(('paren', paren))
+        elif name.upper() in KEYWORDS:
+            tokens.append(('kw', name.upper()))
+        else:
+            tokens.append(('name', name))
+        position = match.end()
+    return tokens
+
+
+class QueryParser:
+    """
+    Класс разбора условия методом рекурсивного
+    спуска. Дерево условия хранится кортежами:
+        ('cmp', ПЕРЕМЕННАЯ, ОПЕРАЦИЯ, ЗНАЧЕНИЕ),
+        ('not', X), ('and', X, Y), ('or', X, Y)
+    """
+
+    def __init__(self, text):
+        self._text = text
+        self._tokens = tokenize(text)
+        self._position = 0
+
+    def error(self, message):
+        return QueryError('{} in {!r}'.format(message, self._text))
+
+    def peek(self, offset=0):
+        if self._position + offset < len(self._tokens):
+            return self._tokens[self._position + offset]
+        return None, None
+
+    def take(self):
+        token = self.peek()
+        if token[0] is None:
+            raise self.error('unexpected end')
+        self._position += 1
+        return token
+
+    def accept(self, kind, value):
+        if self.peek() == (kind, value):
+            self._position += 1
+            return True
+        return False
+
+    def query(self):
+        expr = self.or_expr()
+        if self.peek()[0] is not None:
+            raise self.error('unexpected {!r}'.format(self.peek()[1]))
+        return expr
+
+    def or_expr(self):
+        left = self.and_expr()
+        while self.accept('kw', 'OR'):
+            left = 'or', left, self.and_expr()
+        return left
+
+    def and_expr(self):
+        left = self.not_expr()
+        while self.accept('kw', 'AND'):
+            left = 'and', left, self.not_expr()
+        return left
+
+    def not_expr(self):
+        if self.accept('kw', 'NOT'):
+            return 'not', self.not_expr()
+        return self.primary()
+
+    def primary(self):
+        if self.accept('paren', '('):
+            expr = self.or_expr()
+            if not self.accept('paren', ')'):
+                raise self.error('")" expected')
+            return expr
+        return self.comparison()
+
+    def comparison(self):
+        # Тип объекта перед переменной пропускается
+        kind, value = self.peek()
+        if kind == 'name' and '.' not in value and \
+                self.peek(1)[0] == 'name':
+            self._position += 1
+        kind, variable = self.take()
+        if kind != 'name' or '.' not in variable:
+            raise self.error('variable OBJECT.NAME expected')
+        kind, operation = self.take()
+        if kind != 'op':
+            raise self.error('comparison expected after {}'.format(variable))
+        kind, value = self.take()
+        if kind != 'name':
+            raise self.error('value expected after {}'.format(operation))
+        return 'cmp', variable, operation, value
+
+
+def parse_query(text):
+    """
+    Функция разбора условия в дерево
+    """
+    return QueryParser(text).query()
+
+
+class ChangeIndex:
+    """
+    Класс индекса изменений переменных лог файла:
+    для каждой переменной (СТАНЦИЯ, ОБЪЕКТ, ПЕРЕМЕННАЯ)
+    хранятся циклы изменений и новые значения
+    """
+
+    def __init__(self):
+        self.changes = {}
+        # Пары ОБЪЕКТ.ПЕРЕМЕННАЯ:ПЕРЕМЕННЫЕ
+        # для поиска переменной без станции
+        self._names = {}
+        self.first_cycle = 0
+        self.last_cycle = 0
+
+    @classmethod
+    def from_lines(cls, input_data):
+        """
+        Метод построения индекса по строкам лог файла
+        """
+        index = cls()
+        changes = index.changes
+        first_cycle = last_cycle = None
+        for line in get_lines(input_data):
+            cycle = to_cycle(line[CYCLE_INDEX])
+            if first_cycle is None:
+                first_cycle = last_cycle = cycle
+            elif cycle > last_cycle:
+                last_cycle = cycle
+            elif cycle < first_cycle:
+                first_cycle = cycle
+            key, value = get_line_value(line)
+            if key not in changes:
+                changes[key] = (array('q'), [])
+                index._names.setdefault('.'.join(key[1:]), []).append(key)
+            changes[key][0].append(cycle)
+            changes[key][1].append(value)
+        if first_cycle is not None:
+            index.first_cycle = first_cycle
+            index.last_cycle = last_cycle
+        return index
+
+    @classmethod
+    def from_file(cls, file_path):
+        """
+        Метод построения индекса лог файла
+        """
+        with open_log(file_path, errors='replace') as log_data:
+            return cls.from_lines(log_data)
+
+    def get_key(self, variable):
+        """
+        Метод получения переменной по записи
+        ОБЪЕКТ.ПЕРЕМЕННАЯ или СТАНЦИЯ.ОБЪЕКТ.ПЕРЕМЕННАЯ
+        """
+        parts = variable.split('.')
+        if len(parts) == 3:
+            return tuple(parts)
+        keys = self._names.get(variable, [])
+        if len(keys) > 1:
+            raise QueryError('{} is ambiguous, use SITE.{}'.format(
+                variable, variable))
+        # Переменная без изменений в логе
+        # не выполняет ни одного сравнения
+        return keys[0] if keys else None
+
+    def compare_intervals(self, variable, operation, value):
+        """
+        Метод получения интервалов циклов,
+        на которых выполняется сравнение
+        """
+        key = self.get_key(variable)
+        if key not in self.changes:
+            return []
+        cycles, values = self.changes[key]
+        compare = COMPARE_FUNCTIONS[operation]
+        # Числовые значения сравниваются как числа
+        numeric = value.lstrip('-').isdigit()
+        if numeric:
+            value = int(value)
+        intervals = []
+        end_cycle = self.last_cycle + 1
+        for number, cycle in enumerate(cycles):
+            current = values[number]
+            if numeric:
+                if not current.lstrip('-').isdigit():
+                    continue
+                current = int(current)
+            if not compare(current, value):
+                continue
+            # Значение действует до следующего изменения
+            end = cycles[number + 1] if number + 1 < len(cycles) else end_cycle
+            if end == cycle:
+                continue
+            if intervals and intervals[-1][1] == cycle:
+                intervals[-1] = (intervals[-1][0], end)
+            else:
+                intervals.append((cycle, end))
+        return intervals
+
+    def evaluate(self, node):
+        """
+        Метод получения интервалов циклов,
+        на которых выполняется условие
+        """
+        kind = node[0]
+        if kind == 'cmp':
+            return self.compare_intervals(*node[1:])
+        if kind == 'not':
+            return complement(self.evaluate(node[1]), self.first_cycle,
+                              self.last_cycle + 1)
+        if kind == 'and':
+            return intersect(self.evaluate(node[1]), self.evaluate(node[2]))
+        return union(self.evaluate(node[1]), self.evaluate(node[2]))
+
+    def query(self, text):
+        """
+        Метод поиска циклов по условию. Возвращает
+        список интервалов (ПЕРВЫЙ_ЦИКЛ, ПОСЛЕДНИЙ_ЦИКЛ)
+        """
+        return [(x, y - 1) for x, y in self.evaluate(parse_query(text))]
+
+
+def intersect(intervals, other):
+    """
+    Функция пересечения списков интервалов
+    """
+    result = []
+    i = j = 0
+    while i < len(intervals) and j < len(other):
+        start = max(intervals[i][0], other[j][0])
+        end = min(intervals[i][1], other[j][1])
+        if start < end:
+            result.append((start, end))
+        # Сдвигаемся по списку, интервал которого
+        # заканчивается раньше
+        if intervals[i][1] < other[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def union(intervals, other):
+    """
+    Функция объединения списков интервалов
+    """
+    result = []
+    for start, end in sorted(intervals + other):
+        if result and start <= result[-1][1]:
+            if end > result[-1][1]:
+                result[-1] = (result[-1][0], end)
+        else:
+            result.append((start, end))
+    return result
+
+
+def complement(intervals, low, high):
+    """
+    Функция получения интервалов, дополняющих
+    список интервалов до интервала [low, high)
+    """
+    result = []
+    start = low
+    for begin, end in intervals:
+        if begin > start:
+            result.append((start, begin))
+        start = max(start, end)
+    if start < high:
+        result.append((start, high))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Find log cycles where a condition holds')
+    parser.add_argument('log', help='log file')
+    parser.add_argument('query', help='condition, e.g. "S12.OCC==1"')
+    args = parser.parse_args()
+    index = ChangeIndex.from_file(args.log)
+    try:
+        ranges = index.query(args.query)
+    except QueryError as error:
+        parser.error(str(error))
+    for first, last in ranges:
+        print(first if first == last else f'{first}-{last}')
+
+
+if __name__ == '__main__':
+    main()
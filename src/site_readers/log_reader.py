@@ -1,7 +1,12 @@
 import re
 
+from site_readers.tokenizer import split_log_line
+from site_readers.tokenizer import split_sim_line
+
 WORD_LOG_PATTERN = r'[!\w]+'
 WORD_SIM_PATTERN = r'[\w(),.]+'
+# Положение номера цикла пересчёта в строке лог файла
+CYCLE_INDEX = 2
 
 
 def object_variable_parser(lines, obj_name, pattern=WORD_SIM_PATTERN):
@@ -14,12 +19,16 @@ def object_variable_parser(lines, obj_name, pattern=WORD_SIM_PATTERN):
     for line in lines:
         # Перебираем все полученные строки
         # разбиваем на пары переменная - значение
-        match = re.findall(pattern, line)
+        if pattern == WORD_SIM_PATTERN:
+            match = split_sim_line(line)
+        else:
+            match = re.findall(pattern, line)
         for variable, value in zip(match[::2], match[1::2]):
             # Проверяем наличие названия нового объекта
             # в значении переменной
             if '.' in variable:
                 obj_name, variable = variable.split('.')
+                out_data.setdefault(obj_name, {})
             if ',' in value:
                 # Для значений каналов передачи данных
                 # разделяем значения на входящее и
@@ -44,12 +53,69 @@ def get_lines(input_data, pattern=WORD_LOG_PATTERN):
     # предварительными пересчётами
     # возвращаем её
 
+    split_line = split_log_line
+    if pattern != WORD_LOG_PATTERN:
+        split_line = re.compile(pattern).findall
+
     for line in input_data:
-        match = re.findall(pattern, line)
+        # Строки без восклицательного знака
+        # не содержат информации о переменных
+        if '!' not in line:
+            continue
+        match = split_line(line)
         if match and match[0] == '!' and 'P' not in match:
             yield match
 
 
+def to_cycle(value):
+    """
+    Функция приведения номера цикла к целому числу
+    """
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def get_line_value(line):
+    """
+    Функция получения переменной строки лог файла
+    в виде (СТАНЦИЯ, ОБЪЕКТ, ПЕРЕМЕННАЯ) и её нового
+    значения. Для канала возвращается исходящее значение
+    """
+    if line[-1] == 'channel':
+        return (line[1], line[4], f'{line[5]}({line[6]})'), line[10]
+    return (line[1], line[4], line[5]), line[6]
+
+
+def add_line_data(line, out_data):
+    """
+    Функция добавления данных строки лог файла
+    в хранилище вида СТАНЦИЯ:ОБЪЕКТ:ПЕРЕМЕННАЯ
+    """
+    # Если названия станции нет в хранилище,
+    # то добавляем его
+    if line[1] not in out_data:
+        out_data[line[1]] = {}
+    # Если переменной нет на станции,
+    # то добавляем её
+    if line[4] not in out_data[line[1]]:
+        out_data[line[1]][line[4]] = {}
+    # Если строка содержит информацию о
+    # канале передачи данных, то обрабатываем
+    # её отдельно
+    if line[-1] == 'channel':
+        # Каналов передачи может быть несколько,
+        # определяем нужный
+        channel_name = f'{line[5]}({line[6]})'
+
+        value = {'value_out': line[10], 'old_value_out': line[11]}
+        out_data[line[1]][line[4]][channel_name] = value
+    else:
+        value = {'value': line[6], 'old_value': line[7]}
+        out_data[line[1]][line[4]][line[5]] = value
+
+
 def log_data_parser(input_data):
     """
     Функция анализа лог файла
@@ -59,26 +125,5 @@ def log_data_parser(input_data):
     for line in get_lines(input_data):
         if not line:
             continue
-
-        # Если названия станции нет в хранилище,
-        # то добавляем его
-        if line[1] not in out_data:
-            out_data[line[1]] = {}
-        # Если переменной нет на станции,
-        # то добавляем её
-        if line[4] not in out_data[line[1]]:
-            out_data[line[1]][line[4]] = {}
-        # Если строка содержит информацию о
-        # канале передачи данных, то обрабатываем
-        # её отдельно
-        if line[-1] == 'channel':
-            # Каналов передачи может быть несколько,
-            # определяем нужный
-            channel_name = f'{line[5]}({line[6]})'
-
-            value = {'value_out': line[10], 'old_value_out': line[11]}
-            out_data[line[1]][line[4]][channel_name] = value
-        else:
-            value = {'value': line[6], 'old_value': line[7]}
-            out_data[line[1]][line[4]][line[5]] = value
+        add_line_data(line, out_data)
     return out_data
@@ -0,0 +1,134 @@
+# =========================================
+# ==______________Log_replay_____________==
+# =========================================
+
+from site_readers.log_files import open_log
+from site_readers.log_index import LogIndex
+from site_readers.log_reader import CYCLE_INDEX
+from site_readers.log_reader import add_line_data
+from site_readers.log_reader import get_lines
+
+
+def iter_cycles(input_data):
+    """
+    Функция генератор пакетов изменений по циклам
+    пересчёта лог файла.
+    Возвращает пары НОМЕР_ЦИКЛА:ПАКЕТ, пакет имеет тот же
+    вид, что и результат log_data_parser, но содержит
+    только изменения одного цикла.
+    В памяти хранится только текущий пакет
+    """
+    cycle = None
+    batch = {}
+    for line in get_lines(input_data):
+        # Строки одного цикла следуют подряд,
+        # смена номера означает начало нового цикла
+        if line[CYCLE_INDEX] != cycle:
+            if batch:
+                yield cycle, batch
+            cycle = line[CYCLE_INDEX]
+            batch = {}
+        add_line_data(line, batch)
+    if batch:
+        yield cycle, batch
+
+
+class LogReplay:
+    """
+    Класс воспроизведения лог файла по циклам.
+    Пакеты изменений читаются из файла по мере
+    запроса, по этому размер лог файла не влияет
+    на потребление памяти
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        # Ошибки кодировки в отдельных строках
+        # не должны прерывать воспроизведение
+        self._file = open_log(file_path, errors='replace')
+        self._cycles = iter_cycles(self._file)
+        # Номер последнего полученного цикла
+        self.cycle = None
+        self.finished = False
+        # Индекс циклов строится при первом переходе
+        self._index = None
+
+    def step(self):
+        """
+        Метод получения пакета изменений следующего
+        цикла. По окончании файла возвращает None
+        """
+        if self.finished:
+            return None
+        try:
+            self.cycle, batch = next(self._cycles)
+        except StopIteration:
+            self.close()
+            return None
+        return batch
+
+    def take(self, count):
+        """
+        Метод генератор не более чем заданного
+        количества пакетов изменений
+        """
+        for _ in range(count):
+            batch = self.step()
+            if batch is None:
+                return
+            yield batch
+
+    def run_to_end(self):
+        """
+        Метод генератор всех оставшихся
+        пакетов изменений
+        """
+        while True:
+            batch = self.step()
+            if batch is None:
+                return
+            yield batch
+
+    @property
+    def indexed(self):
+        return self._index is not None
+
+    def build_index(self, progress=None):
+        """
+        Метод построения индекса циклов до первого
+        перехода. Не использует открытый файл
+        воспроизведения, по этому может вызываться
+        в отдельном потоке
+        """
+        self._index = LogIndex.open(self.file_path, progress)
+
+    def seek(self, cycle):
+        """
+        Метод перехода к заданному циклу.
+        Возвращает полное состояние переменных на
+        конец цикла, следующий шаг возвращает
+        изменения следующего цикла.
+        Состояние содержит только переменные,
+        изменявшиеся до конца цикла
+        """
+        if self._index is None:
+            self.build_index()
+        state, next_offset = self._index.get_state(cycle)
+        # Сжатый файл не поддерживает переход назад,
+        # по этому файл открывается заново
+        self._file.close()
+        self._file = open_log(self.file_path, errors='replace')
+        # Смещение начала строки является допустимой
+        # позицией для файла в текстовом режиме
+        self._file.seek(next_offset)
+        self._cycles = iter_cycles(self._file)
+        self.cycle = cycle
+        self.finished = False
+        return state
+
+    def close(self):
+        """
+        Метод завершения воспроизведения
+        """
+        self.finished = True
+        self._file.close()
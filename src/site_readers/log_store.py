@@ -0,0 +1,228 @@
+# =========================================
+# ==_______________Log_store_____________==
+# =========================================
+"""
+Хранилище истории значений переменных из лог файла.
+
+Каждая переменная вида (СТАНЦИЯ, ОБЪЕКТ, ПЕРЕМЕННАЯ)
+и каждое значение получают целочисленный номер,
+изменения хранятся тремя массивами NumPy одной длины:
+    cycles - номер цикла изменения;
+    var_ids - номер переменной;
+    value_codes - номер нового значения.
+Для каналов сохраняется исходящее значение.
+Изменения дополнительно упорядочиваются по номеру
+переменной, по этому история одной переменной
+является срезом массивов.
+
+NumPy не входит в обязательные зависимости
+программы, без него хранилище недоступно.
+"""
+
+from array import array
+
+from site_readers.log_reader import CYCLE_INDEX
+from site_readers.log_reader import get_line_value
+from site_readers.log_reader import get_lines
+from site_readers.log_reader import to_cycle
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def read_log_store(input_data):
+    """
+    Функция чтения лог файла в хранилище
+    истории значений переменных
+    """
+    if np is None:
+        raise ImportError('numpy is required for the log store')
+    keys = {}
+    values = {}
+    # Изменения накапливаются в компактных массивах
+    # и передаются в NumPy без копирования
+    cycles = array('q')
+    var_ids = array('i')
+    value_codes = array('i')
+    for line in get_lines(input_data):
+        key, value = get_line_value(line)
+        var_id = keys.get(key)
+        if var_id is None:
+            var_id = keys[key] = len(keys)
+        code = values.get(value)
+        if code is None:
+            code = values[value] = len(values)
+        cycles.append(to_cycle(line[CYCLE_INDEX]))
+        var_ids.append(var_id)
+        value_codes.append(code)
+    return LogStore(list(keys), list(values),
+                    np.frombuffer(cycles, dtype=np.int64),
+                    np.frombuffer(var_ids, dtype=np.int32),
+                    np.frombuffer(value_codes, dtype=np.int32))
+
+
+class LogStore:
+    """
+    Класс истории значений переменных
+    с векторными запросами
+    """
+
+    def __init__(self, keys, values, cycles, var_ids, value_codes):
+        # Переменные и значения по их номерам
+        self.keys = keys
+        self.values = values
+        self._key_ids = {x: i for i, x in enumerate(keys)}
+        self._value_codes = {x: i for i, x in enumerate(values)}
+        # Изменения в порядке следования в файле
+        self.cycles = cycles
+        self.var_ids = var_ids
+        self.value_codes = value_codes
+        # Последний цикл лога, значение после
+        # последнего изменения действует до него
+        self.last_cycle = int(cycles.max()) if len(cycles) else 0
+
+        # Упорядочиваем изменения по переменным с
+        # сохранением порядка изменений каждой из них
+        order = np.argsort(var_ids, kind='stable')
+        self._sorted_cycles = cycles[order]
+        self._sorted_codes = value_codes[order]
+        # Количество изменений и начало среза каждой переменной
+        self.counts = np.bincount(var_ids, minlength=len(keys))
+        self._starts = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=self._starts[1:])
+        # Результаты запросов по всем переменным,
+        # вычисляются при первом обращении
+        self._toggles = None
+        self._names = None
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def get_var_id(self, site, obj_name, var_name):
+        """
+        Метод получения номера переменной,
+        для отсутствующей в логе - None
+        """
+        return self._key_ids.get((site, obj_name, var_name))
+
+    def get_value_code(self, value):
+        """
+        Метод получения номера значения,
+        для отсутствующего в логе -1
+        """
+        return self._value_codes.get(str(value), -1)
+
+    def history(self, var_id):
+        """
+        Метод получения истории переменной.
+        Возвращает массивы циклов и номеров значений
+        """
+        start, end = self._starts[var_id], self._starts[var_id + 1]
+        return self._sorted_cycles[start:end], self._sorted_codes[start:end]
+
+    def value_intervals(self, var_id, value):
+        """
+        Метод получения интервалов циклов, на которых
+        переменная имела значение. Возвращает массивы
+        начал и концов (не включая) интервалов
+        """
+        cycles, codes = self.history(var_id)
+        # Значение действует до следующего изменения
+        ends = np.append(cycles[1:], self.last_cycle + 1)
+        mask = codes == self.get_value_code(value)
+        return cycles[mask], ends[mask]
+
+    def cycles_with_value(self, var_id, value):
+        """
+        Метод получения всех циклов,
+        на которых переменная имела значение
+        """
+        starts, ends = self.value_intervals(var_id, value)
+        lengths = ends - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.int64)
+        # Номер цикла внутри интервала - начало
+        # интервала плюс смещение от его начала
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths)
+        return np.repeat(starts, lengths) + offsets
+
+    def dwell_times(self, var_id, value):
+        """
+        Метод получения длительностей нахождения
+        переменной в значении, в циклах
+        """
+        starts, ends = self.value_intervals(var_id, value)
+        return ends - starts
+
+    def value_at(self, var_id, cycle):
+        """
+        Метод получения значения переменной на конец
+        цикла, до первого изменения - None
+        """
+        cycles, codes = self.history(var_id)
+        index = np.searchsorted(cycles, cycle, side='right')
+        if not index:
+            return None
+        return self.values[codes[index - 1]]
+
+    def toggle_counts(self):
+        """
+        Метод получения количества изменений
+        значения каждой переменной: изменения
+        на то же значение не учитываются
+        """
+        if self._toggles is not None:
+            return self._toggles
+        toggles = self._toggles = np.zeros(len(self.keys), dtype=np.int64)
+        present = self.counts > 0
+        if not present.any():
+            return toggles
+        starts = self._starts[:-1][present]
+        toggled = np.ones(len(self), dtype=np.int64)
+        toggled[1:] = self._sorted_codes[1:] != self._sorted_codes[:-1]
+        # Первое изменение переменной сравнивается не
+        # с предыдущей переменной, а с начальным значением
+        toggled[starts] = 1
+        toggles[present] = np.add.reduceat(toggled, starts)
+        toggles.flags.writeable = False
+        return toggles
+
+    def first_changes(self):
+        """
+        Метод получения цикла первого изменения
+        каждой переменной, для переменных без
+        изменений -1
+        """
+        first = np.full(len(self.keys), -1, dtype=np.int64)
+        present = self.counts > 0
+        first[present] = self._sorted_cycles[self._starts[:-1][present]]
+        return first
+
+    def find_variables(self, var_name):
+        """
+        Метод получения номеров переменных
+        с заданным именем у всех объектов
+        """
+        if self._names is None:
+            names = {}
+            for var_id, key in enumerate(self.keys):
+                names.setdefault(key[2], []).append(var_id)
+            self._names = {x: np.array(y, dtype=np.int64)
+                           for x, y in names.items()}
+        return self._names.get(var_name, np.empty(0, dtype=np.int64))
+
+    def unchanged_objects(self, var_name, objects=None):
+        """
+        Метод получения объектов, у которых переменная
+        ни разу не изменила значение. По умолчанию
+        проверяются все объекты из лога
+        """
+        if objects is None:
+            objects = {(x[0], x[1]) for x in self.keys}
+        var_ids = self.find_variables(var_name)
+        changed_ids = var_ids[self.toggle_counts()[var_ids] > 0]
+        changed = {self.keys[x][:2] for x in changed_ids.tolist()}
+        return sorted(x for x in objects if x not in changed)
@@ -3,21 +3,30 @@
 # =========================================
 
 import re
-from copy import deepcopy
+
+from site_readers.tokenizer import get_logic_line_data
 
 WORD_PATTERN = r'[#!\w,\-]+'
 
+# Категории входных и выходных переменных объекта:
+# КАТЕГОРИЯ: (РАЗДЕЛ, НАЧАЛО ПОДТИПА)
+SUB_TYPES = {
+    'STATIC': ('#IN', 'STATIC'),
+    'CHECK': ('#IN', 'CHECK,CHC'),
+    'CTFW': ('#OUT', 'CONTROL,CTFW'),
+    'CTRL': ('#OUT', 'CONTROL,CTRL'),
+    'STAS': ('#OUT', 'STATUS,STAS'),
+}
+
 
 def get_line_data(line):
     """
     Строка разбивается на слова в соответствии с шаблоном
-    и исключаются закомментированные строки
+    и исключаются закомментированные строки.
+    Комментарии обозначаются
+    восклицательным знаком в начале строки
     """
-    match = re.findall(WORD_PATTERN, line)
-    # Комментарии обозначаются
-    # восклицательным знаком в начале строки
-    if match and "!" != match[0][0]:
-        return match
+    return get_logic_line_data(line)
 
 
 def line_iteration(input_data):
@@ -271,14 +280,39 @@ def obj_out_analyse(line, obj_data):
 
 def obj_equ_analyse(line, obj_data):
     """
-    Функция анализа внутренних переменных
-    """
-    # TODO: Добавить разбор переменных
-    #       со сбором информации о
-    #       значении, условиях,
-    #       влиянии на другие переменные
-    #       используемые данные
-    pass
+    Функция сбора уравнений объекта.
+    Принимает исходную строку, так как уравнения
+    содержат знаки операций. Уравнение может занимать
+    несколько строк и заканчивается точкой с запятой,
+    незаконченное уравнение дополняется следующей строкой.
+    Разбор уравнений выполняется в equ_compiler
+    """
+    # Отбрасываем комментарий в конце строки
+    line = line.split('!', 1)[0].strip()
+    if not line:
+        return
+    equations = obj_data['#EQU']
+    if equations and not equations[-1].endswith(';'):
+        line = equations.pop() + ' ' + line
+    for equation in re.findall(r'[^;]+;?', line):
+        equation = equation.strip()
+        if equation:
+            equations.append(equation)
+
+
+def sub_types_index(obj_data):
+    """
+    Функция построения индекса переменных объекта
+    по категориям подтипов в порядке объявления.
+    Списки индекса общие для всех обращений,
+    по этому хранятся кортежами
+    """
+    index = {}
+    for category, (data_type, sub_type) in SUB_TYPES.items():
+        params = obj_data[data_type]
+        index[category] = tuple(
+            x for x in params if params[x]["sub_type"].startswith(sub_type))
+    return index
 
 
 def obj_analyse(input_data, out_data, obj_type):
@@ -295,7 +329,7 @@ def obj_analyse(input_data, out_data, obj_type):
         '#OWN': {},
         '#IN': {},
         '#OUT': {},
-        '#EQU': {},
+        '#EQU': [],
     }
 
     # Сохраняем функции обработчики в
@@ -307,29 +341,42 @@ def obj_analyse(input_data, out_data, obj_type):
         '#OWN': obj_own_analyse,
         '#IN': obj_in_analyse,
         '#OUT': obj_out_analyse,
-        '#EQU': obj_equ_analyse,
     }
 
     sub_section = None
-    for line in input_data:
-        line = get_line_data(line)
-        if line:
-            # Если дошли до конца файла или до
-            # следующего объекта сохраняем информацию
-            # и выходим из функции
-            if line[0] == '#END' or line[0][1:] in out_data['OBJ']:
-                out_data[obj_type[0][1:]] = deepcopy(obj_data)
-                # Возвращаем из функции строку,
-                # так как она может содержать имя
-                # следующего объекта
-                return line
-            # Если встречается знак #,
-            # то изменяем текущую подсекцию
-            if line[0][0] == '#':
-
-                sub_section = line[0]
-                continue
-            analyse_func[sub_section](line, obj_data)
+    for raw_line in input_data:
+        line = get_line_data(raw_line)
+        if not line:
+            # Строка уравнения может не содержать слов,
+            # например закрывающая скобка
+            if sub_section == '#EQU':
+                obj_equ_analyse(raw_line, obj_data)
+            continue
+        # Если дошли до конца файла или до
+        # следующего объекта передаём информацию
+        # в итоговый словарь и выходим из функции.
+        # Структура создаётся заново при каждом вызове,
+        # по этому копировать её не нужно
+        if line[0] == '#END' or (line[0][0] == '#'
+                                 and line[0][1:] in out_data['OBJ']):
+            obj_data['#SUB_TYPES'] = sub_types_index(obj_data)
+            out_data[obj_type[0][1:]] = obj_data
+            # Возвращаем из функции строку,
+            # так как она может содержать имя
+            # следующего объекта
+            return line
+        # Если встречается знак #,
+        # то изменяем текущую подсекцию
+        if line[0][0] == '#':
+
+            sub_section = line[0]
+            continue
+        if sub_section == '#EQU':
+            # Уравнения содержат знаки операций,
+            # по этому анализируется исходная строка
+            obj_equ_analyse(raw_line, obj_data)
+            continue
+        analyse_func[sub_section](line, obj_data)
 
 
 def log_objs_analyse(input_data, out_data, last_line):
@@ -408,18 +455,32 @@ def get_data_from_logic(obj_type, data_type, logic_data, sub_type):
     return params
 
 
+def get_sub_type_data(obj_type, logic_data, category):
+    """
+    Функция получения переменных логического
+    объекта по категории подтипа из индекса.
+    Возвращаемый кортеж общий для всех вызовов
+    """
+    obj_data = logic_data.get(obj_type)
+    # Если запрошенного типа нет в логике,
+    # возвращаем пустой кортеж
+    if not obj_data or '#SUB_TYPES' not in obj_data:
+        return ()
+    return obj_data['#SUB_TYPES'][category]
+
+
 def get_ibits_list(obj_type, logic_data):
     """
     Функция получения списка индивидуализаций
     """
-    return get_data_from_logic(obj_type, "#IN", logic_data, "STATIC")
+    return get_sub_type_data(obj_type, logic_data, "STATIC")
 
 
 def get_checks(obj_type, logic_data):
     """
     Функция получения списка интерфейсных входов
     """
-    return get_data_from_logic(obj_type, "#IN", logic_data, "CHECK,CHC")
+    return get_sub_type_data(obj_type, logic_data, "CHECK")
 
 
 def get_ofw(obj_type, logic_data):
@@ -428,7 +489,7 @@ def get_ofw(obj_type, logic_data):
     передачи информации между
     логическими объектами
     """
-    return get_data_from_logic(obj_type, "#OUT", logic_data, "CONTROL,CTFW")
+    return get_sub_type_data(obj_type, logic_data, "CTFW")
 
 
 def get_orders(obj_type, logic_data):
@@ -436,14 +497,14 @@ def get_orders(obj_type, logic_data):
     Функция получения списка приказов
     на интерфейсные объекты
     """
-    return get_data_from_logic(obj_type, "#OUT", logic_data, "CONTROL,CTRL")
+    return get_sub_type_data(obj_type, logic_data, "CTRL")
 
 
 def get_status(obj_type, logic_data):
     """
     Функция получения списка индикаций
     """
-    return get_data_from_logic(obj_type, "#OUT", logic_data, "STATUS,STAS")
+    return get_sub_type_data(obj_type, logic_data, "STAS")
 
 
 def get_logical_type_names(logic_data):
@@ -454,7 +515,17 @@ def get_logical_type_names(logic_data):
 
 
 def get_default_value(i_bit, obj_type, logic_data):
-    if i_bit in get_ibits_list(obj_type, logic_data):
-        return logic_data[obj_type]['#IN'][i_bit]['init']
-    else:
+    """
+    Функция получения значения индивидуализации
+    по умолчанию. Если переменная не является
+    индивидуализацией, возвращается -1
+    """
+    obj_data = logic_data.get(obj_type)
+    if not obj_data or '#IN' not in obj_data:
         return -1
+    # Переменная проверяется по её подтипу без
+    # построения списка всех индивидуализаций
+    params = obj_data['#IN'].get(i_bit)
+    if params and params['sub_type'].startswith(SUB_TYPES['STATIC'][1]):
+        return params['init']
+    return -1
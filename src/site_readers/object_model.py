@@ -0,0 +1,210 @@
+# =========================================
+# ==_____________Object_model____________==
+# =========================================
+
+from collections.abc import MutableMapping
+
+
+class Record(MutableMapping):
+    """
+    Базовый класс компактной записи данных объекта.
+    Поля хранятся в слотах, но доступны как ключи
+    словаря, по этому запись можно использовать
+    везде, где ранее использовался словарь.
+    Незаполненное поле считается отсутствующим ключом.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        if key in self.__slots__:
+            try:
+                delattr(self, key)
+                return
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def __iter__(self):
+        return (x for x in self.__slots__ if hasattr(self, x))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self.items()))
+
+    def to_dict(self):
+        """
+        Метод получения данных записи в виде словаря
+        """
+        return dict(self.items())
+
+    def copy(self):
+        """
+        Метод получения копии записи
+        """
+        new_record = object.__new__(type(self))
+        for key in self:
+            setattr(new_record, key, getattr(self, key))
+        return new_record
+
+
+class Leg(Record):
+    """
+    Соединение вывода объекта с соседним объектом
+    """
+    __slots__ = ('neighbour', 'neighbour_leg')
+
+    def __init__(self, neighbour, neighbour_leg):
+        self.neighbour = neighbour
+        self.neighbour_leg = neighbour_leg
+
+
+class ControlData(Record):
+    """
+    Приказ или статус объекта с привязкой
+    к контроллеру либо к другому объекту
+    """
+    __slots__ = ('ipu', 'value', 'old_value')
+
+    def __init__(self, ipu='', value=''):
+        self.ipu = ipu
+        self.value = value
+
+
+class IndicationData(Record):
+    """
+    Индикационная переменная объекта
+    """
+    __slots__ = ('cos', 'value', 'old_value')
+
+    def __init__(self, cos='', value=''):
+        self.cos = cos
+        self.value = value
+
+
+class VariableData(Record):
+    """
+    Внутренняя переменная объекта
+    """
+    __slots__ = ('value', 'old_value')
+
+    def __init__(self, value=''):
+        self.value = value
+
+
+class ChannelData(Record):
+    """
+    Входящее и исходящее значения канала
+    связи с соседним объектом
+    """
+    __slots__ = ('IN', 'OUT')
+
+    def __init__(self, in_value='', out_value=''):
+        self.IN = in_value
+        self.OUT = out_value
+
+
+class LogicalObjectData(Record):
+    """
+    Данные логического объекта.
+    Поля variables и channels заполняются
+    из логики при загрузке объекта
+    """
+    __slots__ = ('Name', 'Type', 'legs', 'individualizations', 'orders',
+                 'status', 'indication', 'ITI', 'ofw', 'incoming',
+                 'telegram', 'command', 'Check', 'variables', 'channels')
+
+    def __init__(self, **fields):
+        # Неизвестное поле вызывает AttributeError,
+        # так как у записи нет словаря атрибутов
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+
+class DefaultsView(MutableMapping):
+    """
+    Класс раздела объекта со значениями по умолчанию,
+    общими для всех объектов одного типа.
+    Объект хранит только собственные значения из
+    проекта, значение по умолчанию копируется в объект
+    при первом обращении к нему (копирование при записи),
+    так как полученная запись может быть изменена.
+    Порядок перебора совпадает с порядком при полном
+    копировании: сначала значения из проекта, затем
+    значения по умолчанию.
+    """
+    __slots__ = ('_own', '_changed', '_defaults')
+
+    def __init__(self, own, defaults):
+        # Значения из проекта
+        self._own = own
+        # Скопированные значения по умолчанию и новые
+        # значения, которых нет ни в проекте, ни в шаблоне
+        self._changed = {}
+        # Общий для типа неизменяемый шаблон
+        self._defaults = defaults
+
+    def __getitem__(self, key):
+        if key in self._own:
+            return self._own[key]
+        if key in self._changed:
+            return self._changed[key]
+        value = self._defaults[key]
+        # Неизменяемые значения, например значения
+        # индивидуализаций, возвращаются без копирования
+        if isinstance(value, Record):
+            value = value.copy()
+            self._changed[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._own:
+            self._own[key] = value
+        else:
+            self._changed[key] = value
+
+    def __delitem__(self, key):
+        # Значение по умолчанию удалить нельзя, после
+        # удаления собственного значения действует оно
+        if key in self._own:
+            del self._own[key]
+        elif key in self._changed:
+            del self._changed[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return (key in self._own or key in self._defaults
+                or key in self._changed)
+
+    def __iter__(self):
+        yield from self._own
+        for key in self._defaults:
+            if key not in self._own:
+                yield key
+        for key in self._changed:
+            if key not in self._own and key not in self._defaults:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, dict(self.items()))
@@ -0,0 +1,206 @@
+# =========================================
+# ==____________Project_cache____________==
+# =========================================
+
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+
+CACHE_PATH = os.environ.get('TESTTOOL_CACHE',
+                            str(Path.home() / '.testtool' / 'cache'))
+# Максимальный размер каталога кэша в байтах
+CACHE_MAX_SIZE = int(os.environ.get('TESTTOOL_CACHE_SIZE', 512 * 2 ** 20))
+# Версия формата снимков, увеличивается при изменении
+# структур данных, возвращаемых анализаторами
+CACHE_VERSION = 10
+CACHE_SUFFIX = '.cache'
+HASH_BLOCK_SIZE = 2 ** 20
+
+
+def get_file_hash(file_path):
+    """
+    Функция получения хэша содержимого файла
+    """
+    file_hash = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file_data:
+        for block in iter(lambda: file_data.read(HASH_BLOCK_SIZE), b''):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+def get_file_fingerprint(file_path):
+    """
+    Функция получения отпечатка файла:
+    абсолютного пути, размера, времени изменения
+    и хэша содержимого. Для отсутствующего файла
+    отпечаток фиксирует его отсутствие
+    """
+    file_path = os.path.abspath(file_path)
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return {'path': file_path, 'missing': True}
+    return {'path': file_path,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': get_file_hash(file_path), }
+
+
+def is_actual_fingerprint(fingerprint):
+    """
+    Функция проверки соответствия отпечатка
+    текущему состоянию файла
+    """
+    if fingerprint.get('missing'):
+        # Отпечаток отсутствующего файла действителен,
+        # пока файл не появился
+        return not os.path.exists(fingerprint['path'])
+    try:
+        stat = os.stat(fingerprint['path'])
+    except OSError:
+        return False
+    if stat.st_size != fingerprint['size']:
+        return False
+    # Если время изменения совпадает, то файл
+    # не перечитываем. Иначе файл мог быть
+    # только "тронут", по этому сверяем содержимое
+    if stat.st_mtime_ns == fingerprint['mtime']:
+        return True
+    try:
+        return get_file_hash(fingerprint['path']) == fingerprint['hash']
+    except OSError:
+        return False
+
+
+class ProjectCache:
+    """
+    Класс дискового кэша результатов анализа
+    файлов проекта.
+    Каждый анализатор и файл хранятся отдельным
+    снимком, который становится недействительным
+    при изменении любого из исходных файлов.
+    """
+
+    def __init__(self, cache_path=CACHE_PATH, max_size=CACHE_MAX_SIZE):
+        self._cache_path = cache_path
+        self._max_size = max_size
+
+    def get_entry_path(self, name, file_path):
+        """
+        Метод получения пути до снимка
+        по имени анализатора и пути до файла
+        """
+        key = '{}:{}'.format(name, os.path.abspath(file_path))
+        key = hashlib.blake2b(key.encode('utf-8'), digest_size=16)
+        return os.path.join(self._cache_path, key.hexdigest() + CACHE_SUFFIX)
+
+    def load(self, name, file_path):
+        """
+        Метод получения данных из кэша.
+        Если снимок отсутствует или устарел,
+        возвращается None
+        """
+        entry_path = self.get_entry_path(name, file_path)
+        if not os.path.exists(entry_path):
+            return None
+        try:
+            with open(entry_path, 'rb') as entry_data:
+                # Сначала считываем только заголовок снимка,
+                # данные загружаем после проверки исходных файлов
+                header = pickle.load(entry_data)
+                if header['version'] != CACHE_VERSION or not all(
+                        is_actual_fingerprint(x) for x in header['sources']):
+                    entry_data.close()
+                    self.remove(entry_path)
+                    return None
+                data = pickle.load(entry_data)
+        except Exception as error:
+            # Повреждённый снимок не должен мешать загрузке
+            # проекта, данные будут получены заново
+            logging.warning('cache entry %s ignored: %s', entry_path, error)
+            self.remove(entry_path)
+            return None
+        # Обновляем время снимка для вытеснения
+        # давно не используемых данных
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return data
+
+    def save(self, name, file_path, data, sources=None):
+        """
+        Метод сохранения данных в кэш.
+        Кроме основного файла снимок может зависеть
+        от списка дополнительных исходных файлов
+        """
+        sources = sources or (file_path,)
+        entry_path = self.get_entry_path(name, file_path)
+        temp_path = entry_path + '.tmp'
+        try:
+            os.makedirs(self._cache_path, exist_ok=True)
+            header = {'version': CACHE_VERSION,
+                      'sources': [get_file_fingerprint(x) for x in sources], }
+            with open(temp_path, 'wb') as entry_data:
+                pickle.dump(header, entry_data, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, entry_data, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except Exception as error:
+            logging.warning('cache entry %s not saved: %s', entry_path, error)
+            self.remove(temp_path)
+            return
+        self.evict()
+
+    def read_file(self, name, file_path, parser):
+        """
+        Метод получения результата анализа файла
+        из кэша либо анализатором с сохранением
+        результата в кэш
+        """
+        data = self.load(name, file_path)
+        if data is None:
+            with open(file_path) as file_data:
+                data = parser(file_data)
+            self.save(name, file_path, data)
+        return data
+
+    def evict(self):
+        """
+        Метод удаления самых старых снимков
+        при превышении размера кэша
+        """
+        try:
+            entries = [x for x in os.scandir(self._cache_path)
+                       if x.name.endswith(CACHE_SUFFIX)]
+            entries = [(x.stat().st_mtime, x.stat().st_size, x.path)
+                       for x in entries]
+        except OSError:
+            return
+        cache_size = sum(x[1] for x in entries)
+        for _, size, entry_path in sorted(entries):
+            if cache_size <= self._max_size:
+                break
+            self.remove(entry_path)
+            cache_size -= size
+
+    def clear(self):
+        """
+        Метод полной очистки кэша
+        """
+        if not os.path.isdir(self._cache_path):
+            return
+        for entry in os.scandir(self._cache_path):
+            if entry.name.endswith(CACHE_SUFFIX):
+                self.remove(entry.path)
+
+    @staticmethod
+    def remove(entry_path):
+        """
+        Метод удаления снимка
+        """
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
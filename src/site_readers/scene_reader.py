@@ -2,7 +2,7 @@
 # ==_____________Scene_reader____________==
 # =========================================
 
-import xml.dom.minidom
+from xml.etree.ElementTree import iterparse
 
 
 def get_x_y_data(node_data):
@@ -21,65 +21,84 @@ def get_x_y_data(node_data):
     return int(node_data)
 
 
+def add_scene_object(node_items, logical_objects):
+    """
+    Функция добавления координат и матрицы
+    трансформации объекта в общее хранилище.
+    Возвращает координаты объекта
+    """
+    obj_name = node_items["object_name"]
+
+    # Получаем координаты и сохраняем их
+    coord_x = get_x_y_data(node_items["x"])
+    coord_y = get_x_y_data(node_items["y"])
+    obj_data = {"x": coord_x, "y": coord_y}
+
+    # Сохраняем значения матрицы трансформации
+    for attr in ("m11", "m12", "m21", "m22"):
+        obj_data[attr] = int(float(node_items[attr][0:8]))
+
+    # Добавляем объект в общее хранилище
+    logical_objects[obj_name] = obj_data
+    return coord_x, coord_y
+
+
 def read_scene_data(file_path):
     """
     Функция получения данных о расположении
-    объектов
+    объектов.
+    Файл читается потоком, каждый элемент
+    очищается сразу после обработки, по этому
+    потребление памяти не зависит от размера файла
     """
 
     # По умолчанию выставляем высоту и ширину
     # отображаемой сцены
     max_x = 1000
     max_y = 1000
-
-    logical_objects = {}
-
-    doc = xml.dom.minidom.parse(file_path)
-    node = doc.documentElement
-
-    rem_1 = node.getElementsByTagName("ScriptGraphicObject")
-
-    for node in rem_1:
-        # Из строки собираем данные и преобразуем в словарь
-        node_items = dict(node.attributes.items())
-        obj_name = node_items["object_name"]
-
-        # Добавляем имя объекта в общее хранилище
-        logical_objects[obj_name] = {}
-
-        # Получаем координаты и сохраняем их
-        coord_x = get_x_y_data(node_items["x"])
-        coord_y = get_x_y_data(node_items["y"])
-
-        logical_objects[obj_name]["x"] = coord_x
-        logical_objects[obj_name]["y"] = coord_y
-
-        # Если текущие координаты выходят за пределы
-        # размеров сцены, увеличиваем её значения
-        if coord_x > max_x:
-            max_x = coord_x + 1000
-        if coord_y > max_y:
-            max_y = coord_y + 500
-
-        # Сохраняем значения матрицы трансформации
-        for attr in ("m11", "m12", "m21", "m22"):
-            logical_objects[obj_name][attr] = int(float(node_items[attr][0:8]))
-
-    logical_objects["sceneWidth"] = max_x
-    logical_objects["sceneHeight"] = max_y
+    # Размер сцены из раздела config
+    scene_size = None
     # Если файл был сохранён программой,
     # то он МОЖЕТ хранить данные о необходимом размере сцены
-    rem_2 = None
-    if file_path.endswith('LogicScene.xml'):
-        rem_2 = node.getElementsByTagName("config")
+    is_saved_scene = file_path.endswith('LogicScene.xml')
 
-    if rem_2:
-        rem_1 = rem_2[0].getElementsByTagName("scene")
-        node_items = dict(rem_1[0].attributes.items())
-        # Выбираем данные размера и сохраняем их
-        logical_objects["sceneWidth"] = int(node_items["fieldWidth"])
-        logical_objects["sceneHeight"] = int(node_items["fieldHeight"])
+    logical_objects = {}
 
+    context = iterparse(file_path, events=("start", "end"))
+    # Первым событием является начало корневого элемента,
+    # ссылка на него нужна для удаления обработанных
+    # элементов из дерева
+    _, root = next(context)
+    for event, node in context:
+        if event != "end":
+            continue
+        if node.tag == "ScriptGraphicObject":
+            coord_x, coord_y = add_scene_object(node.attrib, logical_objects)
+
+            # Если текущие координаты выходят за пределы
+            # размеров сцены, увеличиваем её значения
+            if coord_x > max_x:
+                max_x = coord_x + 1000
+            if coord_y > max_y:
+                max_y = coord_y + 500
+        elif node.tag == "config":
+            scene = node.find(".//scene")
+            if is_saved_scene and scene_size is None and scene is not None:
+                # Выбираем данные размера и сохраняем их
+                scene_size = (int(scene.attrib["fieldWidth"]),
+                              int(scene.attrib["fieldHeight"]))
+        else:
+            # Остальные элементы могут содержать
+            # ещё не обработанный раздел config
+            continue
+        # Удаляем обработанный элемент и все
+        # завершённые элементы из корня
+        node.clear()
+        root.clear()
+
+    if scene_size:
+        logical_objects["sceneWidth"], logical_objects["sceneHeight"] = (
+            scene_size)
     else:
         # Если данных о размере сцены в
         # исходных данных нет, то записываем
@@ -0,0 +1,77 @@
+# =========================================
+# ==_______________Tokenizer_____________==
+# =========================================
+
+import re
+
+
+class Tokenizer:
+    """
+    Класс разбиения строк исходных файлов на слова.
+    Принимает набор символов слова в формате
+    регулярного выражения, символ комментария и
+    признак наличия слов в двойных кавычках.
+    Шаблоны компилируются один раз при создании.
+    """
+
+    def __init__(self, word_chars, comment=None, quoted=False):
+        self._comment = comment
+        if quoted:
+            # Слово в кавычках заканчивается на ближайшей
+            # закрывающей кавычке, что исключает перебор
+            # всей строки при нескольких кавычках
+            word_pattern = r'(?:[{}]|"[^"]*")+'.format(word_chars)
+        else:
+            word_pattern = r'[{}]+'.format(word_chars)
+        self._findall = re.compile(word_pattern).findall
+        # Если в строке нет символов кроме символов слова
+        # и пробельных, то её можно разбить без шаблона
+        self._special = re.compile(r'[^{}\s]'.format(word_chars)).search
+
+    def split(self, line):
+        """
+        Метод разбиения строки на слова
+        без исключения комментариев
+        """
+        if self._special(line) is None:
+            return line.split()
+        return self._findall(line)
+
+    def get_line_data(self, line):
+        """
+        Метод разбиения строки на слова с исключением
+        пустых и закомментированных строк.
+        Для таких строк возвращается None
+        """
+        stripped = line.lstrip()
+        if not stripped:
+            return None
+        # Символ комментария является символом слова,
+        # по этому строку начинающуюся с него
+        # можно пропустить до разбиения
+        if stripped[0] == self._comment:
+            return None
+        if self._special(stripped) is None:
+            return stripped.split()
+        match = self._findall(stripped)
+        if match and self._comment != match[0][0]:
+            return match
+
+
+# Заголовки и тела CommandTable, IntData,
+# заголовок ConfigInfo.CI
+WORD_TOKENIZER = Tokenizer(r'\w.\-', comment='.', quoted=True)
+# Тело ConfigInfo.CI
+CONFIG_BODY_TOKENIZER = Tokenizer(r'\w.\-\~\;>', comment='.')
+# Файл логики
+LOGIC_TOKENIZER = Tokenizer(r'#!\w,\-', comment='!')
+# Лог файлы пересчётов логики
+LOG_TOKENIZER = Tokenizer(r'!\w')
+# Ответы имитатора о переменных объекта
+SIM_TOKENIZER = Tokenizer(r'\w(),.')
+
+get_word_line_data = WORD_TOKENIZER.get_line_data
+get_config_body_line_data = CONFIG_BODY_TOKENIZER.get_line_data
+get_logic_line_data = LOGIC_TOKENIZER.get_line_data
+split_log_line = LOG_TOKENIZER.split
+split_sim_line = SIM_TOKENIZER.split
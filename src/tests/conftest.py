@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Модули программы импортируются от каталога src,
+# как при запуске main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
@@ -0,0 +1,75 @@
+import pytest
+
+from site_readers.equ_compiler import EquError
+from site_readers.equ_compiler import compile_type
+from site_readers.equ_compiler import parse_equation
+
+VARIABLES = ('A', 'B', 'C', 'R')
+
+
+def evaluate(expression, **values):
+    """
+    Функция вычисления выражения уравнением
+    R = expression; типа с переменными VARIABLES
+    """
+    logic_data = {
+        'T': {
+            '#OWN': {x: {'init': str(values.get(x, 0))} for x in VARIABLES},
+            '#EQU': [f'R = {expression};'],
+        },
+        'CONST': {'TEN': '10'},
+    }
+    program = compile_type('T', logic_data)
+    slots = list(program.init)
+    program.run([(slots, [], [])])
+    return slots[program.slot_index['R']]
+
+
+@pytest.mark.parametrize('expression, result', [
+    ('2 + 3 * 4', 14),
+    ('(2 + 3) * 4', 20),
+    ('10 - 4 - 3', 3),
+    ('24 / 4 / 2', 3),
+    ('-2 * 3', -6),
+    ('- (2 + 3)', -5),
+    ('1 + 2 = 3', 1),
+    ('2 * 3 > 5', 1),
+    ('1 < 2 AND 3 < 2', 0),
+    ('1 OR 0 AND 0', 1),
+    ('(1 OR 0) AND 0', 0),
+    ('NOT 0 AND 0', 0),
+    ('NOT (0 AND 0)', 1),
+    ('NOT 1 = 0', 1),
+    ('IF 1 THEN 2 ELSE 3', 2),
+    ('IF 0 THEN 2 ELSE 3 + 4', 7),
+    ('TEN / 3', 3),
+])
+def test_precedence(expression, result):
+    assert evaluate(expression) == result
+
+
+def test_variables():
+    assert evaluate('A * B + C', A=3, B=4, C=5) == 17
+    assert evaluate('A <> B', A=1, B=1) == 0
+
+
+@pytest.mark.parametrize('expression', ['A / 0', 'A / B', '(A / B) + 0'])
+def test_division_by_zero(expression):
+    assert evaluate(expression, A=7, B=0) == 0
+
+
+def test_division_by_zero_in_condition():
+    assert evaluate('IF A / B = 0 THEN 1 ELSE 2', A=7, B=0) == 1
+
+
+def test_parse_tree():
+    target, expr = parse_equation('R = A + 2 * B;')
+    assert target == ('var', 'R')
+    assert expr == ('op', '+', ('var', 'A'),
+                    ('op', '*', ('num', 2), ('var', 'B')))
+
+
+@pytest.mark.parametrize('expression', ['2 +', '(1', '1 ) 2', 'X'])
+def test_errors(expression):
+    with pytest.raises(EquError):
+        evaluate(expression)
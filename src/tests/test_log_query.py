@@ -0,0 +1,107 @@
+import pytest
+
+from site_readers.log_query import ChangeIndex
+from site_readers.log_query import QueryError
+from site_readers.log_query import complement
+from site_readers.log_query import intersect
+from site_readers.log_query import union
+
+# Изменения переменных по циклам 1-10:
+# S1.OCC: 0 на 1-3, 1 на 4-7, 0 на 8-10
+# S2.OCC: 1 на 3-5, 0 на 6-10, до цикла 3 неизвестно
+# S3.CNT: 5 на 1-5, 12 на 6-10
+LOG_LINES = [
+    '! ST 1 C S1 OCC 0 x',
+    '! ST 1 C S3 CNT 5 x',
+    '! ST 3 C S2 OCC 1 x',
+    '! P ST 4 C S2 OCC 0 1',
+    '! ST 4 C S1 OCC 1 0',
+    '! ST 6 C S2 OCC 0 1',
+    '! ST 6 C S3 CNT 12 5',
+    '! ST 8 C S1 OCC 0 1',
+    '! ST 10 C S3 CNT 12 12',
+]
+
+
+@pytest.fixture
+def index():
+    return ChangeIndex.from_lines(LOG_LINES)
+
+
+@pytest.mark.parametrize('intervals, other, result', [
+    ([(1, 5)], [(3, 8)], [(3, 5)]),
+    ([(1, 3)], [(3, 5)], []),
+    ([(1, 10)], [(2, 3), (5, 6)], [(2, 3), (5, 6)]),
+    ([(1, 4), (6, 9)], [(3, 7), (8, 12)], [(3, 4), (6, 7), (8, 9)]),
+    ([], [(1, 2)], []),
+])
+def test_intersect(intervals, other, result):
+    assert intersect(intervals, other) == result
+    assert intersect(other, intervals) == result
+
+
+@pytest.mark.parametrize('intervals, other, result', [
+    ([(1, 3)], [(5, 7)], [(1, 3), (5, 7)]),
+    ([(1, 3)], [(3, 5)], [(1, 5)]),
+    ([(1, 6)], [(2, 4)], [(1, 6)]),
+    ([(1, 3), (8, 9)], [(2, 5), (4, 8)], [(1, 9)]),
+    ([], [], []),
+])
+def test_union(intervals, other, result):
+    assert union(intervals, other) == result
+    assert union(other, intervals) == result
+
+
+@pytest.mark.parametrize('intervals, result', [
+    ([], [(1, 11)]),
+    ([(1, 11)], []),
+    ([(1, 3)], [(3, 11)]),
+    ([(4, 6), (8, 9)], [(1, 4), (6, 8), (9, 11)]),
+    ([(5, 11)], [(1, 5)]),
+])
+def test_complement(intervals, result):
+    assert complement(intervals, 1, 11) == result
+    # Двойное дополнение возвращает исходные интервалы
+    assert complement(result, 1, 11) == intervals
+
+
+def test_index_bounds(index):
+    assert (index.first_cycle, index.last_cycle) == (1, 10)
+
+
+@pytest.mark.parametrize('query, result', [
+    ('S1.OCC==1', [(4, 7)]),
+    ('S1.OCC=0', [(1, 3), (8, 10)]),
+    ('SECTION S1.OCC != 1', [(1, 3), (8, 10)]),
+    ('ST.S1.OCC==1', [(4, 7)]),
+    # Пересчёт P не учитывается, до первого
+    # изменения значение неизвестно
+    ('S2.OCC==1', [(3, 5)]),
+    ('NOT S2.OCC==1', [(1, 2), (6, 10)]),
+    ('S1.OCC==1 and S2.OCC==1', [(4, 5)]),
+    ('S1.OCC==1 or S2.OCC==1', [(3, 7)]),
+    ('not (S1.OCC==1 or S2.OCC==1)', [(1, 2), (8, 10)]),
+    # Числа сравниваются как числа, не как строки
+    ('S3.CNT > 9', [(6, 10)]),
+    ('S3.CNT < 9', [(1, 5)]),
+    ('S9.OCC==1', []),
+])
+def test_query(index, query, result):
+    assert index.query(query) == result
+
+
+@pytest.mark.parametrize('query', [
+    'S1.OCC', 'S1.OCC==', 'OCC==1', '(S1.OCC==1', 'S1.OCC==1 S2',
+    'S1.OCC==1 & S2.OCC==1',
+])
+def test_query_errors(index, query):
+    with pytest.raises(QueryError):
+        index.query(query)
+
+
+def test_ambiguous_name():
+    index = ChangeIndex.from_lines(['! A 1 C S1 OCC 1 x',
+                                    '! B 2 C S1 OCC 0 x'])
+    with pytest.raises(QueryError):
+        index.query('S1.OCC==1')
+    assert index.query('A.S1.OCC==1') == [(1, 2)]
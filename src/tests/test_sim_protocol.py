@@ -0,0 +1,149 @@
+import pytest
+
+from modeling_classes.sim_protocol import PRIORITY_BACKGROUND
+from modeling_classes.sim_protocol import PRIORITY_USER
+from modeling_classes.sim_protocol import PROMPT
+from modeling_classes.sim_protocol import CommandPipeline
+from modeling_classes.sim_protocol import ResponseFramer
+
+
+class FakeClock:
+    """
+    Часы, переводимые тестом
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def feed_all(framer, chunks):
+    responses = []
+    for chunk in chunks:
+        responses += [bytes(x) for x in framer.feed(chunk)]
+    return responses
+
+
+def test_framer_whole_responses():
+    framer = ResponseFramer()
+    data = b'first' + PROMPT + b'second' + PROMPT
+    assert feed_all(framer, [data]) == [b'first' + PROMPT,
+                                        b'second' + PROMPT]
+    assert framer.pending == 0
+
+
+@pytest.mark.parametrize('split', range(1, len(PROMPT)))
+def test_framer_prompt_split_across_chunks(split):
+    framer = ResponseFramer()
+    data = b'a b c' + PROMPT + b'tail'
+    cut = len(b'a b c') + split
+    assert feed_all(framer, [data[:cut]]) == []
+    assert feed_all(framer, [data[cut:]]) == [b'a b c' + PROMPT]
+    assert framer.pending == len(b'tail')
+
+
+def test_framer_byte_by_byte():
+    framer = ResponseFramer()
+    data = b'x' * 10 + PROMPT + b'y' + PROMPT
+    chunks = [data[i:i + 1] for i in range(len(data))]
+    assert feed_all(framer, chunks) == [b'x' * 10 + PROMPT, b'y' + PROMPT]
+
+
+def test_framer_responses_survive_next_feed():
+    framer = ResponseFramer()
+    first = framer.feed(b'one' + PROMPT + b'tw')
+    framer.feed(b'o' + PROMPT)
+    assert bytes(first[0]) == b'one' + PROMPT
+
+
+def test_framer_clear():
+    framer = ResponseFramer()
+    framer.feed(b'partial* ')
+    framer.clear()
+    assert feed_all(framer, [b'> next' + PROMPT]) == [b'> next' + PROMPT]
+
+
+def test_pipeline_replies_in_order():
+    pipeline = CommandPipeline(depth=2)
+    first = pipeline.submit('a\n')
+    second = pipeline.submit('b\n')
+    third = pipeline.submit('c\n')
+    assert pipeline.take_ready() == [first, second]
+    assert pipeline.on_response('A') is first
+    assert pipeline.take_ready() == [third]
+    pipeline.on_response('B')
+    pipeline.on_response('C')
+    results = [x.result() for x in (first, second, third)]
+    assert results == ['A', 'B', 'C']
+
+
+def test_pipeline_user_priority_first():
+    pipeline = CommandPipeline(depth=1)
+    background = pipeline.submit('bg\n', PRIORITY_BACKGROUND)
+    user = pipeline.submit('user\n', PRIORITY_USER)
+    assert pipeline.take_ready() == [user]
+    pipeline.on_response('U')
+    assert pipeline.take_ready() == [background]
+
+
+def test_pipeline_unsolicited_response():
+    pipeline = CommandPipeline()
+    assert pipeline.on_response('event') is None
+
+
+def test_pipeline_timeout_counts_from_sending():
+    clock = FakeClock()
+    pipeline = CommandPipeline(depth=1, clock=clock)
+    sent = pipeline.submit('a\n')
+    queued = pipeline.submit('b\n', timeout=1)
+    pipeline.take_ready()
+    # Команда в очереди не устаревает,
+    # пока ожидает ответа на предыдущую
+    clock.now = 2
+    pipeline.expire()
+    assert not queued.done and len(pipeline) == 1
+    assert pipeline.has_deadlines()
+    assert pipeline.on_response('A') is sent
+    assert pipeline.take_ready() == [queued]
+    assert queued.deadline == 3
+    clock.now = 3
+    pipeline.expire()
+    assert isinstance(queued.error, TimeoutError)
+    assert pipeline.in_flight == 0
+
+
+def test_pipeline_in_flight_timeout_frees_slot():
+    clock = FakeClock()
+    pipeline = CommandPipeline(depth=1, clock=clock)
+    lost = pipeline.submit('a\n', timeout=1)
+    following = pipeline.submit('b\n')
+    assert pipeline.take_ready() == [lost]
+    clock.now = 2
+    # Команда без ответа не задерживает следующую
+    assert pipeline.take_ready() == [following]
+    with pytest.raises(TimeoutError):
+        lost.result()
+    # Поздний ответ пропускается и не
+    # сопоставляется следующей команде
+    late = pipeline.on_response('late A')
+    assert late is lost and lost.response is None
+    assert pipeline.on_response('B') is following
+    assert following.result() == 'B'
+    assert pipeline.in_flight == 0
+
+
+def test_pipeline_clear():
+    clock = FakeClock()
+    pipeline = CommandPipeline(depth=1, clock=clock)
+    sent = pipeline.submit('a\n', timeout=1)
+    queued = pipeline.submit('b\n')
+    pipeline.take_ready()
+    clock.now = 2
+    pipeline.expire()
+    pipeline.clear()
+    assert isinstance(sent.error, TimeoutError)
+    assert isinstance(queued.error, ConnectionError)
+    assert pipeline.in_flight == 0
+    assert pipeline.on_response('late') is None